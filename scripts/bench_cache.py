@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tahmin Önbelleği Benchmark'ı
+``corrected.gz`` test setini (smurf/neptune ağırlıklı, DoS yoğun trafik)
+parça parça skorlayarak önbelleksiz modeli ``PredictionCache`` ile
+karşılaştırır: verim, isabet oranı, çıkarılan kayıt sayısı ve tahmin farkı.
+Test seti ``--passes`` kez yeniden oynatılır (ilk geçiş soğuk önbellek);
+``--dos-only`` yalnızca DoS satırlarını oynatır.
+
+Kullanım:
+    python scripts/bench_cache.py --model rf --chunksize 10000 --cache-size 100000 --passes 3
+    python scripts/bench_cache.py --model lr --dos-only --shuffle
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from src.cache import PredictionCache
+from src.data import load_kdd, sample_kdd
+from src.preprocess import MULTI_TARGET, add_targets, split_features
+from src.models import make_binary_pipelines
+
+
+def _replay(model, X, chunksize: int):
+    """Test setini parça parça skorlar; (olasılıklar, süre) döndürür."""
+    parts = []
+    t0 = time.perf_counter()
+    for start in range(0, len(X), chunksize):
+        parts.append(model.predict_proba(X.iloc[start:start + chunksize]))
+    return np.vstack(parts), time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default='rf', choices=['lr', 'rf'])
+    parser.add_argument('--frac', type=float, default=0.1, help='Eğitim setinden kullanılacak örneklem oranı')
+    parser.add_argument('--chunksize', type=int, default=10_000)
+    parser.add_argument('--cache-size', type=int, default=100_000)
+    parser.add_argument('--dos-only', action='store_true', help='Yalnızca DoS satırlarını oynat')
+    parser.add_argument('--shuffle', action='store_true', help='Satır sırasını karıştır')
+    parser.add_argument('--passes', type=int, default=2, help='Test setinin kaç kez oynatılacağı')
+    parser.add_argument('--data-dir', default='data')
+    args = parser.parse_args()
+
+    data_dir = Path(args.data_dir)
+    train_path = data_dir / 'kddcup.data_10_percent.gz'
+    train = add_targets(load_kdd(train_path) if args.frac >= 1 else sample_kdd(train_path, frac=args.frac))
+    X, y, _, num_cols, cat_cols = split_features(train)
+    model = make_binary_pipelines(num_cols, cat_cols, weighted=True)[args.model][0].fit(X, y)
+
+    test = add_targets(load_kdd(data_dir / 'corrected.gz'))
+    if args.dos_only:
+        test = test[(test[MULTI_TARGET] == 'dos').to_numpy()]
+    if args.shuffle:
+        test = test.sample(frac=1.0, random_state=0)
+    X_test = split_features(test)[0]
+
+    reference, t_plain = _replay(model, X_test, args.chunksize)
+    print(f'{len(X_test):,} satır, parça={args.chunksize:,}, önbellek={args.cache_size:,}')
+    print(f'önbelleksiz         süre={t_plain:6.2f}s verim={len(X_test) / t_plain:>10,.0f} satır/s')
+
+    cache = PredictionCache(model, maxsize=args.cache_size)
+    total, diff = 0.0, 0.0
+    for i in range(args.passes):
+        seen, hits = cache.n_seen_, cache.n_hits_
+        proba, t_cache = _replay(cache, X_test, args.chunksize)
+        total += t_cache
+        diff = max(diff, np.abs(proba - reference).max())
+        print(f'önbellekli geçiş {i + 1}  süre={t_cache:6.2f}s verim={len(X_test) / t_cache:>10,.0f} satır/s '
+              f'isabet=%{100 * (cache.n_hits_ - hits) / (cache.n_seen_ - seen):.1f}')
+    print(f'tekil kayıt={len(cache):,} çıkarılan={cache.n_evicted_:,} max_fark={diff:.1e}')
+    print(f'Verim artışı: tüm geçişler {t_plain * args.passes / total:.1f}x, '
+          f'son geçiş {t_plain / t_cache:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Kaskad Sınıflandırıcı Benchmark'ı
+``lr`` -> ``rf`` kaskadını yalnızca RF kullanımıyla ``corrected.gz`` test
+setinde karşılaştırır: pahalı modele giden satır oranı, tahmin süresi /
+verimi ve F1 / doğruluk farkı.
+
+Kullanım:
+    python scripts/bench_cascade.py --frac 0.2 --n-estimators 100
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from sklearn.metrics import accuracy_score, f1_score
+
+from src.data import load_kdd, sample_kdd
+from src.preprocess import add_targets, split_features
+from src.models import make_binary_pipelines
+from src.ensemble import CascadeClassifier
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frac', type=float, default=1.0, help='Eğitim setinden kullanılacak örneklem oranı')
+    parser.add_argument('--n-estimators', type=int, default=100)
+    parser.add_argument('--tolerance', type=float, default=0.002)
+    parser.add_argument('--data-dir', default='data')
+    args = parser.parse_args()
+
+    data_dir = Path(args.data_dir)
+    train_path = data_dir / 'kddcup.data_10_percent.gz'
+    train = add_targets(load_kdd(train_path) if args.frac >= 1 else sample_kdd(train_path, frac=args.frac))
+    test = add_targets(load_kdd(data_dir / 'corrected.gz'))
+    X, y, _, num_cols, cat_cols = split_features(train)
+    X_test, y_test, _, _, _ = split_features(test)
+
+    grids = make_binary_pipelines(num_cols, cat_cols)
+    lr = grids['lr'][0]
+    rf = grids['rf'][0].set_params(classifier__n_estimators=args.n_estimators, classifier__random_state=42)
+    cascade = CascadeClassifier(lr, rf, tolerance=args.tolerance)
+    t0 = time.perf_counter()
+    cascade.fit(X, y)
+    print(f'Kaskad eğitimi: {time.perf_counter() - t0:.1f}s, bant: '
+          f'[{cascade.band_[0]:.3f}, {cascade.band_[1]:.3f}]')
+
+    results = {}
+    for name, model in [('lr', cascade.fast_), ('rf', cascade.slow_), ('cascade', cascade)]:
+        t0 = time.perf_counter()
+        pred = model.predict(X_test)
+        elapsed = time.perf_counter() - t0
+        results[name] = (elapsed, f1_score(y_test, pred), accuracy_score(y_test, pred))
+        print(f'{name:8s} süre={elapsed:6.2f}s verim={len(X_test) / elapsed:>10,.0f} satır/s '
+              f'f1={results[name][1]:.4f} doğruluk={results[name][2]:.4f}')
+
+    rf_time, rf_f1, rf_acc = results['rf']
+    c_time, c_f1, c_acc = results['cascade']
+    print(f'\nPahalı modele giden satır: %{100 * cascade.escalation_rate_:.2f}')
+    print(f'Verim artışı (RF-only karşısında): {rf_time / c_time:.2f}x')
+    print(f'F1 farkı: {c_f1 - rf_f1:+.4f}, doğruluk farkı: {c_acc - rf_acc:+.4f}')
+
+
+if __name__ == '__main__':
+    main()
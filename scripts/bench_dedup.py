@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tekilleştirme Benchmark'ı
+Tüm eğitim seti ile tekilleştirilmiş (ağırlıklı) eğitim setinin fit sürelerini
+ve test seti F1 skorlarını karşılaştırır.
+
+Kullanım:
+    python scripts/bench_dedup.py --model rf --n-estimators 100
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from sklearn.metrics import f1_score
+
+from src.data import load_kdd
+from src.preprocess import add_targets, deduplicate, split_features, WEIGHT_COL
+from src.models import make_binary_pipelines, sample_weight_params
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', choices=['lr', 'rf'], default='rf')
+    parser.add_argument('--n-estimators', type=int, default=100)
+    parser.add_argument('--data-dir', default='data')
+    args = parser.parse_args()
+
+    data_dir = Path(args.data_dir)
+    train = add_targets(load_kdd(data_dir / 'kddcup.data_10_percent.gz'))
+    test = add_targets(load_kdd(data_dir / 'corrected.gz'))
+
+    t0 = time.perf_counter()
+    unique = deduplicate(train)
+    t_dedup = time.perf_counter() - t0
+    print(f'Tekilleştirme: {len(train):,} -> {len(unique):,} satır '
+          f'(%{100 * (1 - len(unique) / len(train)):.2f} tekrar, {t_dedup:.2f}s)')
+
+    X_test, y_test, _, _, _ = split_features(test)
+    params = {'classifier__n_estimators': args.n_estimators, 'classifier__random_state': 42} \
+        if args.model == 'rf' else {}
+
+    results = []
+    for name, df, weighted in [('full', train, False), ('dedup', unique, True)]:
+        X, y, _, num_cols, cat_cols = split_features(df)
+        # Adil karşılaştırma için her iki durumda da SMOTE kapalı
+        pipe = make_binary_pipelines(num_cols, cat_cols, weighted=True)[args.model][0]
+        pipe.set_params(**params)
+        fit_params = sample_weight_params(pipe, df[WEIGHT_COL], y) if weighted else {}
+
+        t0 = time.perf_counter()
+        pipe.fit(X, y, **fit_params)
+        t_fit = time.perf_counter() - t0
+        f1 = f1_score(y_test, pipe.predict(X_test))
+        results.append((name, len(X), t_fit, f1))
+        print(f'{name:6s} satır={len(X):>8,} fit={t_fit:7.2f}s test_f1={f1:.4f}')
+
+    speedup = results[0][2] / results[1][2]
+    print(f'\nFit hızlanması: {speedup:.2f}x, F1 farkı: {results[1][3] - results[0][3]:+.4f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Derlenmiş Kodlayıcı Benchmark'ı
+Eğitilmiş ``make_preprocessor`` çıktısını (``ColumnTransformer``)
+``compile_preprocessor`` ile derlenmiş kodlayıcıyla karşılaştırır: tek
+kayıt, küçük grup ve tüm test seti için kayıt başına kodlama süresi,
+çıktının bit düzeyinde eşitliği ve derlenmiş pipeline ile uçtan uca tek
+kayıt tahmin süresi.
+
+Kullanım:
+    python scripts/bench_encoder.py --model lr --batch-sizes 1 8 64
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from src.data import load_kdd, sample_kdd
+from src.preprocess import add_targets, compile_preprocessor, split_features
+from src.models import compile_pipeline, make_binary_pipelines
+
+
+def _per_call(fn, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat
+
+
+def _dense(Z):
+    return Z.toarray() if hasattr(Z, 'toarray') else np.asarray(Z)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default='lr', choices=['lr', 'rf'])
+    parser.add_argument('--frac', type=float, default=0.1, help='Eğitim setinden kullanılacak örneklem oranı')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8, 64])
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--data-dir', default='data')
+    args = parser.parse_args()
+
+    data_dir = Path(args.data_dir)
+    train_path = data_dir / 'kddcup.data_10_percent.gz'
+    train = add_targets(load_kdd(train_path) if args.frac >= 1 else sample_kdd(train_path, frac=args.frac))
+    X, y, _, num_cols, cat_cols = split_features(train)
+    X_test = split_features(load_kdd(data_dir / 'corrected.gz'))[0]
+
+    pipe = make_binary_pipelines(num_cols, cat_cols, weighted=True)[args.model][0].fit(X, y)
+    pre = pipe.named_steps['preprocessor']
+    encoder = compile_preprocessor(pre)
+
+    # Eşitlik: tüm test seti, DataFrame ve sözlük kayıt yolları
+    reference = _dense(pre.transform(X_test))
+    records = X_test.to_dict('records')
+    same_frame = np.array_equal(encoder.transform(X_test), reference)
+    same_records = np.array_equal(encoder.encode_records(records), reference)
+    same_f32 = np.array_equal(compile_preprocessor(pre, dtype=np.float32).transform(X_test),
+                              reference.astype(np.float32))
+    print(f'bit düzeyinde eşit: DataFrame={same_frame} kayıtlar={same_records} float32={same_f32}')
+
+    for size in args.batch_sizes:
+        frame, batch = X_test.iloc[:size], records[:size]
+        t_ct = _per_call(lambda: pre.transform(frame), args.repeat)
+        t_frame = _per_call(lambda: encoder.transform(frame), args.repeat)
+        t_rec = _per_call(lambda: encoder.encode_records(batch), args.repeat)
+        print(f'grup={size:4d} ColumnTransformer={t_ct / size * 1e6:8.1f}µs/kayıt '
+              f'derlenmiş(DataFrame)={t_frame / size * 1e6:7.1f}µs/kayıt '
+              f'derlenmiş(sözlük)={t_rec / size * 1e6:6.1f}µs/kayıt hızlanma={t_ct / t_rec:6.1f}x')
+
+    t0 = time.perf_counter()
+    pre.transform(X_test)
+    t_ct = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    encoder.transform(X_test)
+    t_enc = time.perf_counter() - t0
+    print(f'tüm test seti ({len(X_test):,} satır): ColumnTransformer={t_ct:.2f}s derlenmiş={t_enc:.2f}s')
+
+    # Uçtan uca tek kayıt: pipeline.predict_proba ile sınıflandırıcı + derlenmiş kodlayıcı
+    compiled = compile_pipeline(pipe)
+    classifier = pipe.steps[-1][1]
+    one = X_test.iloc[:1]
+    t_pipe = _per_call(lambda: pipe.predict_proba(one), args.repeat)
+    t_comp = _per_call(lambda: compiled.predict_proba(one), args.repeat)
+    t_direct = _per_call(lambda: classifier.predict_proba(encoder.encode_record(records[0])), args.repeat)
+    same = np.array_equal(compiled.predict_proba(X_test), pipe.predict_proba(X_test))
+    print(f'tek kayıt tahmini: pipeline={t_pipe * 1e3:.2f}ms derlenmiş pipeline={t_comp * 1e3:.2f}ms '
+          f'kodlayıcı+sınıflandırıcı={t_direct * 1e3:.2f}ms (tahminler eşit={same})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Artımlı Trafik Özelliği Benchmark'ı
+Sentetik bir bağlantı akışında (Zipf dağılımlı hedef makineler, Poisson
+varışlar) ``TrafficFeatureExtractor`` verimini ölçer ve ilk
+``--n-check`` bağlantıda sonucu ``recompute_features`` ile pandas
+üzerinden bağımsız hesaplanan referansla birebir karşılaştırır. Bağlantı başına süre farklı
+varış hızlarında (dolayısıyla farklı pencere doluluklarında) raporlanır.
+
+Kullanım:
+    python scripts/bench_features.py --n 200000 --rates 100 1000 10000 --n-check 5000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from src.data import FLAGS, SERVICES
+from src.features import TrafficFeatureExtractor, recompute_features
+
+
+def _connections(n: int, rate: float, n_hosts: int, seed: int) -> list[dict]:
+    """Saniyede ortalama ``rate`` bağlantılık sentetik akış."""
+    rng = np.random.default_rng(seed)
+    ts = np.cumsum(rng.exponential(1 / rate, size=n))
+    dst = np.minimum(rng.zipf(1.5, size=n), n_hosts)
+    services = rng.choice(SERVICES[:20], size=n)
+    flags = rng.choice(FLAGS, size=n, p=np.r_[[0.02, 0.09, 0.02, 0.01, 0.02, 0.1], [0.01] * 3, [0.7], [0.01]])
+    ports = rng.integers(1024, 1040, size=n)
+    src_bytes = rng.integers(0, 5000, size=n)
+    return [{'timestamp': float(ts[i]), 'src_host': f'10.0.0.{i % 7}', 'src_port': int(ports[i]),
+             'dst_host': f'10.1.0.{dst[i]}', 'dst_port': 80, 'service': str(services[i]), 'flag': str(flags[i]),
+             'src_bytes': int(src_bytes[i]), 'dst_bytes': 0}
+            for i in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--n', type=int, default=200_000, help='Hız başına bağlantı sayısı')
+    parser.add_argument('--rates', type=float, nargs='+', default=[100, 1000, 10000], help='Bağlantı/s')
+    parser.add_argument('--n-hosts', type=int, default=200)
+    parser.add_argument('--n-check', type=int, default=5_000, help='Referansla karşılaştırılacak bağlantı sayısı')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    for rate in args.rates:
+        conns = _connections(args.n, rate, args.n_hosts, args.seed)
+        extractor = TrafficFeatureExtractor()
+        t0 = time.perf_counter()
+        features = extractor.transform(conns)
+        elapsed = time.perf_counter() - t0
+
+        check = conns[:args.n_check]
+        t0 = time.perf_counter()
+        reference = recompute_features(check)
+        t_ref = time.perf_counter() - t0
+        equal = features.iloc[:len(check)].equals(reference)
+        print(f'hız={rate:>8,.0f}/s ort. count={features["count"].mean():8.1f} '
+              f'artımlı={elapsed / len(conns) * 1e6:6.1f}µs/bağlantı ({len(conns) / elapsed:>9,.0f}/s) '
+              f'baştan={t_ref / len(check) * 1e6:8.1f}µs/bağlantı eşit={equal}')
+        if not equal:
+            diff = (features.iloc[:len(check)] != reference).any()
+            raise SystemExit(f'Referansla farklı kolonlar: {list(diff[diff].index)}')
+
+
+if __name__ == '__main__':
+    main()
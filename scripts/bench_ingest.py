@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Veri Yükleme Benchmark'ı
+Orijinal ``pd.read_csv`` çağrısı, şemalı ``load_kdd`` ve paralel açma +
+ayrıştırma yolu (``ingest.read_kdd_parallel``) için satır/saniye ölçer.
+
+Kullanım:
+    python scripts/bench_ingest.py --path data/kddcup.data_10_percent.gz --repeat 3
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd
+
+from src.data import KDD_COLS, load_kdd
+from src.ingest import read_kdd_parallel
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--path', default='data/kddcup.data_10_percent.gz')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    cases = [
+        ('pd.read_csv (orijinal)', lambda: pd.read_csv(args.path, names=KDD_COLS, header=None, compression='gzip')),
+        ('load_kdd(typed, cache=False)', lambda: load_kdd(args.path, cache=False)),
+    ]
+    for workers in sorted({1, 2, 4, cpus}):
+        cases.append((f'read_kdd_parallel(workers={workers})',
+                      lambda w=workers: read_kdd_parallel(args.path, workers=w)))
+
+    print(f'Dosya: {args.path} | CPU: {cpus}')
+    baseline = None
+    for name, fn in cases:
+        elapsed, df = best_of(fn, args.repeat)
+        rate = len(df) / elapsed
+        baseline = baseline or rate
+        print(f'{name:36s} {elapsed:6.2f}s {rate:>12,.0f} satır/s  {rate / baseline:5.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Model Kayıt Biçimi Benchmark'ı
+Eğitilmiş bir Random Forest pipeline'ını ``joblib`` ile ve
+``persist.save_pipeline`` ile kaydedip disk boyutu, yükleme süresi, tahmin
+süresi ve tahmin eşitliğini karşılaştırır. Kayıt her iki yükleme biçimiyle
+ölçülür: ``sklearn`` (ağaçlar geri kurulur) ve ``flat`` (bellek eşlemeli
+``FlatForest``).
+
+Kullanım:
+    python scripts/bench_persist.py --n-estimators 300 --frac 0.3
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from functools import partial
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import joblib
+import numpy as np
+
+from src.data import load_kdd, sample_kdd
+from src.preprocess import add_targets, split_features
+from src.models import make_binary_pipelines
+from src.persist import load_pipeline, save_pipeline
+
+
+def _size(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob('*') if p.is_file()) if path.is_dir() else path.stat().st_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--n-estimators', type=int, default=300)
+    parser.add_argument('--frac', type=float, default=0.3, help='Eğitim setinden kullanılacak örneklem oranı')
+    parser.add_argument('--n-predict', type=int, default=50_000, help='Tahmin edilecek test satırı sayısı')
+    parser.add_argument('--data-dir', default='data')
+    args = parser.parse_args()
+
+    data_dir = Path(args.data_dir)
+    train_path = data_dir / 'kddcup.data_10_percent.gz'
+    train = add_targets(load_kdd(train_path) if args.frac >= 1 else sample_kdd(train_path, frac=args.frac))
+    X, y, _, num_cols, cat_cols = split_features(train)
+    X_test = split_features(add_targets(load_kdd(data_dir / 'corrected.gz')))[0].iloc[:args.n_predict]
+
+    pipe = make_binary_pipelines(num_cols, cat_cols, weighted=True)['rf'][0]
+    pipe.set_params(classifier__n_estimators=args.n_estimators, classifier__random_state=42)
+    pipe.fit(X, y)
+    reference = pipe.predict_proba(X_test)
+
+    root = Path(tempfile.mkdtemp())
+    try:
+        formats = [('joblib', root / 'model.joblib', joblib.dump, joblib.load),
+                   ('persist', root / 'model', save_pipeline, partial(load_pipeline, engine='sklearn')),
+                   ('flat', root / 'flat', save_pipeline, partial(load_pipeline, engine='flat'))]
+        for name, path, save, load in formats:
+            t0 = time.perf_counter()
+            save(pipe, path)
+            t_save = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            loaded = load(path)
+            t_load = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            proba = loaded.predict_proba(X_test)
+            t_pred = time.perf_counter() - t0
+            print(f'{name:8s} boyut={_size(path) / 2**20:7.1f} MB kayıt={t_save:6.3f}s yükleme={t_load:6.3f}s '
+                  f'tahmin={t_pred:6.2f}s max_fark={np.abs(proba - reference).max():.1e}')
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Hiperparametre Araması Benchmark'ı
+Aynı (pipeline, grid) çiftleri üzerinde kapsamlı grid araması
+(``FoldCachedSearchCV``) ile ardışık yarılamayı (``HalvingSearchCV``)
+duvar saati süresi, seçilen parametreler ve test seti F1 skoru açısından
+karşılaştırır.
+
+Kullanım:
+    python scripts/bench_search.py --model rf --frac 0.2 --factor 3
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from sklearn.metrics import f1_score
+
+from src.data import load_kdd, sample_kdd
+from src.preprocess import add_targets, split_features
+from src.models import make_binary_pipelines
+from src.search import FoldCachedSearchCV, HalvingSearchCV
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', choices=['lr', 'rf'], default='rf')
+    parser.add_argument('--frac', type=float, default=1.0, help='Eğitim setinden kullanılacak örneklem oranı')
+    parser.add_argument('--factor', type=int, default=3)
+    parser.add_argument('--cv', type=int, default=3)
+    parser.add_argument('--data-dir', default='data')
+    args = parser.parse_args()
+
+    data_dir = Path(args.data_dir)
+    train_path = data_dir / 'kddcup.data_10_percent.gz'
+    train = load_kdd(train_path) if args.frac >= 1 else sample_kdd(train_path, frac=args.frac)
+    train = add_targets(train)
+    test = add_targets(load_kdd(data_dir / 'corrected.gz'))
+    X, y, _, num_cols, cat_cols = split_features(train)
+    X_test, y_test, _, _, _ = split_features(test)
+    print(f'Eğitim: {len(X):,} satır, test: {len(X_test):,} satır')
+
+    pipe, grid = make_binary_pipelines(num_cols, cat_cols)[args.model]
+    searches = [
+        ('exhaustive', FoldCachedSearchCV(pipe, grid, scoring='f1', cv=args.cv, n_jobs=-1)),
+        ('halving', HalvingSearchCV(pipe, grid, factor=args.factor, scoring='f1', cv=args.cv, n_jobs=-1)),
+    ]
+    results = []
+    for name, search in searches:
+        t0 = time.perf_counter()
+        search.fit(X, y)
+        elapsed = time.perf_counter() - t0
+        f1 = f1_score(y_test, search.predict(X_test))
+        results.append((name, elapsed, f1))
+        print(f'{name:10s} süre={elapsed:7.2f}s cv_f1={search.best_score_:.4f} test_f1={f1:.4f} '
+              f'params={search.best_params_}')
+        if name == 'halving':
+            print(f'           kaynak takvimi: {search.n_resources_}')
+
+    print(f'\nHızlanma: {results[0][1] / results[1][1]:.2f}x, test F1 farkı: {results[1][2] - results[0][2]:+.4f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Mikro Gruplu Skorlama Servisi Benchmark'ı
+Satır başına ``predict_proba`` çağrısını ``src.serve`` servisiyle
+karşılaştırır. Servis geçici bir Unix soketinde başlatılır; ``--clients``
+eşzamanlı istemci (her biri yanıtı bekleyip bir sonraki kaydı gönderen bir
+sensör gibi) ``corrected.gz`` kayıtlarını gönderir. İstemci tarafı p50/p99
+gecikme, verim ve servis sayaçları raporlanır.
+
+Kullanım:
+    python scripts/bench_serve.py --model rf --clients 64 --n-requests 20000
+    python scripts/bench_serve.py --model-path runs/binary/tasks/rf-refit --max-wait-ms 5
+"""
+
+import argparse
+import asyncio
+import json
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from src.data import load_kdd, sample_kdd
+from src.preprocess import add_targets, split_features
+from src.models import make_binary_pipelines
+from src.score import load_model
+from src.serve import MicroBatcher, handle_connection, records_frame
+
+
+def _percentiles(latencies) -> str:
+    p50, p99 = np.percentile(np.asarray(latencies) * 1e3, [50, 99])
+    return f'p50={p50:7.2f}ms p99={p99:7.2f}ms'
+
+
+async def _client(socket_path: str, records: list[dict], latencies: list):
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    for record in records:
+        t0 = time.perf_counter()
+        writer.write(json.dumps(record).encode() + b'\n')
+        await writer.drain()
+        reply = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - t0)
+        if 'error' in reply:
+            raise RuntimeError(reply['error'])
+    writer.close()
+    await writer.wait_closed()
+
+
+async def _bench_service(model, records, clients, max_batch, max_wait_ms):
+    batcher = MicroBatcher(model, max_batch=max_batch, max_wait_ms=max_wait_ms)
+    await batcher.start()
+    root = Path(tempfile.mkdtemp())
+    socket_path = str(root / 'serve.sock')
+    server = await asyncio.start_unix_server(lambda r, w: handle_connection(batcher, r, w), path=socket_path)
+    latencies = []
+    try:
+        t0 = time.perf_counter()
+        await asyncio.gather(*(_client(socket_path, records[i::clients], latencies) for i in range(clients)))
+        elapsed = time.perf_counter() - t0
+    finally:
+        server.close()
+        await server.wait_closed()
+        await batcher.stop()
+        shutil.rmtree(root, ignore_errors=True)
+    return latencies, elapsed, batcher.stats.snapshot()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default='rf', choices=['lr', 'rf'], help='Eğitilecek ikili pipeline')
+    parser.add_argument('--model-path', default=None, help='Eğitmek yerine yüklenecek model')
+    parser.add_argument('--frac', type=float, default=0.2, help='Eğitim setinden kullanılacak örneklem oranı')
+    parser.add_argument('--n-requests', type=int, default=20_000)
+    parser.add_argument('--n-single', type=int, default=1_000, help='Satır başına tahmin ölçümündeki satır sayısı')
+    parser.add_argument('--clients', type=int, default=64)
+    parser.add_argument('--max-batch', type=int, default=256)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    parser.add_argument('--data-dir', default='data')
+    args = parser.parse_args()
+
+    data_dir = Path(args.data_dir)
+    if args.model_path:
+        model = load_model(args.model_path)
+    else:
+        train_path = data_dir / 'kddcup.data_10_percent.gz'
+        train = add_targets(load_kdd(train_path) if args.frac >= 1 else sample_kdd(train_path, frac=args.frac))
+        X, y, _, num_cols, cat_cols = split_features(train)
+        model = make_binary_pipelines(num_cols, cat_cols, weighted=True)[args.model][0].fit(X, y)
+
+    X_test = split_features(load_kdd(data_dir / 'corrected.gz'))[0]
+    X_test = X_test.sample(n=args.n_requests, random_state=0)
+    records = X_test.to_dict('records')
+
+    # Satır başına: her kayıt için ayrı çerçeve ve predict_proba çağrısı
+    latencies = []
+    t0 = time.perf_counter()
+    for record in records[:args.n_single]:
+        t = time.perf_counter()
+        model.predict_proba(records_frame([record], list(X_test.columns)))
+        latencies.append(time.perf_counter() - t)
+    elapsed = time.perf_counter() - t0
+    single_rate = len(latencies) / elapsed
+    print(f'satır başına  {_percentiles(latencies)} verim={single_rate:>9,.0f} kayıt/s')
+
+    latencies, elapsed, stats = asyncio.run(
+        _bench_service(model, records, args.clients, args.max_batch, args.max_wait_ms))
+    rate = len(latencies) / elapsed
+    print(f'servis        {_percentiles(latencies)} verim={rate:>9,.0f} kayıt/s '
+          f'({args.clients} istemci, ort. grup={stats["mean_batch"]:.1f})')
+    print(f"servis sayaçları: p50={stats['p50_ms']:.2f}ms p99={stats['p99_ms']:.2f}ms "
+          f"grup={stats['batches']:,} hata={stats['errors']}")
+    print(f'Verim artışı: {rate / single_rate:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+SMOTE Benchmark'ı
+Binary pipeline'daki one-hot sonrası ``imblearn.SMOTE`` adımı ile kodlamadan
+önce çalışan ``sampling.FastSMOTENC`` adımını örnekleme süresi, tepe bellek
+(tracemalloc), toplam fit süresi ve test setinde azınlık sınıfı duyarlılığı
+(recall) açısından karşılaştırır.
+
+Kullanım:
+    python scripts/bench_smote.py --model lr --frac 0.5
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from sklearn.metrics import f1_score, recall_score
+
+from src.data import load_kdd, sample_kdd
+from src.preprocess import add_targets, split_features
+from src.models import make_binary_pipelines
+from src.search import fit_transform_steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', choices=['lr', 'rf'], default='lr')
+    parser.add_argument('--frac', type=float, default=1.0, help='Eğitim setinden kullanılacak örneklem oranı')
+    parser.add_argument('--data-dir', default='data')
+    args = parser.parse_args()
+
+    data_dir = Path(args.data_dir)
+    train_path = data_dir / 'kddcup.data_10_percent.gz'
+    train = add_targets(load_kdd(train_path) if args.frac >= 1 else sample_kdd(train_path, frac=args.frac))
+    test = add_targets(load_kdd(data_dir / 'corrected.gz'))
+    X, y, _, num_cols, cat_cols = split_features(train)
+    X_test, y_test, _, _, _ = split_features(test)
+    minority = y.value_counts().idxmin()
+    print(f'Eğitim: {len(X):,} satır, azınlık sınıfı: {minority} ({(y == minority).sum():,} satır)')
+
+    results = []
+    for sampler in ['smote', 'fast']:
+        pipe = make_binary_pipelines(num_cols, cat_cols, sampler=sampler)[args.model][0]
+        if args.model == 'rf':
+            pipe.set_params(classifier__n_estimators=100, classifier__random_state=42)
+
+        # Yalnızca örnekleme (+ ön işleme) aşamaları: süre ve tepe bellek
+        timings = defaultdict(float)
+        tracemalloc.start()
+        Xt, yt, _, _ = fit_transform_steps(pipe, X, y, X.iloc[:1], timings=timings)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del Xt, yt
+
+        t0 = time.perf_counter()
+        pipe.fit(X, y)
+        t_fit = time.perf_counter() - t0
+        pred = pipe.predict(X_test)
+        recall = recall_score(y_test, pred, pos_label=minority)
+        f1 = f1_score(y_test, pred)
+        results.append((sampler, timings['smote'], peak, t_fit))
+        print(f'{sampler:6s} örnekleme={timings["smote"]:6.2f}s tepe_bellek={peak / 2**20:8.1f} MB '
+              f'fit={t_fit:7.2f}s azınlık_recall={recall:.4f} test_f1={f1:.4f}')
+
+    print(f'\nÖrnekleme hızlanması: {results[0][1] / results[1][1]:.2f}x, '
+          f'bellek oranı: {results[0][2] / results[1][2]:.2f}x, fit hızlanması: {results[0][3] / results[1][3]:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
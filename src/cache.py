@@ -0,0 +1,125 @@
+# src/cache.py
+"""Tekrarlayan trafik için tahmin önbelleği.
+
+KDD trafiği son derece tekrarlıdır: eğitim satırlarının ~%70'i birebir
+tekrardır, smurf/neptune taşkınları aynı kaydı binlerce kez üretir.
+``PredictionCache`` bir modelin önüne konur ve ham özellik satırının 64-bit
+özetini (``hash_pandas_object``, ``preprocess.deduplicate`` ile aynı) anahtar
+olarak kullanır. Her grup toplu sorgulanır: grup içi tekrarlar bir kez
+sayılır, yalnızca önbellekte olmayan tekil satırlar modele gider. Olasılıklar
+önceden ayrılmış bir tabloda tutulur; sınır aşıldığında en uzun süre
+kullanılmayan (LRU) kayıt çıkarılır.
+
+Kullanım:
+    model = PredictionCache(load_model('runs/binary/tasks/rf-refit'), maxsize=100_000)
+    model.predict_proba(X)
+    model.hit_rate_
+"""
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+CACHE_SIZE = 100_000
+
+
+def row_hashes(X: pd.DataFrame) -> np.ndarray:
+    """Satır başına 64-bit özet (index hariç, kolon sırasına duyarlı)."""
+    return pd.util.hash_pandas_object(X, index=False).to_numpy()
+
+
+class PredictionCache:
+    """Bir modelin ``predict_proba`` çıktısını satır özetine göre saklayan sınırlı LRU önbellek.
+
+    Önbellek tek bir eğitilmiş modele aittir; model değişirse yeni bir
+    önbellek kurulmalı ya da ``clear`` çağrılmalıdır. 64-bit özetlerde
+    çakışma olasılığı ihmal edilir (``deduplicate`` ile aynı varsayım).
+
+    Args:
+        model: Eğitilmiş model ya da pipeline
+        maxsize: Saklanacak en fazla tekil satır
+
+    Attributes:
+        n_seen_: Sorgulanan satır sayısı
+        n_hits_: Modele gitmeden yanıtlanan satır sayısı (grup içi tekrarlar dahil)
+        n_evicted_: Sınır nedeniyle çıkarılan kayıt sayısı
+    """
+
+    def __init__(self, model, maxsize: int = CACHE_SIZE):
+        if maxsize < 1:
+            raise ValueError(f"maxsize pozitif olmalı: {maxsize}")
+        self.model = model
+        self.maxsize = maxsize
+        self.classes_ = model.classes_
+        if hasattr(model, 'feature_names_in_'):
+            self.feature_names_in_ = model.feature_names_in_
+        self.clear()
+
+    def clear(self):
+        """Önbelleği ve sayaçları sıfırlar."""
+        self._slots = OrderedDict()   # özet -> tablo satırı; sıra = son kullanım
+        self._values = np.empty((0, len(self.classes_)), dtype=np.float64)
+        self.n_seen_ = 0
+        self.n_hits_ = 0
+        self.n_evicted_ = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    @property
+    def hit_rate_(self) -> float:
+        """Şimdiye kadar sorgulanan satırların modele gitmeden yanıtlanan oranı."""
+        return self.n_hits_ / self.n_seen_ if self.n_seen_ else 0.0
+
+    def stats(self) -> dict:
+        """Önbellek sayaçları."""
+        return {'cache_size': len(self), 'cache_seen': self.n_seen_, 'cache_hits': self.n_hits_,
+                'cache_hit_rate': self.hit_rate_, 'cache_evicted': self.n_evicted_}
+
+    def _store(self, keys, proba: np.ndarray):
+        """Yeni satırları tabloya yazar; gerekirse en eski kayıtların yerini kullanır."""
+        slots = self._slots
+        if len(self._values) < self.maxsize:
+            grow = min(self.maxsize, max(len(self._values) * 2, len(slots) + len(keys)))
+            if grow > len(self._values):
+                values = np.empty((grow, len(self.classes_)), dtype=np.float64)
+                values[:len(self._values)] = self._values
+                self._values = values
+        for key, row in zip(keys, proba):
+            if len(slots) < self.maxsize:
+                slot = len(slots)
+            else:
+                slot = slots.popitem(last=False)[1]
+                self.n_evicted_ += 1
+            slots[key] = slot
+            self._values[slot] = row
+
+    def predict_proba(self, X) -> np.ndarray:
+        keys = row_hashes(X)
+        unique, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        out = np.empty((len(unique), len(self.classes_)), dtype=np.float64)
+
+        slots = self._slots
+        hit_pos, hit_slots, miss_pos = [], [], []
+        for i, key in enumerate(unique.tolist()):
+            slot = slots.get(key)
+            if slot is None:
+                miss_pos.append(i)
+            else:
+                slots.move_to_end(key)
+                hit_pos.append(i)
+                hit_slots.append(slot)
+        if hit_pos:
+            out[hit_pos] = self._values[hit_slots]
+        if miss_pos:
+            # Yalnızca önbellekte olmayan tekil satırlar modele gider
+            proba = self.model.predict_proba(X.iloc[first[miss_pos]])
+            out[miss_pos] = proba
+            self._store(unique[miss_pos].tolist()[-self.maxsize:], proba[-self.maxsize:])
+
+        self.n_seen_ += len(keys)
+        self.n_hits_ += len(keys) - len(miss_pos)
+        return out[inverse.ravel()]
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
@@ -1,4 +1,10 @@
 # src/data.py
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
@@ -24,28 +30,444 @@ ATTACK_FAMILY = {
 }
 
 
-def load_kdd(path: str | Path, gz: bool = True) -> pd.DataFrame:
+# Sabit kategorik sözlükler: kodlar dosyadan dosyaya değişmez, görülmeyen
+# değerler ayrıştırma sırasında sözlüğün sonuna eklenir.
+PROTOCOLS = ['icmp', 'tcp', 'udp']
+SERVICES = [
+    'IRC', 'X11', 'Z39_50', 'auth', 'bgp', 'courier', 'csnet_ns', 'ctf', 'daytime', 'discard', 'domain',
+    'domain_u', 'echo', 'eco_i', 'ecr_i', 'efs', 'exec', 'finger', 'ftp', 'ftp_data', 'gopher', 'hostnames',
+    'http', 'http_443', 'icmp', 'imap4', 'iso_tsap', 'klogin', 'kshell', 'ldap', 'link', 'login', 'mtp', 'name',
+    'netbios_dgm', 'netbios_ns', 'netbios_ssn', 'netstat', 'nnsp', 'nntp', 'ntp_u', 'other', 'pm_dump', 'pop_2',
+    'pop_3', 'printer', 'private', 'red_i', 'remote_job', 'rje', 'shell', 'smtp', 'sql_net', 'ssh', 'sunrpc',
+    'supdup', 'systat', 'telnet', 'tftp_u', 'tim_i', 'time', 'urh_i', 'urp_i', 'uucp', 'uucp_path', 'vmnet',
+    'whois'
+]
+FLAGS = ['OTH', 'REJ', 'RSTO', 'RSTOS0', 'RSTR', 'S0', 'S1', 'S2', 'S3', 'SF', 'SH']
+LABELS = ['normal.'] + list(ATTACK_FAMILY) + ['mailbomb.', 'xlock.', 'xsnoop.']
+
+VOCABULARIES = {
+    'protocol_type': PROTOCOLS,
+    'service': SERVICES,
+    'flag': FLAGS,
+    'label': LABELS,
+}
+
+# Ayrıştırma şeması: ikili bayraklar uint8, pencere sayaçları dar tamsayı,
+# oran kolonları float32, metin kolonları sabit sözlüklü Categorical.
+KDD_DTYPES = {
+    'duration': 'uint32', 'src_bytes': 'uint32', 'dst_bytes': 'uint32',
+    'land': 'uint8', 'logged_in': 'uint8', 'root_shell': 'uint8', 'su_attempted': 'uint8',
+    'is_host_login': 'uint8', 'is_guest_login': 'uint8',
+    'wrong_fragment': 'uint16', 'urgent': 'uint16', 'hot': 'uint16', 'num_failed_logins': 'uint16',
+    'num_compromised': 'uint16', 'num_root': 'uint16', 'num_file_creations': 'uint16', 'num_shells': 'uint16',
+    'num_access_files': 'uint16', 'num_outbound_cmds': 'uint16',
+    'count': 'uint16', 'srv_count': 'uint16', 'dst_host_count': 'uint8', 'dst_host_srv_count': 'uint8',
+    **{c: 'float32' for c in KDD_COLS if c.endswith('_rate')},
+    **{c: pd.CategoricalDtype(v) for c, v in VOCABULARIES.items()},
+}
+
+
+CACHE_DIRNAME = '.kdd_cache'   # kaynak dosyanın yanında oluşturulan önbellek klasörü
+PARSE_CHUNKSIZE = 200_000      # şemalı ayrıştırmada parça başına satır
+
+
+def read_kdd_names(path: str | Path | None = None) -> tuple[list[str], dict[str, str]]:
+    """``kddcup.names`` dosyasını okur.
+
+    Args:
+        path: Dosya yolu (varsayılan: ``data/kddcup.names.txt``)
+
+    Returns:
+        tuple: (etiket listesi, ``{kolon: 'continuous' | 'symbolic'}``)
+    """
+    path = Path(path) if path is not None else Path(__file__).parent.parent / 'data' / 'kddcup.names.txt'
+    with open(path) as f:
+        lines = [line.strip() for line in f if line.strip()]
+    labels = [f"{name.strip().rstrip('.')}." for name in lines[0].split(',')]
+    kinds = {}
+    for line in lines[1:]:
+        col, kind = line.split(':')
+        kinds[col.strip()] = kind.strip().rstrip('.')
+    return labels, kinds
+
+
+def kdd_vocabulary(names_path: str | Path | None = None) -> dict[str, list]:
+    """Sembolik kolonlar için sabit kategori sözlüklerini döndürür.
+
+    Hangi kolonların sembolik olduğu ve etiket listesi ``kddcup.names``
+    dosyasından, metin kolonlarının değerleri ``VOCABULARIES``'den gelir;
+    diğer sembolik kolonlar (``land``, ``logged_in`` ...) ikili bayraktır.
+
+    Args:
+        names_path: ``kddcup.names`` dosyasının yolu
+
+    Returns:
+        dict: Kolon adı -> kategori listesi
+    """
+    labels, kinds = read_kdd_names(names_path)
+    vocab = {col: list(VOCABULARIES.get(col, [0, 1])) for col, kind in kinds.items() if kind == 'symbolic'}
+    vocab['label'] = LABELS + [label for label in labels if label not in LABELS]
+    return vocab
+
+
+def source_key(path: str | Path) -> str:
+    """Kaynak dosya için boyut, mtime ve içerik özetinden oluşan anahtar üretir.
+
+    Args:
+        path: Veri dosyasının yolu
+
+    Returns:
+        str: ``<boyut>-<mtime_ns>-<blake2b>`` biçiminde anahtar
+    """
+    path = Path(path)
+    st = path.stat()
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return f"{st.st_size:x}-{st.st_mtime_ns:x}-{digest.hexdigest()}"
+
+
+def cache_path(path: str | Path, cache_dir: str | Path | None = None, variant: str = 'typed') -> Path:
+    """Bir kaynak dosyanın kolon önbelleğinin yolunu döndürür.
+
+    Args:
+        path: Veri dosyasının yolu
+        cache_dir: Önbellek klasörü (varsayılan: kaynağın yanındaki ``.kdd_cache``)
+        variant: Önbellek türü (``'typed'`` şemalı, ``'raw'`` şemasız ayrıştırma)
+
+    Returns:
+        pathlib.Path: Önbellek klasörü
+    """
+    path = Path(path)
+    root = Path(cache_dir) if cache_dir is not None else path.parent / CACHE_DIRNAME
+    return root / f"{path.name}-{variant}-{source_key(path)}"
+
+
+def write_columns(df: pd.DataFrame, target: str | Path) -> Path:
+    """DataFrame'i kolon başına bir ``.npy`` dosyası olarak yazar.
+
+    Sayısal kolonlar olduğu gibi, kategorik ve metin kolonları ise kod +
+    sözlük olarak saklanır. Yazma geçici bir klasöre yapılıp atomik olarak
+    taşınır; aynı anda çalışan süreçler yarım yazılmış bir önbellek görmez.
+
+    Args:
+        df: Yazılacak veri seti
+        target: Hedef klasör
+
+    Returns:
+        pathlib.Path: Yazılan klasör
+    """
+    target = Path(target)
+    tmp = target.with_name(f"{target.name}.tmp{os.getpid()}")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    meta = {'n_rows': len(df), 'columns': []}
+    for i, col in enumerate(df.columns):
+        entry = {'name': col, 'file': f"{i:02d}.npy"}
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            np.save(tmp / entry['file'], values.cat.codes.to_numpy())
+            entry['categories'] = values.cat.categories.tolist()
+            entry['categorical'] = True
+        elif pd.api.types.is_numeric_dtype(values.dtype):
+            np.save(tmp / entry['file'], values.to_numpy())
+        else:
+            codes, uniques = pd.factorize(values, use_na_sentinel=True)
+            np.save(tmp / entry['file'], codes.astype(np.int32))
+            entry['categories'] = uniques.tolist()
+        meta['columns'].append(entry)
+    with open(tmp / 'meta.json', 'w') as f:
+        json.dump(meta, f)
+
+    try:
+        os.replace(tmp, target)
+    except OSError:
+        # Başka bir süreç aynı önbelleği bizden önce yazdı
+        shutil.rmtree(tmp, ignore_errors=True)
+    return target
+
+
+def read_columns(target: str | Path) -> pd.DataFrame:
+    """``write_columns`` ile yazılmış bir klasörü bellek eşlemeli olarak okur.
+
+    Sayısal kolonlar kopyalanmadan ``np.memmap`` üzerinden gelir; sayfalar aynı
+    dosyayı okuyan süreçler arasında paylaşılır. ``mmap_mode='c'`` sayesinde
+    DataFrame üzerindeki yazmalar dosyaya değil sürecin özel kopyasına gider.
+
+    Args:
+        target: Önbellek klasörü
+
+    Returns:
+        pandas.DataFrame: Okunan veri seti
+    """
+    target = Path(target)
+    with open(target / 'meta.json') as f:
+        meta = json.load(f)
+
+    data = {}
+    for entry in meta['columns']:
+        arr = np.load(target / entry['file'], mmap_mode='c').view(np.ndarray)
+        if entry.get('categorical'):
+            arr = pd.Categorical.from_codes(arr, categories=entry['categories'], validate=False)
+        elif 'categories' in entry:
+            arr = pd.Index(entry['categories']).take(arr, allow_fill=True, fill_value=np.nan)
+        data[entry['name']] = arr
+    return pd.DataFrame(data, copy=False)
+
+
+def _narrow(values: pd.Series, dtype) -> pd.Series:
+    """Tamsayı kolonunu şemadaki tipe, taşma varsa sığan en dar tipe indirir."""
+    dtype = np.dtype(dtype)
+    if len(values) and values.min() < 0:
+        return values   # negatif değer: işaretli tipte bırak
+    if len(values) and values.max() > np.iinfo(dtype).max:
+        for wider in (np.uint16, np.uint32, np.uint64):
+            if np.iinfo(wider).max >= values.max():
+                dtype = np.dtype(wider)
+                break
+    return values.astype(dtype)
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """``KDD_DTYPES`` şemasını bir DataFrame'e uygular.
+
+    Kategorik kolonlar sabit sözlükle kodlanır, sözlükte olmayan değerler
+    sona eklenir; tamsayı kolonları şemadaki tipe sığmıyorsa genişletilir.
+
+    Args:
+        df: KDD kolonlarını içeren veri seti
+
+    Returns:
+        pandas.DataFrame: Tipleri daraltılmış veri seti
+    """
+    out = {}
+    for col in df.columns:
+        values = df[col]
+        dtype = KDD_DTYPES.get(col)
+        if isinstance(dtype, pd.CategoricalDtype):
+            if not isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype('category')
+            vocab = list(dtype.categories)
+            extra = sorted(set(values.cat.categories) - set(vocab))
+            values = values.cat.set_categories(vocab + extra)
+        elif dtype is not None and np.dtype(dtype).kind == 'u' and values.dtype.kind in 'iu':
+            values = _narrow(values, dtype)
+        elif dtype is not None:
+            values = values.astype(dtype)
+        out[col] = values
+    return pd.DataFrame(out, index=df.index, copy=False)
+
+
+def _align_categories(frames: list[pd.DataFrame]) -> list[pd.DataFrame]:
+    """Parçalardaki kategorik kolonları aynı kategori listesine getirir."""
+    for col in frames[0].columns:
+        if not isinstance(frames[0][col].dtype, pd.CategoricalDtype):
+            continue
+        cats = list(frames[0][col].cat.categories)
+        seen = set(cats)
+        for frame in frames[1:]:
+            for c in frame[col].cat.categories:
+                if c not in seen:
+                    cats.append(c)
+                    seen.add(c)
+        for frame in frames:
+            if len(frame[col].cat.categories) != len(cats):
+                frame[col] = frame[col].cat.set_categories(cats)
+    return frames
+
+
+def _parse_dtypes() -> dict:
+    """``read_csv``'e verilecek tipler.
+
+    Tamsayı kolonları bilerek int64 ayrıştırılır: pandas dar tamsayı tiplerinde
+    taşmayı sessizce sarar, daraltma ``_narrow`` içinde kontrollü yapılır.
+    """
+    out = {}
+    for col, dtype in KDD_DTYPES.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            out[col] = 'category'
+        elif np.dtype(dtype).kind == 'f':
+            out[col] = dtype
+    return out
+
+
+def _read_typed(path: Path, gz: bool, chunksize: int):
+    """KDD dosyasını şema ile parça parça ayrıştırır (``DataFrame`` üreteci)."""
+    reader = pd.read_csv(path, names=KDD_COLS, header=None, dtype=_parse_dtypes(),
+                         compression='gzip' if gz else None, chunksize=chunksize)
+    with reader:
+        for chunk in reader:
+            yield apply_schema(chunk)
+
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """İki DataFrame'in kolon bazlı bellek kullanımını karşılaştırır.
+
+    Args:
+        before: Şema öncesi veri seti (ör. ``load_kdd(..., typed=False)``)
+        after: Şema uygulanmış veri seti
+
+    Returns:
+        pandas.DataFrame: Kolon başına MB cinsinden önce/sonra ve küçülme oranı
+    """
+    b = before.memory_usage(deep=True, index=False)
+    a = after.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        'before_mb': b / 2**20,
+        'after_mb': a.reindex(b.index) / 2**20,
+        'before_dtype': before.dtypes.astype(str),
+        'after_dtype': after.dtypes.reindex(b.index).astype(str),
+    })
+    report.loc['TOTAL', ['before_mb', 'after_mb']] = [b.sum() / 2**20, a.sum() / 2**20]
+    report['ratio'] = report['before_mb'] / report['after_mb']
+    return report
+
+
+def load_kdd(path: str | Path, gz: bool = True, cache: bool = True,
+             cache_dir: str | Path | None = None, typed: bool = True,
+             engine: str = 'pandas') -> pd.DataFrame:
     """KDD Cup 1999 veri setini yükler.
+
+    ``typed=True`` iken ``KDD_DTYPES`` şeması ayrıştırma sırasında uygulanır:
+    sayısal kolonlar dar tiplerde, metin kolonları sabit sözlüklü Categorical
+    olarak gelir (bellek kullanımı için bkz. ``memory_report``).
+
+    İlk yüklemede ayrıştırılan veri kolon bazlı bir önbelleğe yazılır; sonraki
+    yüklemeler gzip/CSV ayrıştırmasını atlayıp önbelleği bellek eşlemeli okur.
+    Önbellek anahtarı kaynak dosyanın boyutu, mtime değeri ve içerik özetidir,
+    dosya değiştiğinde otomatik olarak yeniden oluşturulur.
     
     Args:
         path: Veri dosyasının yolu
         gz: Dosyanın gzip ile sıkıştırılmış olup olmadığı
+        cache: Kolon önbelleği kullanılsın mı
+        cache_dir: Önbellek klasörü (varsayılan: kaynağın yanındaki ``.kdd_cache``)
+        typed: Tip şeması uygulansın mı
+        engine: ``'pandas'`` ya da ``'parallel'`` (paralel açma + ayrıştırma,
+            bkz. ``ingest.read_kdd_parallel``; yalnızca ``typed=True`` ile)
         
     Returns:
         pandas.DataFrame: Yüklenen veri seti
     """
     path = Path(path)
-    df = pd.read_csv(path, names=KDD_COLS, header=None, compression='gzip' if gz else None)
+    if cache:
+        target = cache_path(path, cache_dir, variant='typed' if typed else 'raw')
+        if (target / 'meta.json').exists():
+            return read_columns(target)
+
+    if typed and engine == 'parallel':
+        from .ingest import read_kdd_parallel
+        df = read_kdd_parallel(path, gz=gz)
+    elif typed:
+        frames = _align_categories(list(_read_typed(path, gz, PARSE_CHUNKSIZE)))
+        df = pd.concat(frames, ignore_index=True)
+    else:
+        df = pd.read_csv(path, names=KDD_COLS, header=None, compression='gzip' if gz else None)
+    if cache:
+        try:
+            write_columns(df, target)
+        except OSError:
+            # Salt okunur dizinlerde önbelleksiz devam et
+            return df
+        return read_columns(target)
     return df
 
 
-def load_kdd_data():
+def load_kdd_iter(path: str | Path, chunksize: int = PARSE_CHUNKSIZE, gz: bool = True,
+                  targets: bool = True):
+    """KDD dosyasını sabit bellekle parça parça okur.
+
+    Her parça ``KDD_DTYPES`` şemasıyla ayrıştırılır ve ``targets=True`` iken
+    ``y_binary`` / ``y_family`` kolonlarını taşır. Bellek kullanımı dosya
+    boyutundan bağımsızdır; tüm ``kddcup.data`` ya da sınırsız bağlantı
+    kayıtları üzerinde değerlendirme/istatistik için kullanılabilir.
+
+    Sözlükte olmayan kategorik değerler her parçada ayrı ayrı sona eklenir;
+    bilinen değerlerin kodları parçalar arasında aynıdır.
+
+    Args:
+        path: Veri dosyasının yolu
+        chunksize: Parça başına satır sayısı
+        gz: Dosyanın gzip ile sıkıştırılmış olup olmadığı
+        targets: Hedef değişkenleri eklensin mi
+
+    Yields:
+        pandas.DataFrame: Şemalı veri parçası (index dosyadaki satır numarasıdır)
+    """
+    from .preprocess import add_targets
+
+    for chunk in _read_typed(Path(path), gz, chunksize):
+        yield add_targets(chunk) if targets else chunk
+
+
+def sample_kdd(path: str | Path, frac: float = 0.1, by: str = 'label', min_per_class: int = 50,
+               seed: int = 42, chunksize: int = PARSE_CHUNKSIZE, gz: bool = True) -> pd.DataFrame:
+    """KDD dosyasından tek geçişte, tüm dosyayı belleğe almadan tabakalı örneklem çeker.
+
+    Her satıra tohumdan üretilen bir rastgele anahtar atanır; anahtarı
+    ``frac``'tan küçük olan satırlar örnekleme girer. Az temsil edilen sınıflar
+    için her sınıfın en küçük anahtarlı ``min_per_class`` satırı ayrıca bir
+    rezervuarda tutulur, böylece sınıf başına en az ``min(min_per_class,
+    sınıf_boyutu)`` satır garanti edilir (ör. U2R'nin 52 satırı). Sonuç
+    tohum sabitken parça boyutundan bağımsızdır.
+
+    Args:
+        path: Veri dosyasının yolu
+        frac: Örneklem oranı
+        by: Tabaka kolonu (``'label'``, ``'y_binary'`` ya da ``'y_family'``)
+        min_per_class: Sınıf başına garanti edilen en az satır
+        seed: Rastgelelik tohumu
+        chunksize: Okuma parçası boyutu
+        gz: Dosyanın gzip ile sıkıştırılmış olup olmadığı
+
+    Returns:
+        pandas.DataFrame: Hedef kolonlarını taşıyan, dosya sırasındaki örneklem
+    """
+    rng = np.random.default_rng(seed)
+    kept, spare = [], None
+    for chunk in load_kdd_iter(path, chunksize=chunksize, gz=gz):
+        key = rng.random(len(chunk))
+        kept.append(chunk[key < frac])
+        # Reddedilen satırlardan yalnızca sınıfının en küçük anahtarlıları aday olur
+        rest = np.flatnonzero(key >= frac)
+        order = rest[np.argsort(key[rest], kind='stable')]
+        cls = chunk[by].to_numpy()[order]
+        head = pd.Series(cls).groupby(cls, dropna=False, sort=False).cumcount().to_numpy() < min_per_class
+        rest = chunk.iloc[order[head]].assign(_key=key[order[head]])
+        if spare is not None:
+            rest = pd.concat(_align_categories([spare, rest]))
+        # Her sınıfın en küçük anahtarlı min_per_class satırı yedekte kalır
+        spare = (rest.sort_values('_key', kind='stable')
+                 .groupby(by, observed=True, dropna=False, sort=False).head(min_per_class))
+
+    sample = pd.concat(_align_categories(kept))
+    if spare is not None and len(spare):
+        have = sample[by].value_counts(dropna=False)
+        spare = spare.sort_values('_key', kind='stable')
+        rank = spare.groupby(by, observed=True, dropna=False, sort=False).cumcount()
+        need = min_per_class - spare[by].map(have).astype('float64').fillna(0).to_numpy()
+        extra = spare[rank.to_numpy() < need].drop(columns='_key')
+        if len(extra):
+            sample = pd.concat(_align_categories([sample, extra]))
+    return sample.sort_index()
+
+
+def load_kdd_data(cache: bool = True, dedup: bool = False):
     """KDD Cup 1999 veri setini yükler ve train/test olarak böler.
     
+    Args:
+        cache: Kolon önbelleği kullanılsın mı (bkz. ``load_kdd``)
+        dedup: Eğitim setindeki tekrar eden satırlar tekilleştirilsin mi
+            (bkz. ``preprocess.deduplicate``)
+        
     Returns:
-        tuple: (X_train, X_test, y_train, y_test)
+        tuple: (X_train, X_test, y_train, y_test); ``dedup=True`` iken sonuna
+        eğitim satırlarının ağırlıkları ``w_train`` eklenir
     """
     from sklearn.model_selection import train_test_split
+    from .preprocess import WEIGHT_COL, deduplicate
     
     # Veri dosyalarının yolları
     data_dir = Path(__file__).parent.parent / 'data'
@@ -54,33 +476,43 @@ def load_kdd_data():
     
     # Eğitim verisini yükle
     if train_path.exists():
-        df_train = load_kdd(train_path, gz=True)
+        df_train = load_kdd(train_path, gz=True, cache=cache)
     else:
         # Alternatif yol dene
         train_path = data_dir / 'kddcup.data_10_percent'
         if train_path.exists():
-            df_train = load_kdd(train_path, gz=False)
+            df_train = load_kdd(train_path, gz=False, cache=cache)
         else:
             raise FileNotFoundError(f"Eğitim veri dosyası bulunamadı: {train_path}")
+    if dedup:
+        df_train = deduplicate(df_train)
     
     # Test verisini yükle
     if test_path.exists():
-        df_test = load_kdd(test_path, gz=True)
+        df_test = load_kdd(test_path, gz=True, cache=cache)
     else:
         # Alternatif yol dene
         test_path = data_dir / 'corrected'
         if test_path.exists():
-            df_test = load_kdd(test_path, gz=False)
+            df_test = load_kdd(test_path, gz=False, cache=cache)
         else:
             # Test verisi yoksa train'den böl
             X = df_train.drop('label', axis=1)
             y = df_train['label']
-            return train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+            if not dedup:
+                return train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+            # Satırlar tekil olduğundan tekrarlar train/test arasında sızmaz
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y, test_size=0.2, random_state=42, stratify=y)
+            return (X_train.drop(columns=WEIGHT_COL), X_test.drop(columns=WEIGHT_COL),
+                    y_train, y_test, X_train[WEIGHT_COL])
     
     # Özellikleri ve etiketleri ayır
-    X_train = df_train.drop('label', axis=1)
+    X_train = df_train.drop(['label', WEIGHT_COL], axis=1, errors='ignore')
     y_train = df_train['label']
     X_test = df_test.drop('label', axis=1)
     y_test = df_test['label']
     
+    if dedup:
+        return X_train, X_test, y_train, y_test, df_train[WEIGHT_COL]
     return X_train, X_test, y_train, y_test
\ No newline at end of file
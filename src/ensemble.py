@@ -0,0 +1,191 @@
+# src/ensemble.py
+"""Çok aşamalı tahminciler.
+
+``CascadeClassifier`` tüm satırları ucuz modelle (ör. ``lr`` pipeline'ı)
+skorlar ve yalnızca olasılığı kalibre edilmiş bir belirsizlik bandına düşen
+satırları pahalı modele (ör. ``rf`` pipeline'ı) gönderir.
+``HierarchicalClassifier`` önce ikili bir kapıyla saldırıları ayırır, ardından
+yalnızca saldırı satırlarında aile modelini (ve istenirse nadir aileler için
+bir uzman modeli) çalıştırır.
+"""
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin, clone
+from sklearn.model_selection import StratifiedKFold, cross_val_predict
+from sklearn.utils import _safe_indexing
+
+
+class CascadeClassifier(BaseEstimator, ClassifierMixin):
+    """Ucuz model + belirsiz satırlar için pahalı model (ikili sınıflandırma).
+
+    Bant verilmezse ucuz modelin ``cv`` katlı çapraz doğrulama (katlar dışı)
+    olasılıklarından kalibre edilir: ucuz modelin yanlış karar verdiği
+    satırların en fazla ``tolerance`` oranı bant dışında kalacak şekilde en dar
+    bant seçilir (karar eşiği 0.5 her zaman bandın içindedir). Pahalı model
+    yalnızca bir kez, tüm veride eğitilir; ek maliyet ucuz modelin ``cv``
+    kez eğitilmesidir.
+
+    Args:
+        fast: Ucuz pipeline (ör. ``make_binary_pipelines(...)['lr'][0]``)
+        slow: Pahalı pipeline (ör. ``make_binary_pipelines(...)['rf'][0]``)
+        band: Sabit ``(alt, üst)`` bant; ``None`` ise kalibre edilir
+        tolerance: Bant dışında kalmasına izin verilen ucuz model hatalarının
+            eğitim satırlarına oranı
+        cv: Kalibrasyon için kat sayısı
+        random_state: Kat bölmesi tohumu
+
+    Attributes:
+        band_: Kullanılan (alt, üst) bant
+        n_seen_, n_escalated_: ``predict`` çağrılarında görülen / pahalı modele
+            giden satır sayıları (``predict_proba`` sayaçları değiştirmez)
+    """
+
+    def __init__(self, fast, slow, band=None, tolerance=0.002, cv=3, random_state=42):
+        self.fast = fast
+        self.slow = slow
+        self.band = band
+        self.tolerance = tolerance
+        self.cv = cv
+        self.random_state = random_state
+
+    def fit(self, X, y, **fit_params):
+        if self.band is None:
+            folds = StratifiedKFold(self.cv, shuffle=True, random_state=self.random_state)
+            proba = cross_val_predict(clone(self.fast), X, y, cv=folds, method='predict_proba', params=fit_params)
+            self.band_ = self._calibrate(proba, y, np.unique(y))
+        else:
+            self.band_ = tuple(self.band)
+
+        self.fast_ = clone(self.fast).fit(X, y, **fit_params)
+        self.slow_ = clone(self.slow).fit(X, y, **fit_params)
+        self.classes_ = self.fast_.classes_
+        self.n_seen_ = 0
+        self.n_escalated_ = 0
+        return self
+
+    def _calibrate(self, proba_fast, y_ref, classes):
+        """Bant dışındaki hatalar ``tolerance`` bütçesini aşmayacak en dar (alt, üst) bant."""
+        p = proba_fast[:, 1]
+        disagree = classes.take(proba_fast.argmax(axis=1)) != np.asarray(y_ref)
+        allowed = int(self.tolerance * len(p) / 2)   # bütçe iki tarafa eşit bölünür
+        edges = []
+        for side in (p[disagree & (p < 0.5)], p[disagree & (p >= 0.5)]):
+            distance = np.sort(np.abs(side - 0.5))[::-1]
+            # En emin 'allowed' anlaşmazlık bant dışında kalabilir
+            edges.append(distance[allowed] if len(distance) > allowed else 0.0)
+        return float(0.5 - edges[0]), float(0.5 + edges[1])
+
+    def escalate_mask(self, p_fast: np.ndarray) -> np.ndarray:
+        """Pahalı modele gönderilecek satırlar (ucuz modelin pozitif sınıf olasılığına göre)."""
+        low, high = self.band_
+        return (p_fast >= low) & (p_fast <= high)
+
+    @property
+    def escalation_rate_(self) -> float:
+        """Şimdiye kadar tahmin edilen satırların pahalı modele giden oranı."""
+        return self.n_escalated_ / self.n_seen_ if self.n_seen_ else 0.0
+
+    def _predict_proba(self, X):
+        """(olasılıklar, pahalı modele giden satır maskesi)."""
+        proba = self.fast_.predict_proba(X)
+        mask = self.escalate_mask(proba[:, 1])
+        if mask.any():
+            proba[mask] = self.slow_.predict_proba(_safe_indexing(X, np.flatnonzero(mask)))
+        return proba, mask
+
+    def predict_proba(self, X):
+        return self._predict_proba(X)[0]
+
+    def predict(self, X):
+        proba, mask = self._predict_proba(X)
+        self.n_seen_ += len(mask)
+        self.n_escalated_ += int(mask.sum())
+        return self.classes_.take(np.argmax(proba, axis=1))
+
+
+class HierarchicalClassifier(BaseEstimator, ClassifierMixin):
+    """İki aşamalı saldırı ailesi sınıflandırıcısı: ikili kapı, ardından aile modeli.
+
+    Kapı (ör. ``make_binary_pipelines(...)['rf'][0]``) tüm satırlarda
+    normal/saldırı ayrımı yapar; aile modeli (ör.
+    ``make_multiclass_pipelines(...)['rf'][0]``) yalnızca saldırı satırlarında
+    eğitilir. ``rare`` verilirse ``rare_classes`` aileleri aile modelinde tek
+    bir ``'rare'`` sınıfında birleşir ve bu sınıfa düşen satırlar yalnızca
+    nadir ailelerle eğitilmiş uzman modele gider. Eğitim verisinde en az iki
+    nadir aile yoksa uzman eğitilmez (``rare_ = None``) ve görülen nadir
+    aile aile modelinde kendi sınıfı olarak kalır.
+
+    ``predict`` kesin yönlendirme yapar (kapı 0.5 eşiğinde, ardından en olası
+    aile) ve aile modellerini yalnızca saldırı denen satırlarda çalıştırır;
+    ``predict_proba`` olasılıkları çarpımla birleştirir:
+    P(aile) = P(saldırı) x P(aile | saldırı). Uzman model yalnızca
+    P('rare') > 0 olan satırlarda çalışır; diğer satırlarda katkısı sıfırdır.
+
+    Args:
+        gate: İkili (0 normal / 1 saldırı) pipeline
+        family: Saldırı ailesi pipeline'ı
+        rare: Nadir aileler için uzman pipeline (opsiyonel)
+        rare_classes: Uzman modele ayrılan aileler
+        normal_label: Normal trafiğin etiketi
+    """
+
+    def __init__(self, gate, family, rare=None, rare_classes=('r2l', 'u2r'), normal_label='normal'):
+        self.gate = gate
+        self.family = family
+        self.rare = rare
+        self.rare_classes = rare_classes
+        self.normal_label = normal_label
+
+    def fit(self, X, y):
+        y = np.asarray(y)
+        attack = y != self.normal_label
+        self.gate_ = clone(self.gate).fit(X, attack.astype(np.uint8))
+
+        X_attack, y_attack = _safe_indexing(X, np.flatnonzero(attack)), y[attack]
+        self.rare_ = None
+        is_rare = np.isin(y_attack, self.rare_classes)
+        # Uzman model en az iki nadir aile görmeli (tek sınıfla eğitilemez)
+        if self.rare is not None and len(np.unique(y_attack[is_rare])) > 1:
+            self.rare_ = clone(self.rare).fit(_safe_indexing(X_attack, np.flatnonzero(is_rare)), y_attack[is_rare])
+            y_attack = np.where(is_rare, 'rare', y_attack)
+        self.family_ = clone(self.family).fit(X_attack, y_attack)
+
+        families = [c for c in self.family_.classes_ if not (self.rare_ is not None and c == 'rare')]
+        if self.rare_ is not None:
+            families.extend(self.rare_.classes_)
+        self.classes_ = np.array([self.normal_label] + sorted(families), dtype=object)
+        return self
+
+    def _family_proba(self, X) -> np.ndarray:
+        """P(aile | saldırı), ``classes_[1:]`` sırasıyla."""
+        index = {c: i for i, c in enumerate(self.classes_[1:])}
+        out = np.zeros((X.shape[0], len(index)))
+        proba = self.family_.predict_proba(X)
+        for j, c in enumerate(self.family_.classes_):
+            if self.rare_ is not None and c == 'rare':
+                rows = np.flatnonzero(proba[:, j] > 0)
+                if len(rows) == 0:
+                    continue
+                rare = self.rare_.predict_proba(_safe_indexing(X, rows))
+                for k, r in enumerate(self.rare_.classes_):
+                    out[rows, index[r]] += proba[rows, j] * rare[:, k]
+            else:
+                out[:, index[c]] += proba[:, j]
+        return out
+
+    def predict_proba(self, X):
+        p_attack = self.gate_.predict_proba(X)[:, list(self.gate_.classes_).index(1)]
+        return np.column_stack([1 - p_attack, p_attack[:, None] * self._family_proba(X)])
+
+    def predict(self, X):
+        pred = np.full(X.shape[0], self.normal_label, dtype=object)
+        rows = np.flatnonzero(self.gate_.predict(X) == 1)
+        if len(rows) == 0:
+            return pred
+        X_attack = _safe_indexing(X, rows)
+        family = self.family_.predict(X_attack).astype(object)
+        if self.rare_ is not None:
+            to_rare = np.flatnonzero(family == 'rare')
+            if len(to_rare):
+                family[to_rare] = self.rare_.predict(_safe_indexing(X_attack, to_rare))
+        pred[rows] = family
+        return pred
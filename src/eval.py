@@ -62,4 +62,48 @@ def find_best_threshold(y_true, y_scores):
         f1 = f1_score(y_true, (y_scores>=t).astype(int))
         if f1 > best_f1:
             best_t, best_f1 = t, f1
-    return best_t, best_f1
\ No newline at end of file
+    return best_t, best_f1
+
+def evaluate_chunks(model, chunks, target='y_binary', labels=None):
+    """Modeli parça parça gelen veri üzerinde sabit bellekle değerlendirir.
+
+    ``load_kdd_iter`` çıktısıyla birlikte kullanılır; yalnızca karışıklık
+    matrisi biriktirilir, tahminler saklanmaz. Hedefi boş olan satırlar atlanır.
+
+    Args:
+        model: ``predict`` metodu olan eğitilmiş model/pipeline
+        chunks: Hedef kolonlarını taşıyan DataFrame parçaları
+        target: Hedef kolon adı
+        labels: Sınıf etiketleri (varsayılan: ``model.classes_``)
+
+    Returns:
+        dict: n_rows, labels, confusion_matrix, accuracy, f1_macro ve sınıf
+        bazında f1 (ikili hedefte ayrıca pozitif sınıf için ``f1``)
+    """
+    from .preprocess import split_features
+
+    labels = list(model.classes_ if labels is None else labels)
+    cm = np.zeros((len(labels), len(labels)), dtype=np.int64)
+    for chunk in chunks:
+        chunk = chunk[chunk[target].notna()]
+        if len(chunk) == 0:
+            continue
+        X = split_features(chunk)[0]
+        cm += confusion_matrix(chunk[target], model.predict(X), labels=labels)
+
+    tp = np.diag(cm).astype(float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.where(cm.sum(axis=0) > 0, tp / cm.sum(axis=0), 0.0)
+        recall = np.where(cm.sum(axis=1) > 0, tp / cm.sum(axis=1), 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+    result = {
+        'n_rows': int(cm.sum()),
+        'labels': labels,
+        'confusion_matrix': cm,
+        'accuracy': tp.sum() / max(cm.sum(), 1),
+        'f1_macro': f1.mean(),
+        'f1_per_class': dict(zip(labels, f1)),
+    }
+    if len(labels) == 2:
+        result['f1'] = f1[1]
+    return result
@@ -0,0 +1,250 @@
+# src/ingest.py
+"""KDD dosyaları için paralel ayrıştırma yolu.
+
+gzip açma işlemi ayrı bir iş parçacığında satır sonlarına hizalı bloklar
+üretir, bloklar bir iş parçacığı havuzunda ayrıştırılır ve sonuçlar sırayla
+önceden ayrılmış tipli kolon dizilerine kopyalanır. zlib ve CSV ayrıştırıcıları
+(pyarrow varsa pyarrow, yoksa pandas C ayrıştırıcısı) GIL'i bıraktığından
+açma ve ayrıştırma çok çekirdekte üst üste biner.
+"""
+import io
+import os
+import queue
+from contextlib import closing
+import struct
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .data import KDD_COLS, KDD_DTYPES, _parse_dtypes
+
+BLOCK_SIZE = 8 << 20     # ayrıştırma bloğu (sıkıştırılmamış bayt)
+_SENTINEL = None
+
+
+def _gzip_isize(path: Path) -> int:
+    """gzip son ekindeki ISIZE alanı: sıkıştırılmamış boyut (mod 2**32)."""
+    with open(path, 'rb') as f:
+        f.seek(-4, os.SEEK_END)
+        return struct.unpack('<I', f.read(4))[0]
+
+
+def iter_blocks(path: str | Path, gz: bool = True, block_size: int = BLOCK_SIZE):
+    """Dosyayı satır sonuna hizalanmış ham bayt blokları olarak okur.
+
+    Args:
+        path: Veri dosyasının yolu
+        gz: Dosyanın gzip ile sıkıştırılmış olup olmadığı
+        block_size: Yaklaşık blok boyutu (sıkıştırılmamış bayt)
+
+    Yields:
+        bytes: Tam satırlardan oluşan blok
+    """
+    pending = bytearray()
+    with open(path, 'rb') as f:
+        # wbits=47: gzip/zlib başlığını otomatik tanı; çoklu gzip üyeleri aşağıda
+        inflater = zlib.decompressobj(wbits=47) if gz else None
+        for raw in iter(lambda: f.read(1 << 18), b''):
+            if gz:
+                data = inflater.decompress(raw)
+                while inflater.eof and inflater.unused_data:
+                    rest = inflater.unused_data
+                    inflater = zlib.decompressobj(wbits=47)
+                    data += inflater.decompress(rest)
+                raw = data
+            pending += raw
+            if len(pending) >= block_size:
+                cut = pending.rfind(b'\n') + 1
+                if cut:
+                    yield bytes(pending[:cut])
+                    del pending[:cut]
+    if pending.strip():
+        yield bytes(pending) + (b'' if pending.endswith(b'\n') else b'\n')
+
+
+def _parse_block_pandas(block: bytes) -> dict:
+    df = pd.read_csv(io.BytesIO(block), names=KDD_COLS, header=None, dtype=_parse_dtypes())
+    return {c: df[c].to_numpy() if not isinstance(df[c].dtype, pd.CategoricalDtype)
+            else (df[c].cat.codes.to_numpy(), list(df[c].cat.categories)) for c in KDD_COLS}
+
+
+def _parse_block_arrow(block: bytes) -> dict:
+    import pyarrow as pa
+    import pyarrow.csv as pcsv
+
+    # Tipler açıkça verilir; pyarrow'un tip çıkarımı ayrıştırma süresini ikiye katlıyor
+    column_types = {}
+    for col, dtype in KDD_DTYPES.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            column_types[col] = pa.dictionary(pa.int32(), pa.string())
+        elif np.dtype(dtype).kind == 'f':
+            column_types[col] = pa.from_numpy_dtype(np.dtype(dtype))
+        else:
+            column_types[col] = pa.int64()   # daraltma _ColumnBuffers.append içinde
+    table = pcsv.read_csv(
+        io.BytesIO(block),
+        read_options=pcsv.ReadOptions(column_names=KDD_COLS, use_threads=False),
+        convert_options=pcsv.ConvertOptions(column_types=column_types),
+    )
+    out = {}
+    for col in KDD_COLS:
+        arr = table.column(col).combine_chunks()
+        if pa.types.is_dictionary(arr.type):
+            out[col] = (arr.indices.to_numpy(zero_copy_only=False), arr.dictionary.to_pylist())
+        else:
+            out[col] = arr.to_numpy(zero_copy_only=False)
+    return out
+
+
+def _block_parser():
+    try:
+        import pyarrow.csv  # noqa: F401
+    except ImportError:
+        return _parse_block_pandas
+    return _parse_block_arrow
+
+
+class _ColumnBuffers:
+    """Önceden ayrılmış, gerektiğinde büyüyen tipli kolon dizileri."""
+
+    def __init__(self, capacity: int):
+        self.n = 0
+        self.arrays = {}
+        self.vocab = {}
+        for col, dtype in KDD_DTYPES.items():
+            if isinstance(dtype, pd.CategoricalDtype):
+                self.vocab[col] = {v: i for i, v in enumerate(dtype.categories)}
+                self.arrays[col] = np.empty(capacity, dtype=np.int16)
+            else:
+                self.arrays[col] = np.empty(capacity, dtype=dtype)
+
+    def _reserve(self, extra: int):
+        capacity = len(self.arrays[KDD_COLS[0]])
+        if self.n + extra <= capacity:
+            return
+        capacity = max(self.n + extra, int(capacity * 1.5))
+        for col, arr in self.arrays.items():
+            grown = np.empty(capacity, dtype=arr.dtype)
+            grown[:self.n] = arr[:self.n]
+            self.arrays[col] = grown
+
+    def append(self, parsed: dict):
+        size = len(parsed['duration'])
+        self._reserve(size)
+        end = self.n + size
+        for col, values in parsed.items():
+            target = self.arrays[col]
+            if col in self.vocab:
+                codes, categories = values
+                vocab = self.vocab[col]
+                lookup = np.array([vocab.setdefault(c, len(vocab)) for c in categories] + [-1], dtype=np.int16)
+                target[self.n:end] = lookup[codes]
+                continue
+            if target.dtype.kind in 'iu' and size:
+                low, high = values.min(), values.max()
+                info = np.iinfo(target.dtype)
+                if low < info.min or high > info.max:
+                    # Şemadaki dar tipe sığmayan blok: kolonu genişlet (_narrow ile aynı davranış;
+                    # negatif değer varsa ayrıştırılan işaretli tipte kalır)
+                    wider = values.dtype if low < 0 else np.promote_types(target.dtype, np.min_scalar_type(high))
+                    target = self.arrays[col] = target.astype(wider)
+            target[self.n:end] = values
+        self.n = end
+
+    def finish(self) -> pd.DataFrame:
+        data = {}
+        for col in KDD_COLS:
+            arr = self.arrays[col][:self.n]
+            if col in self.vocab:
+                fixed = list(KDD_DTYPES[col].categories)
+                found = list(self.vocab[col])
+                extra = sorted(found[len(fixed):])
+                if extra:
+                    # Görülmeyen değerler pandas yolundaki gibi sıralı eklenir
+                    order = {v: i for i, v in enumerate(fixed + extra)}
+                    remap = np.array([order[v] for v in found] + [-1], dtype=np.int16)
+                    arr = remap[arr]
+                arr = pd.Categorical.from_codes(arr, categories=fixed + extra, validate=False)
+            data[col] = arr
+        return pd.DataFrame(data, copy=False)
+
+
+def read_kdd_parallel(path: str | Path, gz: bool = True, workers: int | None = None,
+                      block_size: int = BLOCK_SIZE) -> pd.DataFrame:
+    """KDD dosyasını paralel açma + ayrıştırma ile ``load_kdd(typed=True)`` çıktısına okur.
+
+    Args:
+        path: Veri dosyasının yolu
+        gz: Dosyanın gzip ile sıkıştırılmış olup olmadığı
+        workers: Ayrıştırıcı iş parçacığı sayısı (varsayılan: CPU sayısı)
+        block_size: Ayrıştırma bloğu boyutu (bayt)
+
+    Returns:
+        pandas.DataFrame: ``KDD_DTYPES`` şemalı veri seti
+    """
+    path = Path(path)
+    workers = workers or os.cpu_count() or 1
+    parse = _block_parser()
+
+    # Satır sayısı tahmini: sıkıştırılmamış boyut / ~150 bayt (ortalama satır uzunluğu)
+    size = _gzip_isize(path) if gz else path.stat().st_size
+    buffers = _ColumnBuffers(capacity=max(size // 150, 1))
+
+    # Açma iş parçacığı -> sınırlı kuyruk -> ayrıştırıcı havuzu -> sıralı kopyalama
+    blocks = queue.Queue(maxsize=workers * 2)
+    stop = threading.Event()
+    errors = []
+
+    def put(item) -> bool:
+        # Tüketici durursa (ayrıştırma hatası) üretici kuyrukta asılı kalmaz
+        while not stop.is_set():
+            try:
+                blocks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            # closing: erken çıkışta dosya tanıtıcısı hemen kapanır
+            with closing(iter_blocks(path, gz, block_size)) as reader:
+                for block in reader:
+                    if not put(block):
+                        break
+        except BaseException as exc:   # hata ana iş parçacığında yeniden fırlatılır
+            errors.append(exc)
+        finally:
+            put(_SENTINEL)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    pool = ThreadPoolExecutor(max_workers=workers)
+    pending = []
+    try:
+        while True:
+            block = blocks.get()
+            if block is _SENTINEL:
+                break
+            pending.append(pool.submit(parse, block))
+            while len(pending) > workers:
+                buffers.append(pending.pop(0).result())
+        while pending:
+            buffers.append(pending.pop(0).result())
+    finally:
+        # Hata durumunda bekleyen işler iptal edilir, kuyruk boşaltılır ve üretici durdurulur
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+        while True:
+            try:
+                blocks.get_nowait()
+            except queue.Empty:
+                break
+        producer.join()
+    if errors:
+        raise errors[0]
+    return buffers.finish()
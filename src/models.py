@@ -1,64 +1,239 @@
 # src/models.py
+import copy
+import warnings
+import numpy as np
+from sklearn import config_context
 from sklearn.compose import ColumnTransformer
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 from sklearn.pipeline import Pipeline
 from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+from sklearn.utils.validation import has_fit_parameter
 from imblearn.over_sampling import SMOTE
 from imblearn.pipeline import Pipeline as IMBPipeline
-from .preprocess import ConstantDropper
+from .preprocess import (ConstantDropper, IncrementalPreprocessor, KDDBinner, WeightedColumnTransformer,
+                         compile_preprocessor)
+from .sampling import FastSMOTENC
+from .store import StoredPreprocessor, unwrap_stored
 
 
-def make_preprocessor(num_cols, cat_cols):
+def make_preprocessor(num_cols, cat_cols, categories='auto'):
     """Ön işleme pipeline'ı oluşturur.
     
     Args:
         num_cols: Sayısal kolon isimleri
         cat_cols: Kategorik kolon isimleri
+        categories: ``'auto'`` ya da kolon adı -> kategori listesi sözlüğü
+            (ör. eğitilmiş bir ``IncrementalPreprocessor.categories_``)
         
     Returns:
-        ColumnTransformer: Ön işleme pipeline'ı
+        WeightedColumnTransformer: Ön işleme pipeline'ı (``fit`` isteğe bağlı
+        ``sample_weight`` alır; ölçekleyici ağırlıklı istatistiklerle eğitilir)
     """
+    if isinstance(categories, dict):
+        categories = [list(categories[c]) for c in cat_cols]
+    # İstek yalnızca yönlendirme açıkken tanımlanabilir; ağırlıksız fit'i etkilemez
+    with config_context(enable_metadata_routing=True):
+        scale = StandardScaler(with_mean=False).set_fit_request(sample_weight=True)
     numeric = Pipeline(steps=[
-        ('scale', StandardScaler(with_mean=False))  # sparse ile uyumlu
+        ('scale', scale)  # sparse ile uyumlu
     ])
     categorical = Pipeline(steps=[
-        ('onehot', OneHotEncoder(handle_unknown='ignore'))
+        ('onehot', OneHotEncoder(categories=categories, handle_unknown='ignore'))
     ])
-    pre = ColumnTransformer([
+    pre = WeightedColumnTransformer([
         ('num', numeric, num_cols),
         ('cat', categorical, cat_cols)
     ], remainder='drop')
     return pre
 
 
-def make_binary_pipelines(num_cols, cat_cols):
+def make_binner(num_cols, cat_cols):
+    """HistGradientBoosting pipeline'ları için ``uint8`` kutulayıcı oluşturur.
+
+    ``store=MatrixStore()`` ile kurulan pipeline'larda kutulama her katta bir
+    kez yapılır ve o katta denenen adaylar arasında paylaşılır.
+    ``precomputed=True`` ile ``'hgb'`` girdisi bu kutulayıcının tüm eğitim
+    setinde eğitilmiş çıktısıdır (ör. ``MatrixStore().fit_transform(make_binner(...), X)``).
+
+    Args:
+        num_cols: Sayısal kolon isimleri
+        cat_cols: Kategorik kolon isimleri
+
+    Returns:
+        KDDBinner: Eğitilmemiş kutulayıcı
+    """
+    return KDDBinner(num_cols, cat_cols)
+
+
+def _make_hgb(num_cols, cat_cols, **kwargs):
+    """Doğal kategorik destekli, erken durdurmalı HistGradientBoostingClassifier."""
+    return HistGradientBoostingClassifier(
+        categorical_features=np.array([False] * len(num_cols) + [True] * len(cat_cols)),
+        early_stopping=True, validation_fraction=0.1, n_iter_no_change=10, max_iter=500,
+        random_state=42, **kwargs)
+
+
+def _balanced_correction(y, sample_weight):
+    """Tekil satır sayımlı ``'balanced'`` sınıf ağırlığını ağırlıklı sayımlara çeviren satır çarpanları."""
+    classes, codes = np.unique(y, return_inverse=True)
+    counts = np.bincount(codes, minlength=len(classes))
+    weighted = np.bincount(codes, weights=sample_weight, minlength=len(classes))
+    # balanced: n / (k * n_c); düzeltme = (W / W_c) / (n / n_c)
+    factor = (weighted.sum() / weighted) / (counts.sum() / counts)
+    return factor[codes]
+
+
+def sample_weight_params(pipe, sample_weight, y=None):
+    """Tekilleştirilmiş veriyle tüm veriye denk eğitim için fit parametrelerini üretir.
+
+    ``deduplicate`` ile elde edilen ağırlıklarla kullanılır:
+    ``pipe.fit(X, y, **sample_weight_params(pipe, w, y))`` veya
+    ``GridSearchCV(...).fit(X, y, **sample_weight_params(pipe, w, y))``
+    (GridSearchCV ağırlıkları katlara göre kendisi böler).
+
+    Ağırlıklar sınıflandırıcıya ve ``sample_weight`` alan ön işleme adımına
+    (``make_preprocessor``: ölçekleyici) iletilir. Sınıflandırıcı
+    ``class_weight='balanced'`` ise sınıf ağırlıklarını tekil satır
+    sayılarından hesaplar; sınıflandırıcı ağırlıkları bu farkı ağırlıklı
+    etiket sayılarına göre düzeltecek şekilde ölçeklenir. CV'de düzeltme tüm
+    eğitim setinin sayımlarıyla yapılır (katmanlı katlarda oranlar aynıdır).
+
+    Args:
+        pipe: Pipeline
+        sample_weight: Satır ağırlıkları
+        y: Etiketler; son adım ``class_weight='balanced'`` ise gereklidir
+
+    Returns:
+        dict: ``{'<adım>__sample_weight': ağırlıklar}``
+    """
+    sample_weight = np.asarray(sample_weight, dtype=np.float64)
+    params = {}
+    for name, step in pipe.steps[:-1]:
+        inner = step.preprocessor if isinstance(step, StoredPreprocessor) else step
+        if hasattr(inner, 'fit') and has_fit_parameter(inner, 'sample_weight'):
+            params[f'{name}__sample_weight'] = sample_weight
+    name, clf = pipe.steps[-1]
+    if getattr(clf, 'class_weight', None) == 'balanced':
+        if y is None:
+            raise ValueError("class_weight='balanced' için ağırlıklı sınıf sayıları gerekir; y verilmeli")
+        params[f'{name}__sample_weight'] = sample_weight * _balanced_correction(y, sample_weight)
+    else:
+        params[f'{name}__sample_weight'] = sample_weight
+    return params
+
+
+def compile_pipeline(pipe, dtype=np.float64):
+    """Eğitilmiş pipeline'ın ön işleyicisini ``CompiledEncoder`` ile değiştirir.
+
+    Orijinal pipeline değişmez; yüzeysel bir kopya döner. Tahminler orijinal
+    pipeline ile aynıdır (``dtype=np.float32`` yalnızca girdiyi zaten
+    ``float32``'ye çeviren ağaç modellerinde aynı sonucu verir).
+
+    Args:
+        pipe: Eğitilmiş pipeline (ör. ``make_binary_pipelines`` çıktısı)
+        dtype: Kodlanmış matrisin tipi
+
+    Returns:
+        Pipeline: ``'preprocessor'`` adımı derlenmiş pipeline
+    """
+    # StoredPreprocessor içindeki eğitilmiş ön işleyici derlenir
+    steps = [(name, compile_preprocessor(step, dtype=dtype)
+              if isinstance(step, (ColumnTransformer, IncrementalPreprocessor)) else step)
+             for name, step in unwrap_stored(pipe).steps]
+    compiled = copy.copy(pipe)
+    compiled.steps = steps
+    return compiled
+
+
+def make_incremental_preprocessor(num_cols, cat_cols):
+    """``make_preprocessor`` ile aynı çıktıyı veren, ``partial_fit`` destekli ön işleyici.
+
+    Kategoriler görülen değerlerin sıralı birleşimidir; parça sırasından
+    bağımsız olarak eğitim sonrası çıktı, aynı veride
+    ``make_preprocessor(num_cols, cat_cols)`` çıktısına eşittir.
+
+    Args:
+        num_cols: Sayısal kolon isimleri
+        cat_cols: Kategorik kolon isimleri
+
+    Returns:
+        IncrementalPreprocessor: Eğitilmemiş ön işleyici
+    """
+    return IncrementalPreprocessor(num_cols, cat_cols)
+
+
+def _stored(pre, store):
+    """Depo verilmişse ön işleyiciyi kat bazında önbelleklenen ``StoredPreprocessor`` ile sarar."""
+    return pre if store is None else StoredPreprocessor(pre, store.root)
+
+
+def _warn_precomputed(precomputed):
+    if precomputed:
+        warnings.warn("precomputed=True: ön işleyici tüm eğitim setinde eğitilmiştir; CV/model seçimi "
+                      "skorları doğrulama katlarının istatistiklerini içerir. Model seçimi için "
+                      "store=MatrixStore() kullanın.", UserWarning, stacklevel=3)
+
+
+def _binary_steps(pre, cat_cols, sampler, weighted, precomputed):
+    """Sınıflandırıcıdan önceki (ön işleme, örnekleme) adımları."""
+    if weighted or sampler is None:
+        return [('preprocessor', 'passthrough' if precomputed else pre), ('smote', 'passthrough')]
+    if sampler == 'smote':
+        return [('preprocessor', 'passthrough' if precomputed else pre), ('smote', SMOTE())]
+    if sampler == 'fast':
+        if precomputed:
+            raise ValueError("sampler='fast' kodlanmamış çerçeve ister; precomputed=True ile kullanılamaz")
+        # Örnekleme kodlamadan önce, tipli çerçeve üzerinde
+        return [('smote', FastSMOTENC(categorical_features=cat_cols)), ('preprocessor', pre)]
+    raise ValueError(f"Bilinmeyen sampler: {sampler!r}")
+
+
+def make_binary_pipelines(num_cols, cat_cols, weighted=False, precomputed=False, sampler='smote', store=None):
     """Binary sınıflandırma için pipeline'ları oluşturur.
     
     Args:
         num_cols: Sayısal kolon isimleri
         cat_cols: Kategorik kolon isimleri
+        weighted: Tekilleştirilmiş veri ve ``sample_weight`` ile eğitim için
+            SMOTE adımını kapatır (SMOTE satır sayısını değiştirdiği için
+            ağırlıklar sınıflandırıcıya ulaşamaz; dengeleme ``class_weight``
+            ile yapılır)
+        precomputed: Ön işleme adımını ``'passthrough'`` yapar; girdi olarak
+            ``store.MatrixStore.fit_transform`` ile hazırlanmış matris verilir
+            (``'hgb'`` için ``make_binner`` çıktısı). Ön işleyici katlara göre
+            değil tüm eğitim setine göre eğitildiğinden CV skorları sızıntı
+            içerir; yalnızca son model için kullanın (uyarı verir)
+        sampler: ``'smote'`` (one-hot sonrası ``imblearn.SMOTE``), ``'fast'``
+            (kodlamadan önce ``sampling.FastSMOTENC``) ya da ``None``
+        store: ``store.MatrixStore``; verilirse ön işleme adımı
+            ``StoredPreprocessor`` olur ve her katın matrisi o katın eğitim
+            satırlarıyla hesaplanıp aynı kattaki adaylar arasında paylaşılır
         
     Returns:
         dict: Model isimleri ve (pipeline, param_grid) çiftleri
     """
-    pre = make_preprocessor(num_cols, cat_cols)
+    _warn_precomputed(precomputed)
+
+    # Her pipeline kendi ön işleyicisini alır: biri eğitilince diğerinin adımı değişmez
+    def pre():
+        return _stored(make_preprocessor(num_cols, cat_cols), store)
 
     pipe_lr = IMBPipeline(steps=[
-        ('preprocessor', pre),
-        ('smote', SMOTE()),
+        *_binary_steps(pre(), cat_cols, sampler, weighted, precomputed),
         ('classifier', LogisticRegression(max_iter=1000, n_jobs=None, class_weight='balanced'))
     ])
 
     pipe_rf = IMBPipeline(steps=[
-        ('preprocessor', pre),
-        ('smote', SMOTE()),
+        *_binary_steps(pre(), cat_cols, sampler, weighted, precomputed),
         ('classifier', RandomForestClassifier(class_weight='balanced'))
     ])
 
-    pipe_gb = IMBPipeline(steps=[
-        ('preprocessor', pre),
-        ('classifier', GradientBoostingClassifier())  # SMOTE genelde ağaç dışı modellerle daha anlamlı
+    # Kategorik kolonlar one-hot yerine doğal olarak işlenir; dengeleme class_weight ile
+    pipe_hgb = IMBPipeline(steps=[
+        ('preprocessor', 'passthrough' if precomputed else _stored(make_binner(num_cols, cat_cols), store)),
+        ('smote', 'passthrough'),
+        ('classifier', _make_hgb(num_cols, cat_cols, class_weight='balanced'))
     ])
 
     # Hızlı test için basitleştirilmiş hiperparametre gridleri
@@ -69,33 +244,48 @@ def make_binary_pipelines(num_cols, cat_cols):
         'rf': (pipe_rf, {
             'classifier__n_estimators': [100, 200],
             'classifier__max_depth': [None, 20]
+        }),
+        'hgb': (pipe_hgb, {
+            'classifier__learning_rate': [0.1, 0.3],
+            'classifier__max_leaf_nodes': [31, 63]
         })
     }
     return grids
 
 
-def make_multiclass_pipelines(num_cols, cat_cols):
+def make_multiclass_pipelines(num_cols, cat_cols, precomputed=False, store=None):
     """Multi-class sınıflandırma için pipeline'ları oluşturur.
     
     Args:
         num_cols: Sayısal kolon isimleri
         cat_cols: Kategorik kolon isimleri
+        precomputed: Ön işleme adımını ``'passthrough'`` yapar (bkz.
+            ``make_binary_pipelines``; model seçiminde sızıntı içerir)
+        store: Kat bazında ön işleme önbelleği (bkz. ``make_binary_pipelines``)
         
     Returns:
         dict: Model isimleri ve (pipeline, param_grid) çiftleri
     """
-    pre = make_preprocessor(num_cols, cat_cols)
+    _warn_precomputed(precomputed)
+
+    def pre():
+        return _stored(make_preprocessor(num_cols, cat_cols), store)
 
     pipe_lr = Pipeline(steps=[
-        ('pre', pre),
+        ('pre', 'passthrough' if precomputed else pre()),
         ('clf', LogisticRegression(max_iter=1000, multi_class='ovr'))
     ])
 
     pipe_rf = Pipeline(steps=[
-        ('pre', pre),
+        ('pre', 'passthrough' if precomputed else pre()),
         ('clf', RandomForestClassifier())
     ])
 
+    pipe_hgb = Pipeline(steps=[
+        ('pre', 'passthrough' if precomputed else _stored(make_binner(num_cols, cat_cols), store)),
+        ('clf', _make_hgb(num_cols, cat_cols))
+    ])
+
     grids = {
         'lr': (pipe_lr, {
             'clf__C': [0.5, 1, 2]
@@ -103,6 +293,10 @@ def make_multiclass_pipelines(num_cols, cat_cols):
         'rf': (pipe_rf, {
             'clf__n_estimators': [300, 600],
             'clf__max_depth': [None, 20, 40]
+        }),
+        'hgb': (pipe_hgb, {
+            'clf__learning_rate': [0.1, 0.3],
+            'clf__max_leaf_nodes': [31, 63]
         })
     }
     return grids
\ No newline at end of file
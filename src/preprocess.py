@@ -1,22 +1,47 @@
 # src/preprocess.py
 import numpy as np
 import pandas as pd
+from sklearn import config_context
 from sklearn.base import BaseEstimator, TransformerMixin
-from data import ATTACK_FAMILY
+from sklearn.compose import ColumnTransformer
+from scipy import sparse
+from sklearn.preprocessing import StandardScaler
+from .data import ATTACK_FAMILY, kdd_vocabulary
 
 BINARY_TARGET = 'y_binary'
 MULTI_TARGET  = 'y_family'   # veya 'y_attack' (tek tek saldırı ismi)
+WEIGHT_COL    = 'weight'     # tekilleştirilmiş satırın tekrar sayısı ('count' KDD özelliği)
 
 CATEGORICAL = ['protocol_type','service','flag']
+NORMAL_LABEL = 'normal.'
+FAMILIES = ['normal', 'dos', 'probe', 'r2l', 'u2r']
+ENCODER_BUFFER_ROWS = 4096   # CompiledEncoder iç tamponunun en fazla satır sayısı
+ENCODER_MAX_TABLES = 64      # CompiledEncoder'ın sakladığı en fazla kategori-kodu tablosu
 
 class ConstantDropper(BaseEstimator, TransformerMixin):
-    """Sıfır varyanslı sayısal kolonları otomatik düşürür."""
-    def __init__(self):
+    """Sıfır varyanslı sayısal kolonları otomatik düşürür.
+
+    Profil tüm dosyanın istatistiğidir; yalnızca CV dışında (tüm eğitim
+    setiyle son eğitim) geçerlidir. Bir CV katında profil kullanılsaydı
+    doğrulama satırlarında değişen bir kolon eğitim katında sabit olsa bile
+    tutulurdu. Bu yüzden profil yalnızca satır sayısı ``X`` ile aynıysa
+    kullanılır; aksi halde (ör. CV katı) değerler ``X``'ten sayılır.
+
+    Args:
+        profile: Önceden hesaplanmış ``stats.DatasetProfile``; verilirse ve
+            ``X`` ile aynı satır sayısını tanımlıyorsa farklı değer sayıları
+            veri yeniden taranmadan profilden okunur
+    """
+    def __init__(self, profile=None):
+        self.profile = profile
         self.keep_cols_ = None
         
     def fit(self, X, y=None):
         if isinstance(X, pd.DataFrame):
-            nunique = X.nunique()
+            if self.profile is not None and self.profile.n_rows == len(X):
+                nunique = self.profile.distinct.reindex(X.columns, fill_value=0)
+            else:
+                nunique = X.nunique()
             self.keep_cols_ = nunique[nunique > 1].index.tolist()
         else:
             self.keep_cols_ = list(range(X.shape[1]))
@@ -26,19 +51,458 @@ class ConstantDropper(BaseEstimator, TransformerMixin):
         return X[self.keep_cols_]
 
 
-def add_targets(df: pd.DataFrame) -> pd.DataFrame:
+class IncrementalPreprocessor(BaseEstimator, TransformerMixin):
+    """Parça parça eğitilebilen StandardScaler + OneHotEncoder ön işleyicisi.
+
+    ``models.make_preprocessor`` ile aynı dönüşümü yapar; fark, ``partial_fit``
+    ile veri parçaları üzerinde eğitilebilmesidir. Sayısal kolonlar için
+    ortalama/varyans artımlı tutulur. Kategoriler her ``partial_fit`` sonunda
+    sıralanır; parçaların sırası sonucu değiştirmez. Varsayılan ``'observed'``
+    ile kategoriler ``OneHotEncoder(categories='auto')`` ile aynıdır (görülen
+    değerler, sıralı). Eğitim sırasında yeni kategori görülürse çıktı genişliği
+    değişir; dönüşüme tüm ``partial_fit`` çağrılarından sonra geçin.
+
+    Args:
+        num_cols: Sayısal kolon isimleri
+        cat_cols: Kategorik kolon isimleri
+        categories: ``'observed'`` (yalnızca görülen değerler), ``'kdd'``
+            (``kddcup.names.txt`` sözlüğü + görülen değerler, sıralı) ya da kolon
+            adı -> kategori listesi (verilen sıra korunur, yeni değerler sıralı
+            olarak sona eklenir)
+        sparse_threshold: ``ColumnTransformer`` ile aynı seyreklik eşiği
+    """
+    def __init__(self, num_cols, cat_cols, categories='observed', sparse_threshold=0.3):
+        self.num_cols = num_cols
+        self.cat_cols = cat_cols
+        self.categories = categories
+        self.sparse_threshold = sparse_threshold
+
+    def _reset(self):
+        if self.categories == 'kdd':
+            vocab = kdd_vocabulary()
+            self.categories_ = {c: sorted(vocab.get(c, [])) for c in self.cat_cols}
+        elif self.categories == 'observed':
+            self.categories_ = {c: [] for c in self.cat_cols}
+        else:
+            self.categories_ = {c: list(self.categories[c]) for c in self.cat_cols}
+        self.scaler_ = StandardScaler(with_mean=False)
+        self.n_samples_seen_ = 0
+
+    def partial_fit(self, X, y=None):
+        if not hasattr(self, 'scaler_'):
+            self._reset()
+        if self.num_cols:
+            self.scaler_.partial_fit(X[self.num_cols].to_numpy(dtype=np.float64))
+        for col in self.cat_cols:
+            known = set(self.categories_[col])
+            new = [v for v in pd.unique(X[col].dropna()) if v not in known]
+            if new:
+                # Genel sıralama: sonuç parça sırasından bağımsız (verilen sözlüğün sırası korunur)
+                fixed = [] if isinstance(self.categories, str) else list(self.categories[col])
+                self.categories_[col] = fixed + sorted(self.categories_[col][len(fixed):] + new)
+        self.n_samples_seen_ += len(X)
+        return self
+
+    def fit(self, X, y=None):
+        self._reset()
+        return self.partial_fit(X, y)
+
+    def transform(self, X):
+        n = len(X)
+        Xn = X[self.num_cols].to_numpy(dtype=np.float64) / self.scaler_.scale_ if self.num_cols \
+            else np.empty((n, 0))
+
+        # One-hot: her kategorik kolon için (satır, kolon) indeksleri
+        rows, cols, offset = [], [], 0
+        for col in self.cat_cols:
+            codes = pd.Index(self.categories_[col]).get_indexer(X[col])
+            hit = np.flatnonzero(codes >= 0)   # bilinmeyen kategoriler yok sayılır
+            rows.append(hit)
+            cols.append(codes[hit].astype(np.int64) + offset)
+            offset += len(self.categories_[col])
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+        onehot = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, offset))
+
+        # ColumnTransformer ile aynı kural: yoğunluk eşiğin altındaysa seyrek çıktı
+        total = n * (Xn.shape[1] + offset)
+        density = (Xn.size + onehot.nnz) / total if total else 0
+        if density < self.sparse_threshold:
+            return sparse.hstack([sparse.csr_matrix(Xn), onehot]).tocsr()
+        return np.hstack([Xn, onehot.toarray()])
+
+    def get_feature_names_out(self, input_features=None):
+        names = [f'num__{c}' for c in self.num_cols]
+        for col in self.cat_cols:
+            names.extend(f'cat__{col}_{v}' for v in self.categories_[col])
+        return np.asarray(names, dtype=object)
+
+
+class KDDBinner(BaseEstimator, TransformerMixin):
+    """Özellikleri tek bir ``uint8`` matrisine kutulayan dönüştürücü.
+
+    Sayısal kolonlar en fazla ``max_bins`` kantil kutusuna, kategorik kolonlar
+    kategori kodlarına çevrilir (one-hot yok). Çıktı
+    ``HistGradientBoostingClassifier(categorical_features=binner.categorical_mask_)``
+    ile doğrudan kullanılır; model 255'ten az farklı değerli kolonları yeniden
+    kutulamadığından kutulama maliyeti bir kez ödenir. Eğitilmiş bir binner
+    ``store.MatrixStore`` ile saklanıp katlar arasında paylaşılabilir.
+
+    Args:
+        num_cols: Sayısal kolon isimleri
+        cat_cols: Kategorik kolon isimleri
+        max_bins: Sayısal kolon başına en fazla kutu sayısı (<= 255)
+        subsample: Kutu sınırlarının hesaplandığı en fazla satır
+        categories: ``IncrementalPreprocessor`` ile aynı anlamda
+        random_state: Alt örneklem tohumu
+    """
+    def __init__(self, num_cols, cat_cols, max_bins=255, subsample=200_000, categories='kdd', random_state=0):
+        self.num_cols = num_cols
+        self.cat_cols = cat_cols
+        self.max_bins = max_bins
+        self.subsample = subsample
+        self.categories = categories
+        self.random_state = random_state
+
+    def fit(self, X, y=None):
+        if self.categories == 'kdd':
+            vocab = kdd_vocabulary()
+            self.categories_ = {c: list(vocab.get(c, [])) for c in self.cat_cols}
+        elif self.categories == 'observed':
+            self.categories_ = {c: [] for c in self.cat_cols}
+        else:
+            self.categories_ = {c: list(self.categories[c]) for c in self.cat_cols}
+        for col in self.cat_cols:
+            known = set(self.categories_[col])
+            self.categories_[col].extend(sorted(v for v in pd.unique(X[col].dropna()) if v not in known))
+            # Son kod bilinmeyen kategoriler için ayrılır
+            if len(self.categories_[col]) >= 255:
+                raise ValueError(f"'{col}' kolonunda uint8 kodlamaya sığmayan {len(self.categories_[col])} kategori var")
+
+        rows = np.arange(len(X))
+        if len(X) > self.subsample:
+            rows = np.sort(np.random.default_rng(self.random_state).choice(len(X), self.subsample, replace=False))
+        self.bin_thresholds_ = {}
+        for col in self.num_cols:
+            values = X[col].to_numpy(dtype=np.float64)[rows]
+            distinct = np.unique(values[~np.isnan(values)])
+            if len(distinct) <= self.max_bins:
+                # Az farklı değer: her değer kendi kutusunda (sınırlar ara noktalar)
+                thresholds = (distinct[:-1] + distinct[1:]) / 2
+            else:
+                percentiles = np.linspace(0, 100, self.max_bins + 1)[1:-1]
+                thresholds = np.unique(np.percentile(values, percentiles, method='midpoint'))
+            self.bin_thresholds_[col] = thresholds
+        return self
+
+    @property
+    def categorical_mask_(self) -> np.ndarray:
+        """Çıktı kolonlarından hangilerinin kategorik olduğu (sayısallar önce)."""
+        return np.array([False] * len(self.num_cols) + [True] * len(self.cat_cols))
+
+    def transform(self, X):
+        out = np.empty((len(X), len(self.num_cols) + len(self.cat_cols)), dtype=np.uint8)
+        for j, col in enumerate(self.num_cols):
+            out[:, j] = np.searchsorted(self.bin_thresholds_[col], X[col].to_numpy(dtype=np.float64), side='left')
+        for j, col in enumerate(self.cat_cols, start=len(self.num_cols)):
+            # Görülmeyen ve eksik değerler -1 (Categorical kurucusu bunlar için uyarı verir)
+            codes = pd.Index(self.categories_[col]).get_indexer(X[col])
+            out[:, j] = np.where(codes >= 0, codes, len(self.categories_[col]))
+        return out
+
+    def get_feature_names_out(self, input_features=None):
+        return np.asarray([f'num__{c}' for c in self.num_cols] + [f'cat__{c}' for c in self.cat_cols], dtype=object)
+
+
+class WeightedColumnTransformer(ColumnTransformer):
+    """``sample_weight`` kabul eden ``ColumnTransformer``.
+
+    Ağırlıklar sklearn metadata yönlendirmesiyle yalnızca bu çağrı süresince
+    ``set_fit_request(sample_weight=True)`` istemiş alt adımlara (ör.
+    ``make_preprocessor`` içindeki ``StandardScaler``) iletilir; genel
+    ``enable_metadata_routing`` ayarı değişmez. Ağırlıksız çağrılar
+    ``ColumnTransformer`` ile aynıdır.
+    """
+
+    def fit(self, X, y=None, sample_weight=None):
+        self.fit_transform(X, y, sample_weight=sample_weight)
+        return self
+
+    def fit_transform(self, X, y=None, sample_weight=None):
+        if sample_weight is None:
+            return super().fit_transform(X, y)
+        with config_context(enable_metadata_routing=True):
+            return super().fit_transform(X, y, sample_weight=sample_weight)
+
+
+class CompiledEncoder(BaseEstimator, TransformerMixin):
+    """Eğitilmiş ön işleyicinin düz plana derlenmiş hali (tek kayıt / küçük grup çıkarımı için).
+
+    ``ColumnTransformer`` her çağrıda kolon seçimi, tip kontrolleri,
+    ``OneHotEncoder`` araması ve birleştirme yapar; küçük gruplarda bu ek yük
+    modelden pahalıdır. Derlenmiş plan yalnızca ölçek / ofset vektörleri ve
+    kategori -> çıktı kolonu sözlüklerinden oluşur. Sonuç (``float64``) özgün
+    ön işleyicinin yoğun çıktısıyla bit düzeyinde aynıdır; ``float32``
+    tampon, özgün çıktının ``float32``'ye çevrilmiş haliyle aynıdır (ağaç
+    modelleri girdiyi zaten ``float32``'ye çevirir).
+
+    Her çağrı varsayılan olarak yeni bir dizi döndürür; kodlayıcı iş
+    parçacıkları arasında paylaşılabilir (ör. ``serve`` yürütücüsü,
+    ``PredictionCache`` + skorlama). ``out`` verilirse oraya yazılır.
+    ``reuse=True`` ile ``ENCODER_BUFFER_ROWS`` satıra kadar sonuç iç tamponun
+    bir görünümüdür: ayırma yapılmaz, ancak dizi bir sonraki ``reuse=True``
+    çağrısında üzerine yazılır ve eşzamanlı kullanım güvenli değildir.
+    Kategorik tipli girdiler için kategori listesi başına bir kod tablosu
+    saklanır; ``ENCODER_MAX_TABLES`` sınırında tablolar sıfırlanır.
+
+    Parametreler derlenmiş planın kendisidir; ``fit`` veriye bakmadan
+    kategori -> kolon tablolarını kurar (``clone`` sonrası da aynı plan).
+    Eğitilmiş ön işleyiciden ``compile_preprocessor`` ile kurulur.
+
+    Args:
+        num_cols: Sayısal kolon isimleri
+        cat_cols: Kategorik kolon isimleri
+        offset: Sayısal kolonlardan çıkarılacak değerler (``None``: çıkarma yok)
+        scale: Sayısal kolonların bölüneceği değerler (``None``: bölme yok)
+        categories: Kolon adı -> kategori listesi (one-hot sırası)
+        dtype: Çıktı tipi
+    """
+    def __init__(self, num_cols, cat_cols, offset, scale, categories, dtype=np.float64):
+        self.num_cols = num_cols
+        self.cat_cols = cat_cols
+        self.offset = offset
+        self.scale = scale
+        self.categories = categories
+        self.dtype = dtype
+
+    def fit(self, X=None, y=None):
+        # Kategori -> küresel çıktı kolonu
+        start = len(self.num_cols)
+        self.starts_, self.lookup_ = {}, {}
+        for col in self.cat_cols:
+            self.starts_[col] = start
+            self.lookup_[col] = {v: start + i for i, v in enumerate(self.categories[col])}
+            start += len(self.categories[col])
+        self.n_features_out_ = start
+        self._buffer = np.zeros((0, start), dtype=self.dtype)
+        self._tables = {}
+        return self
+
+    def _out(self, n: int, out, reuse: bool) -> np.ndarray:
+        if out is None:
+            if not reuse or n > ENCODER_BUFFER_ROWS:
+                return np.zeros((n, self.n_features_out_), dtype=self.dtype)
+            if len(self._buffer) < n:
+                rows = min(max(n, 2 * len(self._buffer)), ENCODER_BUFFER_ROWS)
+                self._buffer = np.zeros((rows, self.n_features_out_), dtype=self.dtype)
+            out = self._buffer[:n]
+        out[:, len(self.num_cols):] = 0
+        return out
+
+    def _numeric(self, values: np.ndarray) -> np.ndarray:
+        # StandardScaler.transform ile aynı işlem sırası: önce ofset, sonra ölçek (float64)
+        if self.offset is not None:
+            values -= self.offset
+        if self.scale is not None:
+            values /= self.scale
+        return values
+
+    def transform(self, X, out=None, reuse: bool = False) -> np.ndarray:
+        """Bir DataFrame'i kodlar (``ColumnTransformer.transform`` karşılığı)."""
+        n, k = len(X), len(self.num_cols)
+        out = self._out(n, out, reuse)
+        out[:, :k] = self._numeric(X[self.num_cols].to_numpy(dtype=np.float64, copy=True))
+        rows = np.arange(n)
+        for col in self.cat_cols:
+            index = self._column_index(col, X[col])
+            hit = index >= 0   # bilinmeyen kategoriler yok sayılır (handle_unknown='ignore')
+            out[rows[hit], index[hit]] = 1
+        return out
+
+    def _column_index(self, col: str, values: pd.Series) -> np.ndarray:
+        """Her satırın one-hot çıktı kolonu (bilinmeyen kategori: -1)."""
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Kategori kodu -> çıktı kolonu tablosu, kategori listesi başına bir kez
+            key = (col, values.dtype)
+            table = self._tables.get(key)
+            if table is None:
+                lookup = self.lookup_[col]
+                table = np.array([lookup.get(v, -1) for v in values.cat.categories] + [-1], dtype=np.intp)
+                if len(self._tables) >= ENCODER_MAX_TABLES:
+                    # Tek atama: eşzamanlı okuyucular eski ya da yeni sözlüğü görür
+                    self._tables = {}
+                self._tables[key] = table
+            return table[values.cat.codes.to_numpy()]
+        codes = pd.Index(self.categories[col]).get_indexer(values)
+        return np.where(codes >= 0, codes + self.starts_[col], -1)
+
+    def encode_records(self, records: list[dict], out=None, reuse: bool = False) -> np.ndarray:
+        """Sözlük kayıtlarını DataFrame kurmadan kodlar.
+
+        Args:
+            records: Özellik adı -> değer sözlükleri
+            out: Yazılacak (len(records), n_features_out_) dizi (opsiyonel)
+            reuse: İç tampona yaz (sonraki ``reuse=True`` çağrısı üzerine yazar)
+
+        Returns:
+            numpy.ndarray: Kodlanmış satırlar
+        """
+        out = self._out(len(records), out, reuse)
+        numeric = np.array([[r[c] for c in self.num_cols] for r in records], dtype=np.float64)
+        out[:, :len(self.num_cols)] = self._numeric(numeric.reshape(len(records), len(self.num_cols)))
+        for i, record in enumerate(records):
+            row = out[i]
+            for col in self.cat_cols:
+                j = self.lookup_[col].get(record[col])
+                if j is not None:
+                    row[j] = 1
+        return out
+
+    def encode_record(self, record: dict, out=None, reuse: bool = False) -> np.ndarray:
+        """Tek kaydı (1, n_features_out_) satır olarak kodlar."""
+        return self.encode_records([record], out, reuse)
+
+    def get_feature_names_out(self, input_features=None):
+        names = [f'num__{c}' for c in self.num_cols]
+        for col in self.cat_cols:
+            names.extend(f'cat__{col}_{v}' for v in self.categories[col])
+        return np.asarray(names, dtype=object)
+
+
+def _unwrap(step):
+    """Tek adımlı Pipeline'ın içindeki tahminciyi döndürür."""
+    if hasattr(step, 'steps'):
+        if len(step.steps) != 1:
+            raise ValueError(f"Derlenemeyen çok adımlı pipeline: {step}")
+        return step.steps[0][1]
+    return step
+
+
+def compile_preprocessor(pre, dtype=np.float64) -> CompiledEncoder:
+    """Eğitilmiş ön işleyiciyi ``CompiledEncoder``'a derler.
+
+    Desteklenenler: ``models.make_preprocessor`` çıktısı (``StandardScaler`` +
+    ``OneHotEncoder`` içeren ``ColumnTransformer``) ve ``IncrementalPreprocessor``.
+
+    Args:
+        pre: Eğitilmiş ön işleyici
+        dtype: Çıktı tipi (``np.float64`` ya da ``np.float32``)
+
+    Returns:
+        CompiledEncoder: Derlenmiş (``fit`` edilmiş) kodlayıcı
+    """
+    if isinstance(pre, IncrementalPreprocessor):
+        return CompiledEncoder(list(pre.num_cols), list(pre.cat_cols), None, pre.scaler_.scale_,
+                               {c: list(pre.categories_[c]) for c in pre.cat_cols}, dtype=dtype).fit()
+
+    from sklearn.compose import ColumnTransformer
+    from sklearn.preprocessing import OneHotEncoder
+
+    if not isinstance(pre, ColumnTransformer):
+        raise ValueError(f"Derlenemeyen ön işleyici: {type(pre).__name__}")
+    num_cols, cat_cols, offset, scale, categories = [], [], None, None, {}
+    for name, step, cols in pre.transformers_:
+        if step == 'drop' or len(cols) == 0:
+            continue
+        if step == 'passthrough':
+            raise ValueError(f"Derlenemeyen adım: {name!r} (passthrough)")
+        inner = _unwrap(step)
+        if isinstance(inner, StandardScaler):
+            if num_cols or cat_cols:
+                raise ValueError("Tek bir sayısal adım derlenebilir ve kategorik adımlardan önce gelmeli")
+            num_cols = list(cols)
+            offset, scale = inner.mean_ if inner.with_mean else None, inner.scale_
+        elif isinstance(inner, OneHotEncoder):
+            if inner.drop_idx_ is not None or getattr(inner, '_infrequent_enabled', False):
+                raise ValueError("drop / infrequent kategorili OneHotEncoder derlenemez")
+            for col, cats in zip(cols, inner.categories_):
+                if pd.isna(cats).any():
+                    raise ValueError(f"'{col}' kolonunda NaN kategorisi derlenemez")
+                cat_cols.append(col)
+                categories[col] = list(cats)
+        else:
+            raise ValueError(f"Derlenemeyen adım: {inner!r}")
+    return CompiledEncoder(num_cols, cat_cols, offset, scale, categories, dtype=dtype).fit()
+
+
+def _family_table(categories) -> np.ndarray:
+    """``label`` kategori kodu -> ``FAMILIES`` kodu tablosu.
+
+    Normal için 0, ailesi bilinmeyen etiketler için -1 döner; son eleman -1
+    olduğundan eksik etiket kodu (-1) da -1'e eşlenir.
+    """
+    table = [FAMILIES.index(ATTACK_FAMILY[c]) if c in ATTACK_FAMILY else (0 if c == NORMAL_LABEL else -1)
+             for c in categories]
+    return np.array(table + [-1], dtype=np.int8)
+
+
+def add_targets(df: pd.DataFrame, inplace: bool = False, fill_normal: bool = False) -> pd.DataFrame:
     """Binary ve multi-class hedef değişkenlerini ekler.
+
+    Hedefler ``label`` kolonunun kategorik kodlarından türetilir: kategori
+    başına küçük bir kod -> aile tablosu bir kez hesaplanır ve tüm satırlar
+    tek bir ``take`` ile eşlenir. Veri kopyalanmaz; ``inplace=False`` iken
+    yalnızca yüzeysel bir kopya döner.
     
     Args:
         df: Ham KDD veri seti
+        inplace: Kolonlar doğrudan ``df`` üzerine eklensin mi
+        fill_normal: Normal satırların ``y_family`` değeri ``'normal'`` olsun mu
+            (varsayılan: NaN)
         
     Returns:
         pandas.DataFrame: Hedef değişkenleri eklenmiş veri seti
     """
-    out = df.copy()
-    out[BINARY_TARGET] = (out['label'] != 'normal.').astype(int)
-    out['attack_name'] = out['label'].where(out['label']!='normal.', other=np.nan)
-    out[MULTI_TARGET]  = out['attack_name'].map(ATTACK_FAMILY)
+    out = df if inplace else df.copy(deep=False)
+    label = out['label']
+    if not isinstance(label.dtype, pd.CategoricalDtype):
+        label = label.astype('category')
+    codes = label.cat.codes.to_numpy()
+    categories = label.cat.categories
+    normal_code = categories.get_loc(NORMAL_LABEL) if NORMAL_LABEL in categories else -2
+
+    is_normal = codes == normal_code
+    family = _family_table(categories).take(codes)
+    if not fill_normal:
+        family[is_normal] = -1
+
+    out[BINARY_TARGET] = (~is_normal).view(np.uint8)
+    out['attack_name'] = pd.Categorical.from_codes(np.where(is_normal, -1, codes), categories=categories,
+                                                   validate=False)
+    out[MULTI_TARGET] = pd.Categorical.from_codes(family, categories=FAMILIES, validate=False)
+    return out
+
+
+def deduplicate(df: pd.DataFrame, weight_col: str = WEIGHT_COL) -> pd.DataFrame:
+    """Birebir aynı satırları tek satıra indirip tekrar sayısını ağırlık olarak ekler.
+
+    Satırlar 64-bit satır özetleriyle (``hash_pandas_object``) gruplanır; her
+    grubun ilk satırı ilk görüldüğü sırayla korunur. Girdide ``weight_col``
+    zaten varsa ağırlıklar toplanır, böylece parça parça tekilleştirilmiş
+    veriler yeniden birleştirilebilir. Ağırlıklar pipeline'a
+    ``models.sample_weight_params(pipe, w, y)`` ile verilmelidir: ölçekleyici
+    ve ``class_weight='balanced'`` de ağırlıklı sayımları kullanır (yalnızca
+    sınıflandırıcıya verilen ağırlık tüm veriyle eğitime denk değildir).
+
+    Args:
+        df: Veri seti
+        weight_col: Ağırlık kolonunun adı
+
+    Returns:
+        pandas.DataFrame: Tekil satırlar ve ``weight_col`` ağırlık kolonu
+    """
+    if weight_col in df:
+        weights = df[weight_col].to_numpy()
+        df = df.drop(columns=weight_col)
+    else:
+        weights = None
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    _, first, inverse = np.unique(hashes, return_index=True, return_inverse=True)
+    counts = np.bincount(inverse, weights=weights)
+
+    order = np.argsort(first)
+    out = df.iloc[first[order]].copy()
+    out[weight_col] = counts[order].astype(np.uint32 if weights is None else weights.dtype)
     return out
 
 
@@ -51,7 +515,7 @@ def split_features(df: pd.DataFrame):
     Returns:
         tuple: X, y_bin, y_family, num_cols, cat_cols
     """
-    X = df.drop(columns=['label','attack_name',BINARY_TARGET,MULTI_TARGET], errors='ignore')
+    X = df.drop(columns=['label','attack_name',BINARY_TARGET,MULTI_TARGET,WEIGHT_COL], errors='ignore')
     y_bin = df[BINARY_TARGET] if BINARY_TARGET in df else None
     y_family = df[MULTI_TARGET] if MULTI_TARGET in df else None
     num_cols = [c for c in X.columns if c not in CATEGORICAL]
@@ -0,0 +1,145 @@
+# src/sampling.py
+"""Ham (kodlanmamış) KDD çerçevesi üzerinde çalışan hızlı SMOTE-NC.
+
+``imblearn.SMOTE`` pipeline'da one-hot kodlamadan sonra çalışır: yüz binlerce
+seyrek satırda tam k-NN araması yapar ve yoğunlaştırılmış matrisi bellekte
+çoğaltır. ``FastSMOTENC`` kodlamadan önce, tipli çerçeve üzerinde çalışır:
+
+* komşu araması yalnızca ilgili azınlık sınıfının satırlarında yapılır ve
+  referans kümesi ``max_reference`` satırla sınırlanır;
+* sayısal kolonlar enterpolasyonla, kategorik kolonlar SMOTE-NC'deki gibi
+  komşular arasında çoğunluk oyuyla üretilir;
+* ``max_ratio`` bir sınıfın en fazla kaç katına çıkarılacağını sınırlar.
+
+Üretilen satırlar girdi şemasını (dar tamsayı tipleri, kategorik kolonlar)
+korur; böylece ardından gelen ön işleyici değişmeden kullanılır.
+"""
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator
+from sklearn.neighbors import NearestNeighbors
+
+
+def _majority_vote(codes: np.ndarray) -> np.ndarray:
+    """(n, k) kod matrisinde her satırın en sık değeri (eşitlikte ilk görülen)."""
+    counts = np.stack([(codes == codes[:, [m]]).sum(axis=1) for m in range(codes.shape[1])], axis=1)
+    return codes[np.arange(len(codes)), counts.argmax(axis=1)]
+
+
+class FastSMOTENC(BaseEstimator):
+    """Azınlık sınıfı içinde komşu arayan, kategorik kolonları doğal işleyen SMOTE-NC.
+
+    Args:
+        categorical_features: Kategorik kolon isimleri; ``None`` ise sayısal
+            olmayan tüm kolonlar
+        k_neighbors: Sentetik satır üretiminde kullanılan komşu sayısı
+        sampling_strategy: ``'auto'`` (her sınıf çoğunluk sınıfının boyutuna)
+            ya da ikili problemde azınlık/çoğunluk hedef oranı (float)
+        max_ratio: Bir sınıfın ulaşabileceği en büyük boyut, özgün boyutunun
+            katı olarak (``None``: sınırsız)
+        max_reference: Sınıf başına komşu indeksine giren en fazla satır
+        random_state: Rastgelelik tohumu
+    """
+
+    def __init__(self, categorical_features=None, k_neighbors=5, sampling_strategy='auto', max_ratio=None,
+                 max_reference=20_000, random_state=None):
+        self.categorical_features = categorical_features
+        self.k_neighbors = k_neighbors
+        self.sampling_strategy = sampling_strategy
+        self.max_ratio = max_ratio
+        self.max_reference = max_reference
+        self.random_state = random_state
+
+    def _targets(self, counts: pd.Series) -> dict:
+        """Sınıf -> üretilecek sentetik satır sayısı."""
+        majority = counts.idxmax()
+        if self.sampling_strategy == 'auto':
+            wanted = {c: counts[majority] for c in counts.index if c != majority}
+        else:
+            if len(counts) != 2:
+                raise ValueError("float sampling_strategy yalnızca ikili problemlerde kullanılabilir")
+            minority = counts.idxmin()
+            wanted = {minority: int(self.sampling_strategy * counts[majority])}
+        out = {}
+        for cls, target in wanted.items():
+            if self.max_ratio is not None:
+                target = min(target, int(self.max_ratio * counts[cls]))
+            out[cls] = max(target - counts[cls], 0)
+        return out
+
+    def fit_resample(self, X: pd.DataFrame, y):
+        """Azınlık sınıflarına sentetik satırlar ekler.
+
+        Args:
+            X: Kodlanmamış özellik çerçevesi (ör. ``split_features`` çıktısı)
+            y: Hedef
+
+        Returns:
+            tuple: (X_yeniden_örneklenmiş, y_yeniden_örneklenmiş); ikisinin de
+            indeksi ``RangeIndex``, özgün satırlar başta ve girdi sırasıyla
+        """
+        rng = np.random.default_rng(self.random_state)
+        y = y.reset_index(drop=True) if isinstance(y, pd.Series) else pd.Series(y)
+        cat_cols = list(self.categorical_features) if self.categorical_features is not None else \
+            [c for c in X.columns if not pd.api.types.is_numeric_dtype(X[c].dtype)]
+        num_cols = [c for c in X.columns if c not in cat_cols]
+
+        # Komşuluk ölçeği: pipeline'daki StandardScaler ile aynı (tüm veri std'si)
+        scale = X[num_cols].std(ddof=0).to_numpy(dtype=np.float64, copy=True)
+        scale[~(scale > 0)] = 1.0
+        codes = {c: pd.Categorical(X[c]).codes if not isinstance(X[c].dtype, pd.CategoricalDtype)
+                 else X[c].cat.codes.to_numpy() for c in cat_cols}
+
+        new_parts, new_labels = [], []
+        for cls, n_new in self._targets(y.value_counts()).items():
+            idx = np.flatnonzero((y == cls).to_numpy())
+            if n_new == 0 or len(idx) < 2:
+                continue
+            if len(idx) > self.max_reference:
+                idx = np.sort(rng.choice(idx, size=self.max_reference, replace=False))
+            k = min(self.k_neighbors, len(idx) - 1)
+            # Yalnızca referans satırları float64'e çevrilir
+            numeric = X[num_cols].iloc[idx].to_numpy(dtype=np.float64)
+            ref = numeric / scale
+            # SMOTE-NC: kategorik uyuşmazlık cezası = azınlık sayısal std'lerinin medyanı
+            penalty = np.median(ref.std(axis=0)) if ref.shape[1] else 1.0
+            blocks = [ref]
+            for c in cat_cols:
+                # Yalnızca bu sınıfta görülen kategoriler; uyuşmazlık karesel mesafeye penalty**2 ekler.
+                # Eksik değer (kod -1) kendi seviyesidir: yerel kodlar 0'dan başlar, -1 son satıra düşmez
+                local = np.unique(codes[c][idx], return_inverse=True)[1]
+                blocks.append(np.eye(local.max() + 1)[local] * (penalty / np.sqrt(2)))
+            space = np.hstack(blocks).astype(np.float32)
+            index = NearestNeighbors(n_neighbors=k + 1).fit(space)
+            neighbours = index.kneighbors(space, return_distance=False)[:, 1:]   # ilk komşu satırın kendisi
+
+            base = rng.integers(len(idx), size=n_new)
+            nb = neighbours[base, rng.integers(k, size=n_new)]
+            gap = rng.random(n_new)[:, None]
+            values = numeric[base] + gap * (numeric[nb] - numeric[base])
+
+            part = {}
+            for j, c in enumerate(num_cols):
+                dtype = X[c].dtype
+                col = values[:, j]
+                if np.issubdtype(dtype, np.integer):
+                    info = np.iinfo(dtype)
+                    col = np.clip(np.rint(col), info.min, info.max)
+                part[c] = col.astype(dtype)
+            for c in cat_cols:
+                # Oy -1 çıkarsa (komşuların çoğu eksik) üretilen değer de eksiktir
+                voted = _majority_vote(codes[c][idx][neighbours[base]])
+                categories = X[c].cat.categories if isinstance(X[c].dtype, pd.CategoricalDtype) \
+                    else pd.Categorical(X[c]).categories
+                part[c] = pd.Categorical.from_codes(voted, categories=categories)
+                if not isinstance(X[c].dtype, pd.CategoricalDtype):
+                    part[c] = pd.Series(part[c]).astype(X[c].dtype).to_numpy()
+            new_parts.append(pd.DataFrame(part, columns=X.columns))
+            new_labels.append(pd.Series([cls] * n_new, name=y.name, dtype=y.dtype))
+
+        if not new_parts:
+            # Üretim yapılan yolla aynı: iki çıktının da indeksi 0..n-1
+            return X.reset_index(drop=True), y
+        X_res = pd.concat([X.reset_index(drop=True), *new_parts], ignore_index=True)
+        y_res = pd.concat([y, *new_labels], ignore_index=True)
+        return X_res, y_res
@@ -0,0 +1,199 @@
+# src/score.py
+"""Komut satırından toplu skorlama.
+
+Kullanım:
+    python -m src.score --model runs/binary/tasks/rf-refit --input data/corrected.gz --output preds.parquet
+    python -m src.score --model bin.joblib --family-model fam.joblib --input kayitlar.gz --output preds.csv
+
+Girdi ``load_kdd_iter`` ile parça parça okunur; parçalar modelleri bir kez
+yüklemiş bir süreç havuzuna dağıtılır ve sonuçlar girdi sırasıyla parquet
+(pyarrow) ya da csv dosyasına eklenir. Aynı anda bellekte en fazla
+``2 x workers`` parça bulunduğundan tepe bellek girdi boyutundan bağımsızdır.
+"""
+import argparse
+import os
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from .cache import PredictionCache
+from .data import load_kdd_iter
+from .persist import ENGINES, load_pipeline
+from .preprocess import split_features
+from .store import unwrap_stored
+
+SCORE_CHUNKSIZE = 50_000
+_WORKER = {}   # süreç başına yüklenmiş modeller (bkz. _init_worker)
+
+
+def load_model(path: str | Path, engine: str = 'sklearn'):
+    """``persist.save_pipeline`` klasörünü ya da ``joblib`` dosyasını yükler.
+
+    Args:
+        path: Model klasörü ya da ``.joblib`` dosyası
+        engine: Klasörler için ``persist.load_pipeline`` motoru (``joblib``
+            dosyalarında kullanılmaz)
+    """
+    path = Path(path)
+    if (path / 'meta.json').exists():
+        return load_pipeline(path, engine=engine)
+    # joblib ile kaydedilmiş arama sonucu: çıkarımda matris deposu kullanılmaz
+    return unwrap_stored(joblib.load(path))
+
+
+def score_frame(model, X: pd.DataFrame, family_model=None) -> pd.DataFrame:
+    """Bir veri parçasının tahminlerini, sınıf olasılıklarını ve aile etiketlerini döndürür.
+
+    Args:
+        model: Eğitilmiş pipeline
+        X: Özellikler (``split_features`` çıktısı)
+        family_model: Saldırı ailesi pipeline'ı (opsiyonel)
+
+    Returns:
+        pandas.DataFrame: ``prediction``, ``proba_<sınıf>`` ve varsa ``family``,
+        ``family_proba`` kolonları (index girdiyle aynı)
+    """
+    proba = model.predict_proba(X)
+    classes = model.classes_
+    out = {'prediction': classes.take(proba.argmax(axis=1))}
+    for j, cls in enumerate(classes):
+        out[f'proba_{cls}'] = proba[:, j].astype(np.float32)
+    if family_model is not None:
+        fam = family_model.predict_proba(X)
+        out['family'] = family_model.classes_.take(fam.argmax(axis=1))
+        out['family_proba'] = fam.max(axis=1).astype(np.float32)
+    return pd.DataFrame(out, index=X.index)
+
+
+def _init_worker(model_path: str, family_path: str | None, cache_size: int = 0, engine: str = 'sklearn'):
+    model = load_model(model_path, engine=engine)
+    family = load_model(family_path, engine=engine) if family_path else None
+    if cache_size:
+        # Süreç başına önbellek: parçalar arasında tekrarlanan kayıtlar modele gitmez
+        model = PredictionCache(model, maxsize=cache_size)
+        family = PredictionCache(family, maxsize=cache_size) if family is not None else None
+    _WORKER['model'], _WORKER['family'] = model, family
+
+
+def _score_chunk(chunk: pd.DataFrame):
+    t0 = time.perf_counter()
+    X = split_features(chunk)[0]
+    model = _WORKER['model']
+    hits = getattr(model, 'n_hits_', 0)
+    result = score_frame(model, X, _WORKER['family'])
+    return result, os.getpid(), time.perf_counter() - t0, getattr(model, 'n_hits_', 0) - hits
+
+
+class _Writer:
+    """Sonuç parçalarını sırayla parquet ya da csv dosyasına ekler."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.parquet = path.suffix == '.parquet'
+        self._writer = None
+        self._first = True
+
+    def write(self, frame: pd.DataFrame):
+        frame = frame.rename_axis('row').reset_index()
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode='w' if self._first else 'a', header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def score_file(model_path, input_path, output_path, family_path=None, workers: int | None = None,
+               chunksize: int = SCORE_CHUNKSIZE, cache_size: int = 0, engine: str = 'sklearn') -> pd.DataFrame:
+    """Bir KDD dosyasını sabit bellekle skorlar.
+
+    Args:
+        model_path: Model (``persist`` klasörü ya da ``joblib`` dosyası)
+        input_path: Girdi dosyası (``.gz`` ise gzip olarak okunur)
+        output_path: Çıktı dosyası (``.parquet`` ya da ``.csv``)
+        family_path: Saldırı ailesi modeli (opsiyonel)
+        workers: Süreç sayısı (varsayılan: CPU sayısı)
+        chunksize: Parça başına satır sayısı
+        cache_size: Süreç başına tahmin önbelleği boyutu (0: kapalı,
+            bkz. ``cache.PredictionCache``)
+        engine: ``persist`` klasörlerinin yükleme motoru; toplu skorlamada
+            tahmin hızı baskın olduğundan ``'sklearn'`` (bkz. ``persist``)
+
+    Returns:
+        pandas.DataFrame: Süreç başına satır sayısı, süre, satır/s ve
+        önbellek isabet oranı
+    """
+    input_path, output_path = Path(input_path), Path(output_path)
+    workers = workers or os.cpu_count() or 1
+    stats = defaultdict(lambda: {'rows': 0, 'seconds': 0.0, 'hits': 0})
+    writer = _Writer(output_path)
+    chunks = load_kdd_iter(input_path, chunksize=chunksize, gz=input_path.suffix == '.gz', targets=False)
+
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(str(model_path), str(family_path) if family_path else None,
+                                       cache_size, engine)) as pool:
+        pending = deque()
+
+        def drain(limit):
+            # En eski parça bitene kadar bekle: çıktı girdi sırasında kalır
+            while len(pending) > limit:
+                result, pid, seconds, hits = pending.popleft().result()
+                writer.write(result)
+                stats[pid]['rows'] += len(result)
+                stats[pid]['seconds'] += seconds
+                stats[pid]['hits'] += hits
+
+        try:
+            for chunk in chunks:
+                pending.append(pool.submit(_score_chunk, chunk))
+                drain(2 * workers)
+            drain(0)
+        finally:
+            writer.close()
+    elapsed = time.perf_counter() - t0
+
+    report = pd.DataFrame.from_dict(stats, orient='index').rename_axis('pid')
+    report['rows_per_s'] = report['rows'] / report['seconds']
+    report['hit_rate'] = report.pop('hits') / report['rows']
+    total = report['rows'].sum()
+    print(f'{total:,} satır {elapsed:.1f}s içinde skorlandı ({total / elapsed:,.0f} satır/s) -> {output_path}')
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m src.score', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', required=True, help='Model klasörü (persist) ya da .joblib dosyası')
+    parser.add_argument('--family-model', default=None, help='Saldırı ailesi modeli (opsiyonel)')
+    parser.add_argument('--input', required=True, help='KDD biçiminde girdi dosyası')
+    parser.add_argument('--output', required=True, help='.parquet ya da .csv çıktı dosyası')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunksize', type=int, default=SCORE_CHUNKSIZE)
+    parser.add_argument('--cache-size', type=int, default=0, help='Süreç başına tahmin önbelleği (0: kapalı)')
+    parser.add_argument('--engine', choices=ENGINES, default='sklearn',
+                        help='persist klasörleri için yükleme motoru (bkz. src.persist)')
+    args = parser.parse_args(argv)
+
+    report = score_file(args.model, args.input, args.output, family_path=args.family_model,
+                        workers=args.workers, chunksize=args.chunksize, cache_size=args.cache_size,
+                        engine=args.engine)
+    print(report.to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,366 @@
+# src/search.py
+"""Katlara göre önbellekli hiperparametre araması.
+
+``make_binary_pipelines`` / ``make_multiclass_pipelines`` gridlerinde yalnızca
+son adımın (sınıflandırıcının) parametreleri değişir. ``GridSearchCV`` her
+(kat x aday) için ön işleyiciyi ve SMOTE'u yeniden eğitir; buradaki sürücü bu
+adımları her kat için bir kez eğitip dönüştürülmüş veriyi tüm adaylarda
+yeniden kullanır ve aşama bazında süreleri raporlar.
+"""
+import time
+import warnings
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import BaseEstimator, clone
+from sklearn.metrics import check_scoring
+from sklearn.model_selection import ParameterGrid, check_cv
+from sklearn.utils import _safe_indexing
+
+
+def _split_params(params: dict, final_name: str):
+    """Aday parametrelerini (ön adımlar, son adım) olarak ayırır."""
+    prefix = f'{final_name}__'
+    head = {k: v for k, v in params.items() if not k.startswith(prefix)}
+    tail = {k[len(prefix):]: v for k, v in params.items() if k.startswith(prefix)}
+    return head, tail
+
+
+def _route_fit_params(fit_params: dict, pipe):
+    """``<adım>__<param>`` biçimindeki fit parametrelerini adımlara dağıtır."""
+    routed = {name: {} for name, _ in pipe.steps}
+    for key, value in fit_params.items():
+        step, param = key.split('__', 1)
+        routed[step][param] = value
+    return routed
+
+
+def fit_transform_steps(pipe, X_train, y_train, X_test, fit_params=None, timings=None):
+    """Pipeline'ın son adım dışındaki adımlarını eğitim katında eğitip uygular.
+
+    Örnekleyiciler (``fit_resample``) yalnızca eğitim verisine uygulanır.
+    Satır sayısını değiştirmeyen adımlarda son adımın ``sample_weight``'i korunur.
+
+    Args:
+        pipe: Pipeline (ön adımların parametreleri ayarlanmış)
+        X_train, y_train: Eğitim katı
+        X_test: Doğrulama katı
+        fit_params: ``<adım>__<param>`` biçiminde fit parametreleri (eğitim katına göre dilimlenmiş)
+        timings: Aşama süreleri (saniye) eklenecek sözlük
+
+    Returns:
+        tuple: (Xt_train, yt_train, Xt_test, son adımın fit parametreleri)
+    """
+    timings = timings if timings is not None else defaultdict(float)
+    routed = _route_fit_params(fit_params or {}, pipe)
+    Xt, yt, Xv = X_train, y_train, X_test
+    for name, step in pipe.steps[:-1]:
+        if step is None or step == 'passthrough':
+            continue
+        t0 = time.perf_counter()
+        if hasattr(step, 'fit_resample'):
+            n_before = len(yt)
+            Xt, yt = step.fit_resample(Xt, yt)
+            if len(yt) != n_before and routed[pipe.steps[-1][0]]:
+                raise ValueError(f"'{name}' örnekleyicisi satır sayısını değiştiriyor; "
+                                 "son adımın fit parametreleri dilimlenemez")
+        else:
+            Xt = step.fit_transform(Xt, yt, **routed[name])
+            Xv = step.transform(Xv)
+        timings[name] += time.perf_counter() - t0
+    return Xt, yt, Xv, routed[pipe.steps[-1][0]]
+
+
+def _warm_start_chains(clf, members, enabled=True):
+    """Adayları ``n_estimators`` dışında aynı olanlar zincirler oluşturacak şekilde gruplar.
+
+    ``warm_start`` destekleyen topluluklarda (ör. ``RandomForestClassifier``)
+    bir zincirdeki adaylar tek bir modelin ağaç sayısı artırılarak sırayla
+    elde edilir; tamsayı ``random_state`` ile sonuç sıfırdan eğitimle aynıdır.
+
+    Returns:
+        list: ``[(ortak parametreler, [(aday indeksi, n_estimators), ...]), ...]``;
+        zincirlenemeyen adaylar için n_estimators ``None``
+    """
+    params = clf.get_params()
+    if not enabled or 'warm_start' not in params or 'n_estimators' not in params:
+        return [(tail, [(idx, None)]) for idx, tail in members]
+    chains = {}
+    for idx, tail in members:
+        rest = {k: v for k, v in tail.items() if k != 'n_estimators'}
+        n = tail.get('n_estimators', params['n_estimators'])
+        chains.setdefault(repr(sorted(rest.items())), (rest, []))[1].append((idx, n))
+    return [(rest, sorted(links, key=lambda link: link[1])) for rest, links in chains.values()]
+
+
+def _run_fold(estimator, groups, X, y, train, test, fit_params, scorer, warm_start=True):
+    """Bir katı çalıştırır: ön adımlar grup başına bir kez, sınıflandırıcı aday başına.
+
+    ``warm_start`` açıkken yalnızca ``n_estimators`` değeri farklı olan adaylar
+    için tek bir orman büyütülür ve her ara boyutta skorlanır.
+    """
+    timings = defaultdict(float)
+    scores = {}
+    X_train, X_test = _safe_indexing(X, train), _safe_indexing(X, test)
+    y_train, y_test = _safe_indexing(y, train), _safe_indexing(y, test)
+    fold_params = {k: _safe_indexing(v, train) if hasattr(v, '__len__') and len(v) == len(y) else v
+                   for k, v in fit_params.items()}
+    final_name = estimator.steps[-1][0]
+    for head, members in groups:
+        pipe = clone(estimator).set_params(**head)
+        Xt, yt, Xv, final_params = fit_transform_steps(pipe, X_train, y_train, X_test, fold_params, timings)
+        for rest, links in _warm_start_chains(pipe.steps[-1][1], members, warm_start):
+            clf = clone(pipe.steps[-1][1]).set_params(**rest)
+            if links[0][1] is not None:
+                clf.set_params(warm_start=True)
+            for idx, n_estimators in links:
+                if n_estimators is not None:
+                    clf.set_params(n_estimators=n_estimators)
+                t0 = time.perf_counter()
+                with warnings.catch_warnings():
+                    # Aynı veride büyütüldüğü için class_weight='balanced' uyarısı geçersiz
+                    warnings.filterwarnings('ignore', message='.*warm_start.*', category=UserWarning)
+                    warnings.filterwarnings('ignore', message='Warm-start fitting without increasing',
+                                            category=UserWarning)
+                    clf.fit(Xt, yt, **final_params)
+                timings[f'{final_name} (fit)'] += time.perf_counter() - t0
+                t0 = time.perf_counter()
+                scores[idx] = scorer(clf, Xv, y_test)
+                timings[f'{final_name} (score)'] += time.perf_counter() - t0
+    return scores, dict(timings)
+
+
+class FoldCachedSearchCV(BaseEstimator):
+    """Ön işleme/örnekleme adımlarını kat başına bir kez eğiten grid araması.
+
+    ``GridSearchCV`` ile aynı ``(pipeline, param_grid)`` girdisini alır ve
+    ``best_params_``, ``best_score_``, ``best_estimator_``, ``cv_results_``
+    özniteliklerini üretir. Son adım dışındaki parametreleri aynı olan
+    adaylar bir grup oluşturur; her (kat, grup) için ön adımlar bir kez
+    eğitilir. ``timings_`` aşama bazında toplam süreleri tutar.
+
+    Args:
+        estimator: Pipeline
+        param_grid: Parametre gridi
+        scoring: Skorlama (``GridSearchCV`` ile aynı anlamda)
+        cv: Kat sayısı ya da CV ayırıcısı
+        refit: En iyi adayla tüm veride yeniden eğitilsin mi
+        n_jobs: Katları paralel çalıştıracak iş sayısı
+        verbose: 1 ise aşama sürelerini yazdırır
+        warm_start: Yalnızca ``n_estimators`` değeri farklı adaylar için ormanı
+            kat başına bir kez büyütüp her ara boyutta skorla
+    """
+
+    def __init__(self, estimator, param_grid, scoring=None, cv=5, refit=True, n_jobs=None, verbose=0,
+                 warm_start=True):
+        self.estimator = estimator
+        self.param_grid = param_grid
+        self.scoring = scoring
+        self.cv = cv
+        self.refit = refit
+        self.n_jobs = n_jobs
+        self.verbose = verbose
+        self.warm_start = warm_start
+
+    def _candidate_groups(self, candidates):
+        final_name = self.estimator.steps[-1][0]
+        groups = {}
+        for idx, params in enumerate(candidates):
+            head, tail = _split_params(params, final_name)
+            key = repr(sorted(head.items()))
+            groups.setdefault(key, (head, []))[1].append((idx, tail))
+        return list(groups.values())
+
+    def _evaluate(self, candidates, X, y, fit_params, splits):
+        """Adayları katlarda değerlendirir; (n_aday, n_kat) skor matrisi döndürür."""
+        scorer = check_scoring(self.estimator, self.scoring)
+        groups = self._candidate_groups(candidates)
+        results = Parallel(n_jobs=self.n_jobs)(
+            delayed(_run_fold)(self.estimator, groups, X, y, train, test, fit_params, scorer, self.warm_start)
+            for train, test in splits)
+        scores = np.empty((len(candidates), len(splits)))
+        for fold, (fold_scores, fold_timings) in enumerate(results):
+            for idx, score in fold_scores.items():
+                scores[idx, fold] = score
+            for stage, seconds in fold_timings.items():
+                self.timings_[stage] += seconds
+        return scores
+
+    def _finish(self, X, y, fit_params, candidates, scores):
+        self.cv_results_ = {
+            'params': candidates,
+            'mean_test_score': scores.mean(axis=1),
+            'std_test_score': scores.std(axis=1),
+            'rank_test_score': pd.Series(-scores.mean(axis=1)).rank(method='min').astype(int).to_numpy(),
+        }
+        for fold in range(scores.shape[1]):
+            self.cv_results_[f'split{fold}_test_score'] = scores[:, fold]
+        self.best_index_ = int(np.argmax(self.cv_results_['mean_test_score']))
+        self.best_params_ = candidates[self.best_index_]
+        self.best_score_ = float(self.cv_results_['mean_test_score'][self.best_index_])
+        if self.refit:
+            t0 = time.perf_counter()
+            self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_).fit(X, y, **fit_params)
+            self.timings_['refit'] += time.perf_counter() - t0
+        if self.verbose:
+            print(self.timing_report().to_string())
+        return self
+
+    def fit(self, X, y, **fit_params):
+        """Aramayı çalıştırır.
+
+        Args:
+            X: Özellikler
+            y: Hedef
+            **fit_params: ``<adım>__<param>`` biçiminde fit parametreleri
+                (ör. ``classifier__sample_weight``); satır uzunluğundakiler
+                katlara göre dilimlenir
+
+        Returns:
+            FoldCachedSearchCV: Kendisi
+        """
+        self.timings_ = defaultdict(float)
+        candidates = list(ParameterGrid(self.param_grid))
+        splits = list(check_cv(self.cv, y, classifier=True).split(X, y))
+        scores = self._evaluate(candidates, X, y, fit_params, splits)
+        return self._finish(X, y, fit_params, candidates, scores)
+
+    def timing_report(self) -> pd.DataFrame:
+        """Aşama bazında toplam süreler (saniye) ve paylar."""
+        report = pd.Series(dict(self.timings_), name='seconds').to_frame()
+        report['share'] = report['seconds'] / report['seconds'].sum()
+        return report
+
+    def predict(self, X):
+        return self.best_estimator_.predict(X)
+
+    def predict_proba(self, X):
+        return self.best_estimator_.predict_proba(X)
+
+    def score(self, X, y):
+        return check_scoring(self.estimator, self.scoring)(self.best_estimator_, X, y)
+
+
+def _stratified_subset(y, size, n_splits, rng):
+    """Sınıf oranlarını koruyan, her sınıftan en az ``n_splits`` satır içeren alt küme indeksleri."""
+    y = np.asarray(y)
+    frac = size / len(y)
+    picked = []
+    for cls in pd.unique(y):
+        idx = np.flatnonzero(y == cls)
+        take = min(len(idx), max(int(np.ceil(frac * len(idx))), n_splits))
+        picked.append(rng.choice(idx, size=take, replace=False))
+    return np.sort(np.concatenate(picked))
+
+
+class HalvingSearchCV(FoldCachedSearchCV):
+    """Ardışık yarılama (successive halving) ile hiperparametre araması.
+
+    Tüm adaylar küçük bir kaynakla (eğitim satırı ya da ağaç sayısı gibi bir
+    sınıflandırıcı parametresi) değerlendirilir; her turda en iyi
+    ``1/factor`` kısmı bir sonraki tura geçer ve kaynak ``factor`` katına
+    çıkar. Son tur en büyük kaynakla ve birden fazla adayla yapılır (tek
+    adayın kalacağı tur seçim yapmadığından çalıştırılmaz). Her tur
+    ``FoldCachedSearchCV`` gibi ön adımları kat başına bir kez eğitir.
+
+    Args:
+        estimator: Pipeline
+        param_grid: Parametre gridi
+        factor: Tur başına eleme/kaynak çarpanı
+        resource: ``'n_samples'`` ya da son adım parametresi (ör.
+            ``'classifier__n_estimators'``)
+        min_resources: İlk tur kaynağı; ``'exhaust'`` son turun en büyük
+            kaynağa denk gelmesini sağlar
+        max_resources: En büyük kaynak (``'n_samples'`` için varsayılan: satır sayısı)
+        random_state: Alt küme seçimi için tohum
+        scoring, cv, refit, n_jobs, verbose, warm_start: ``FoldCachedSearchCV`` ile aynı
+    """
+
+    def __init__(self, estimator, param_grid, factor=3, resource='n_samples', min_resources='exhaust',
+                 max_resources=None, random_state=0, scoring=None, cv=5, refit=True, n_jobs=None, verbose=0,
+                 warm_start=True):
+        super().__init__(estimator, param_grid, scoring=scoring, cv=cv, refit=refit, n_jobs=n_jobs,
+                         verbose=verbose, warm_start=warm_start)
+        self.factor = factor
+        self.resource = resource
+        self.min_resources = min_resources
+        self.max_resources = max_resources
+        self.random_state = random_state
+
+    def _n_rounds(self, n_candidates) -> int:
+        """Tur sayısı: son tur birden fazla adayla yapılır (tek aday kalacak tur çalıştırılmaz)."""
+        n_rounds, alive = 1, max(n_candidates, 1)
+        while int(np.ceil(alive / self.factor)) > 1:
+            alive = int(np.ceil(alive / self.factor))
+            n_rounds += 1
+        return n_rounds
+
+    def _schedule(self, n_candidates, max_resources, floor):
+        n_rounds = self._n_rounds(n_candidates)
+        if self.min_resources == 'exhaust':
+            first = max(max_resources // self.factor ** (n_rounds - 1), floor)
+        else:
+            first = self.min_resources
+        schedule = [min(int(first * self.factor ** i), max_resources) for i in range(n_rounds)]
+        if self.min_resources == 'exhaust':
+            schedule[-1] = max_resources
+        return schedule
+
+    def fit(self, X, y, **fit_params):
+        """Aramayı çalıştırır (bkz. ``FoldCachedSearchCV.fit``)."""
+        self.timings_ = defaultdict(float)
+        rng = np.random.default_rng(self.random_state)
+        cv = check_cv(self.cv, y, classifier=True)
+        n_splits = cv.get_n_splits()
+        by_samples = self.resource == 'n_samples'
+        if by_samples:
+            max_resources = self.max_resources or len(y)
+            floor = n_splits * len(pd.unique(np.asarray(y))) * 2
+        else:
+            # Liste halindeki gridlerde tüm alt gridlerin en büyük değeri
+            max_resources = self.max_resources or max(
+                max(grid.get(self.resource, [1])) for grid in ParameterGrid(self.param_grid).param_grid)
+            floor = 1
+
+        candidates = [dict(p) for p in ParameterGrid(self.param_grid)]
+        if not by_samples:
+            for p in candidates:
+                p.pop(self.resource, None)
+            candidates = [dict(t) for t in {tuple(sorted(p.items())): None for p in candidates}]
+        schedule = self._schedule(len(candidates), max_resources, floor)
+
+        history = {'iter': [], 'n_resources': [], 'params': [], 'mean_test_score': []}
+        alive = candidates
+        for it, n_res in enumerate(schedule):
+            if by_samples:
+                idx = np.arange(len(y)) if n_res >= len(y) else _stratified_subset(y, n_res, n_splits, rng)
+                Xr, yr = _safe_indexing(X, idx), _safe_indexing(y, idx)
+                pr = {k: _safe_indexing(v, idx) if hasattr(v, '__len__') and len(v) == len(y) else v
+                      for k, v in fit_params.items()}
+                round_candidates = alive
+            else:
+                Xr, yr, pr = X, y, fit_params
+                round_candidates = [{**p, self.resource: n_res} for p in alive]
+            splits = list(cv.split(Xr, yr))
+            scores = self._evaluate(round_candidates, Xr, yr, pr, splits).mean(axis=1)
+            for p, s in zip(round_candidates, scores):
+                history['iter'].append(it)
+                history['n_resources'].append(n_res)
+                history['params'].append(p)
+                history['mean_test_score'].append(s)
+            if self.verbose:
+                print(f'tur {it}: {len(alive)} aday, kaynak={n_res}, en iyi={scores.max():.4f}')
+            if it == len(schedule) - 1 or len(alive) == 1:
+                final = round_candidates
+                final_scores = scores
+                break
+            keep = max(int(np.ceil(len(alive) / self.factor)), 1)
+            order = np.argsort(-scores, kind='stable')[:keep]
+            alive = [alive[i] for i in order]
+
+        self.history_ = {k: np.asarray(v) if k != 'params' else v for k, v in history.items()}
+        self.n_resources_ = schedule
+        self._finish(X, y, fit_params, list(final), final_scores[:, None])
+        return self
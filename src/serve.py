@@ -0,0 +1,324 @@
+# src/serve.py
+"""Bağlantı kayıtlarını tek tek skorlayan düşük gecikmeli servis.
+
+Kullanım:
+    python -m src.serve --model runs/binary/tasks/rf-refit --socket /tmp/cybersentinel.sock
+    python -m src.serve --model bin.joblib --family-model fam.joblib --port 8765
+
+Protokol satır başına bir JSON nesnesidir (Unix soketi ya da TCP). İstek,
+KDD özellik kolonlarını içeren bir kayıttır; isteğe bağlı ``id`` alanı
+yanıta aynen kopyalanır. Yanıt ``score.score_frame`` kolonlarını
+(``prediction``, ``proba_<sınıf>``, varsa ``family``, ``family_proba``)
+taşır. ``{"cmd": "stats"}`` gecikme ve verim sayaçlarını (önbellek açıksa
+isabet oranını da) döndürür.
+
+Her satır için ayrı ``predict_proba`` çağrısı ``ColumnTransformer`` ve
+doğrulama ek yüküyle milisaniyeler sürer. ``MicroBatcher`` gelen kayıtları
+``max_batch`` satıra ya da ilk kaydın ``max_wait_ms`` beklemesine kadar
+toplar ve grubu tek bir vektörel çağrıyla skorlar. Skorlama ayrı bir iş
+parçacığında çalışır; bu sırada olay döngüsü bir sonraki grubu toplar.
+Aynı bağlantı üzerinden yanıt beklemeden ardışık istek gönderilebilir,
+yanıtlar istek sırasıyla döner.
+"""
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .cache import PredictionCache
+from .data import KDD_COLS, apply_schema
+from .persist import ENGINES
+from .score import load_model, score_frame
+
+SERVE_MAX_BATCH = 256
+SERVE_MAX_WAIT_MS = 2.0
+LATENCY_WINDOW = 10_000   # yüzdelikler son bu kadar isteğin gecikmesinden hesaplanır
+
+
+class LatencyStats:
+    """İstek gecikmeleri (halkasal tampon) ve verim sayaçları.
+
+    Args:
+        window: Yüzdeliklerin hesaplandığı son istek sayısı
+    """
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._latency = np.zeros(window, dtype=np.float64)
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+        self.started = time.perf_counter()
+
+    def record(self, latencies: np.ndarray):
+        """Bir grubun istek gecikmelerini (saniye) ekler."""
+        window = len(self._latency)
+        latencies = latencies[-window:]
+        pos = (self.requests + np.arange(len(latencies))) % window
+        self._latency[pos] = latencies
+        self.requests += len(latencies)
+        self.batches += 1
+
+    def snapshot(self) -> dict:
+        """Anlık sayaçlar: istek/grup sayısı, ortalama grup boyu, p50/p99 (ms), verim."""
+        uptime = time.perf_counter() - self.started
+        seen = self._latency[:min(self.requests, len(self._latency))]
+        p50, p99 = np.percentile(seen, [50, 99]) * 1e3 if len(seen) else (0.0, 0.0)
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'errors': self.errors,
+            'mean_batch': self.requests / self.batches if self.batches else 0.0,
+            'p50_ms': float(p50),
+            'p99_ms': float(p99),
+            'throughput': self.requests / uptime if uptime > 0 else 0.0,
+            'uptime_s': uptime,
+        }
+
+
+def feature_columns(model) -> list[str]:
+    """Modelin beklediği özellik kolonları (eğitimde görülen sırayla)."""
+    if hasattr(model, 'feature_names_in_'):
+        return list(model.feature_names_in_)
+    return [c for c in KDD_COLS if c != 'label']
+
+
+def records_frame(records: list[dict], columns: list[str]) -> pd.DataFrame:
+    """JSON kayıtlarını eğitimdeki şemaya (``KDD_DTYPES``) sahip bir çerçeveye çevirir."""
+    return apply_schema(pd.DataFrame.from_records(records, columns=columns))
+
+
+class MicroBatcher:
+    """Tekil istekleri boyut ve bekleme süresiyle sınırlı gruplarda skorlar.
+
+    Args:
+        model: Eğitilmiş pipeline (``load_model`` çıktısı)
+        family_model: Saldırı ailesi pipeline'ı (opsiyonel)
+        max_batch: Grup başına en fazla kayıt
+        max_wait_ms: Grubun ilk kaydının en fazla bekleme süresi
+        stats: Gecikme sayaçları (``None`` ise yeni oluşturulur)
+    """
+
+    def __init__(self, model, family_model=None, max_batch: int = SERVE_MAX_BATCH,
+                 max_wait_ms: float = SERVE_MAX_WAIT_MS, stats: LatencyStats | None = None):
+        self.model = model
+        self.family_model = family_model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1e3
+        self.stats = stats or LatencyStats()
+        self.columns = feature_columns(model)
+        self._required = frozenset(self.columns)
+        self._queue = None
+        self._task = None
+        self._executor = None
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        # Tek iş parçacığı: aynı anda tek grup skorlanır, döngü sıradakini toplar
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scorer')
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def snapshot(self) -> dict:
+        """Gecikme / verim sayaçları ve varsa önbellek sayaçları."""
+        out = self.stats.snapshot()
+        if isinstance(self.model, PredictionCache):
+            out.update(self.model.stats())
+        return out
+
+    async def submit(self, record: dict) -> dict:
+        """Tek kaydı kuyruğa ekler ve skoru hazır olduğunda döndürür."""
+        missing = self._required.difference(record)
+        if missing:
+            raise ValueError(f"Eksik özellik(ler): {', '.join(sorted(missing))}")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((record, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self) -> list:
+        """Bir grup toplar: ilk kayıttan sonra ``max_batch``'e ya da süre dolana kadar."""
+        loop = asyncio.get_running_loop()
+        items = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(items) < self.max_batch:
+            # Kuyrukta bekleyenler beklemeden alınır
+            while len(items) < self.max_batch and not self._queue.empty():
+                items.append(self._queue.get_nowait())
+            remaining = deadline - loop.time()
+            if len(items) >= self.max_batch or remaining <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except TimeoutError:
+                break
+        return items
+
+    def _score(self, records: list[dict]) -> list[dict]:
+        X = records_frame(records, self.columns)
+        return score_frame(self.model, X, self.family_model).to_dict('records')
+
+    def _score_each(self, records: list[dict]) -> list:
+        """Grubu kayıt kayıt skorlar; hatalı kaydın sonucu istisnanın kendisidir."""
+        out = []
+        for record in records:
+            try:
+                out.extend(self._score([record]))
+            except Exception as exc:
+                out.append(exc)
+        return out
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = await self._collect()
+            records = [item[0] for item in items]
+            try:
+                results = await loop.run_in_executor(self._executor, self._score, records)
+            except Exception:
+                # Hatalı bir kayıt gruptaki diğer istekleri düşürmesin: yalnızca bu grup tek tek skorlanır
+                results = await loop.run_in_executor(self._executor, self._score_each, records)
+            done = time.perf_counter()
+            for (_, future, _), result in zip(items, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    self.stats.errors += 1
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+            self.stats.record(done - np.fromiter((t for _, _, t in items), dtype=np.float64, count=len(items)))
+
+
+async def _reply(batcher: MicroBatcher, line: bytes) -> dict:
+    """Tek istek satırının yanıtı; hatalar ``error`` alanıyla döner."""
+    try:
+        message = json.loads(line)
+    except ValueError as exc:
+        return {'error': f"Geçersiz JSON: {exc}"}
+    if not isinstance(message, dict):
+        return {'error': "İstek bir JSON nesnesi olmalı"}
+    if message.get('cmd') == 'stats':
+        return batcher.snapshot()
+    try:
+        reply = await batcher.submit(message)
+    except Exception as exc:
+        reply = {'error': str(exc)}
+    return {'id': message['id'], **reply} if 'id' in message else reply
+
+
+async def handle_connection(batcher: MicroBatcher, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Bir bağlantının isteklerini okur; yanıtları istek sırasıyla yazar."""
+    pending = asyncio.Queue()
+
+    async def respond():
+        while (task := await pending.get()) is not None:
+            writer.write(json.dumps(await task, default=str).encode() + b'\n')
+            await writer.drain()
+
+    responder = asyncio.create_task(respond())
+    try:
+        while line := await reader.readline():
+            if line.strip():
+                pending.put_nowait(asyncio.create_task(_reply(batcher, line)))
+        pending.put_nowait(None)
+        await responder
+    except ConnectionError:
+        responder.cancel()
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def serve(model_path, family_path=None, socket_path=None, host='127.0.0.1', port=8765,
+                max_batch: int = SERVE_MAX_BATCH, max_wait_ms: float = SERVE_MAX_WAIT_MS,
+                report_every: float = 0.0, cache_size: int = 0, engine: str = 'sklearn'):
+    """Modeli yükler ve servisi durdurulana kadar çalıştırır.
+
+    Args:
+        model_path: Model (``persist`` klasörü ya da ``joblib`` dosyası)
+        family_path: Saldırı ailesi modeli (opsiyonel)
+        socket_path: Unix soketi yolu; ``None`` ise ``host:port`` üzerinde TCP
+        host, port: TCP adresi
+        max_batch: Grup başına en fazla kayıt
+        max_wait_ms: Grubun ilk kaydının en fazla bekleme süresi
+        report_every: Sayaçların yazdırılma aralığı (saniye, 0: kapalı)
+        cache_size: Tahmin önbelleği boyutu (0: kapalı, bkz. ``cache.PredictionCache``)
+        engine: ``persist`` klasörlerinin yükleme motoru; uzun ömürlü serviste
+            tahmin hızı baskın olduğundan ``'sklearn'`` (bkz. ``persist``)
+    """
+    model = load_model(model_path, engine=engine)
+    family = load_model(family_path, engine=engine) if family_path else None
+    if cache_size:
+        model = PredictionCache(model, maxsize=cache_size)
+        family = PredictionCache(family, maxsize=cache_size) if family is not None else None
+    batcher = MicroBatcher(model, family, max_batch=max_batch, max_wait_ms=max_wait_ms)
+    await batcher.start()
+
+    def handler(reader, writer):
+        return handle_connection(batcher, reader, writer)
+
+    if socket_path:
+        server = await asyncio.start_unix_server(handler, path=socket_path)
+    else:
+        server = await asyncio.start_server(handler, host=host, port=port)
+    print(f"Dinleniyor: {socket_path or f'{host}:{port}'} (max_batch={max_batch}, max_wait={max_wait_ms}ms)")
+
+    async def report():
+        while True:
+            await asyncio.sleep(report_every)
+            s = batcher.snapshot()
+            cache = f" önbellek isabeti=%{100 * s['cache_hit_rate']:.1f}" if 'cache_hit_rate' in s else ''
+            print(f"istek={s['requests']:,} grup ort.={s['mean_batch']:.1f} p50={s['p50_ms']:.2f}ms "
+                  f"p99={s['p99_ms']:.2f}ms verim={s['throughput']:,.0f}/s hata={s['errors']}{cache}")
+
+    reporter = asyncio.create_task(report()) if report_every > 0 else None
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if reporter is not None:
+            reporter.cancel()
+        await batcher.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m src.serve', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', required=True, help='Model klasörü (persist) ya da .joblib dosyası')
+    parser.add_argument('--family-model', default=None, help='Saldırı ailesi modeli (opsiyonel)')
+    parser.add_argument('--socket', default=None, help='Unix soketi yolu (verilmezse TCP)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-batch', type=int, default=SERVE_MAX_BATCH)
+    parser.add_argument('--max-wait-ms', type=float, default=SERVE_MAX_WAIT_MS)
+    parser.add_argument('--report-every', type=float, default=10.0, help='Sayaç raporu aralığı (saniye)')
+    parser.add_argument('--cache-size', type=int, default=0, help='Tahmin önbelleği boyutu (0: kapalı)')
+    parser.add_argument('--engine', choices=ENGINES, default='sklearn',
+                        help='persist klasörleri için yükleme motoru (bkz. src.persist)')
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.model, args.family_model, socket_path=args.socket, host=args.host,
+                          port=args.port, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms,
+                          report_every=args.report_every, cache_size=args.cache_size, engine=args.engine))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
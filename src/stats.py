@@ -0,0 +1,277 @@
+# src/stats.py
+"""Tek geçişte hesaplanan kolon istatistikleri profili.
+
+``DatasetProfile`` sayım, min/max, ortalama/varyans, sıfır oranı, farklı değer
+sayısı ve kantil taslağını her kolon için veri üzerinden bir kez geçerek
+hesaplar. Parça parça güncellenebilir ve birleştirilebilir; ``ConstantDropper``,
+``viz`` grafikleri (``zscore_outliers``, ``boxplots``,
+``plot_correlation_heatmap``) ve EDA özetleri aynı profili kullanır.
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+EXACT_DISTINCT_LIMIT = 100_000   # bu sınırdan sonra farklı değer sayısı HyperLogLog ile tahmin edilir
+HLL_BITS = 12                    # 4096 yazmaç, ~%1.6 göreli hata
+
+
+def _hash(values: np.ndarray) -> np.ndarray:
+    return pd.util.hash_array(np.asarray(values), categorize=False)
+
+
+class _HyperLogLog:
+    """Birleştirilebilir HyperLogLog farklı değer sayacı."""
+
+    def __init__(self, registers: np.ndarray | None = None):
+        self.registers = registers if registers is not None else np.zeros(1 << HLL_BITS, dtype=np.uint8)
+
+    def add(self, values: np.ndarray):
+        h = _hash(values)
+        idx = (h >> np.uint64(64 - HLL_BITS)).astype(np.int64)
+        rest = (h << np.uint64(HLL_BITS)) | np.uint64(1 << (HLL_BITS - 1))
+        # Baştaki sıfır sayısı + 1 (rest hiçbir zaman 0 olmaz)
+        rank = (64 - np.floor(np.log2(rest.astype(np.float64)))).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rank)
+
+    def merge(self, other: '_HyperLogLog'):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        est = alpha * m * m / np.sum(2.0 ** -self.registers.astype(np.float64))
+        zeros = np.count_nonzero(self.registers == 0)
+        if est <= 2.5 * m and zeros:
+            est = m * np.log(m / zeros)   # küçük aralık düzeltmesi
+        return float(est)
+
+
+class DatasetProfile:
+    """Kolon bazlı tek geçişlik istatistik profili.
+
+    Args:
+        sketch_size: Kantiller için tutulan satır örneklemi boyutu
+        seed: Örneklem anahtarları için rastgelelik tohumu
+    """
+
+    def __init__(self, sketch_size: int = 4096, seed: int = 0):
+        self.sketch_size = sketch_size
+        self.seed = seed
+        self.n_rows = 0
+        self.columns = []
+        self.numeric = []
+        self._stats = {}        # kolon -> dict(count, min, max, mean, m2, zeros)
+        self._distinct = {}     # kolon -> set ya da _HyperLogLog
+        self._sample = None     # sayısal kolonlardan satır örneklemi (float64)
+        self._sample_keys = np.empty(0)
+        self._rng = np.random.default_rng(seed)
+
+    # ------------------------------------------------------------------ güncelleme
+    def update(self, df: pd.DataFrame) -> 'DatasetProfile':
+        """Profili bir veri parçasıyla günceller.
+
+        Args:
+            df: Veri parçası
+
+        Returns:
+            DatasetProfile: Kendisi
+        """
+        if not self.columns:
+            self.columns = list(df.columns)
+            self.numeric = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c].dtype)]
+        n = len(df)
+        if n == 0:
+            return self
+
+        for col in self.columns:
+            values = df[col]
+            if col in self.numeric:
+                arr = values.to_numpy(dtype=np.float64, na_value=np.nan)
+                self._update_moments(col, arr[~np.isnan(arr)])
+                uniques = pd.unique(arr[~np.isnan(arr)])
+            else:
+                valid = values.dropna()
+                self._update_count(col, len(valid))
+                uniques = valid.unique()
+            self._update_distinct(col, np.asarray(uniques))
+
+        # Kantil taslağı: en küçük rastgele anahtarlı satırlar (birleştirilebilir örneklem)
+        keys = self._rng.random(n)
+        block = df[self.numeric].to_numpy(dtype=np.float64, na_value=np.nan)
+        if n > self.sketch_size:
+            top = np.argpartition(keys, self.sketch_size)[:self.sketch_size]
+            keys, block = keys[top], block[top]
+        self._merge_sample(keys, block)
+        self.n_rows += n
+        return self
+
+    def _update_count(self, col, count):
+        st = self._stats.setdefault(col, {'count': 0})
+        st['count'] += count
+
+    def _update_moments(self, col, arr):
+        n_b = len(arr)
+        st = self._stats.setdefault(col, {'count': 0, 'min': np.inf, 'max': -np.inf,
+                                          'mean': 0.0, 'm2': 0.0, 'zeros': 0})
+        if n_b == 0:
+            return
+        mean_b = arr.mean()
+        m2_b = np.square(arr - mean_b).sum()
+        n_a = st['count']
+        n = n_a + n_b
+        delta = mean_b - st['mean']
+        # Chan vd. paralel varyans birleştirmesi
+        st['mean'] += delta * n_b / n
+        st['m2'] += m2_b + delta * delta * n_a * n_b / n
+        st['count'] = n
+        st['min'] = min(st['min'], float(arr.min()))
+        st['max'] = max(st['max'], float(arr.max()))
+        st['zeros'] += int(np.count_nonzero(arr == 0))
+
+    def _update_distinct(self, col, uniques):
+        current = self._distinct.setdefault(col, set())
+        if isinstance(current, set):
+            current.update(uniques.tolist())
+            if len(current) > EXACT_DISTINCT_LIMIT:
+                # Sonraki parçalarla aynı tip: hash_array özetleri tipe bağlıdır
+                hll = _HyperLogLog()
+                hll.add(np.asarray(list(current), dtype=uniques.dtype))
+                self._distinct[col] = hll
+        else:
+            current.add(uniques)
+
+    def _merge_sample(self, keys, block):
+        if self._sample is None:
+            self._sample, self._sample_keys = block, keys
+        else:
+            self._sample = np.vstack([self._sample, block])
+            self._sample_keys = np.concatenate([self._sample_keys, keys])
+        if len(self._sample_keys) > self.sketch_size:
+            top = np.argpartition(self._sample_keys, self.sketch_size)[:self.sketch_size]
+            self._sample, self._sample_keys = self._sample[top], self._sample_keys[top]
+
+    # ------------------------------------------------------------------ kurucular
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, **kwargs) -> 'DatasetProfile':
+        """Bellekteki bir DataFrame'in profilini çıkarır."""
+        return cls(**kwargs).update(df)
+
+    @classmethod
+    def from_chunks(cls, chunks, **kwargs) -> 'DatasetProfile':
+        """Parça üretecinin (ör. ``load_kdd_iter``) profilini sabit bellekle çıkarır."""
+        profile = cls(**kwargs)
+        for chunk in chunks:
+            profile.update(chunk)
+        return profile
+
+    # ------------------------------------------------------------------ sorgular
+    @property
+    def distinct(self) -> pd.Series:
+        """Kolon başına farklı (boş olmayan) değer sayısı."""
+        return pd.Series({c: len(d) if isinstance(d, set) else round(d.estimate())
+                          for c, d in self._distinct.items()}, dtype='int64')
+
+    @property
+    def mean(self) -> pd.Series:
+        return pd.Series({c: self._stats[c]['mean'] for c in self.numeric})
+
+    @property
+    def std(self) -> pd.Series:
+        """Popülasyon standart sapması (ddof=0)."""
+        return pd.Series({c: np.sqrt(self._stats[c]['m2'] / self._stats[c]['count'])
+                          if self._stats[c]['count'] else np.nan for c in self.numeric})
+
+    def quantiles(self, q=(0.25, 0.5, 0.75)) -> pd.DataFrame:
+        """Kantil taslağından yaklaşık kantiller."""
+        q = list(q)
+        values = np.nanquantile(self._sample, q, axis=0) if self._sample is not None and len(self._sample) \
+            else np.full((len(q), len(self.numeric)), np.nan)
+        return pd.DataFrame(values.T, index=self.numeric, columns=[f'q{int(p * 100)}' for p in q])
+
+    @property
+    def sample(self) -> pd.DataFrame:
+        """Kantil taslağının sayısal satır örneklemi (en fazla ``sketch_size`` satır)."""
+        data = self._sample if self._sample is not None else np.empty((0, len(self.numeric)))
+        return pd.DataFrame(data, columns=self.numeric)
+
+    def constant_columns(self) -> list:
+        """Farklı değer sayısı en fazla 1 olan kolonlar."""
+        distinct = self.distinct
+        return [c for c in self.columns if distinct.get(c, 0) <= 1]
+
+    def to_frame(self) -> pd.DataFrame:
+        """``describe()`` + ``nunique()`` yerine geçen özet tablo."""
+        rows = {}
+        distinct = self.distinct
+        for col in self.columns:
+            st = self._stats.get(col, {'count': 0})
+            row = {'count': st['count'], 'distinct': distinct.get(col, 0)}
+            if col in self.numeric and st['count']:
+                row.update(min=st['min'], max=st['max'], mean=st['mean'],
+                           var=st['m2'] / st['count'], zero_frac=st['zeros'] / st['count'])
+            rows[col] = row
+        out = pd.DataFrame.from_dict(rows, orient='index')
+        out['std'] = np.sqrt(out['var']) if 'var' in out else np.nan
+        return out.join(self.quantiles())
+
+    # ------------------------------------------------------------------ kalıcılık
+    def save(self, path: str | Path):
+        """Profili JSON olarak kaydeder."""
+        distinct = {}
+        for col, d in self._distinct.items():
+            distinct[col] = {'hll': d.registers.tolist()} if isinstance(d, _HyperLogLog) \
+                else {'values': [v.item() if isinstance(v, np.generic) else v for v in d]}
+        state = {
+            'sketch_size': self.sketch_size, 'seed': self.seed, 'n_rows': self.n_rows,
+            'columns': self.columns, 'numeric': self.numeric, 'stats': self._stats,
+            'distinct': distinct,
+            'sample': None if self._sample is None else np.where(np.isnan(self._sample), None, self._sample).tolist(),
+            'sample_keys': self._sample_keys.tolist(),
+        }
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(state, f)
+
+    @classmethod
+    def load(cls, path: str | Path) -> 'DatasetProfile':
+        """``save`` ile kaydedilmiş profili okur."""
+        with open(path) as f:
+            state = json.load(f)
+        profile = cls(sketch_size=state['sketch_size'], seed=state['seed'])
+        profile.n_rows = state['n_rows']
+        profile.columns = state['columns']
+        profile.numeric = state['numeric']
+        profile._stats = state['stats']
+        profile._distinct = {c: _HyperLogLog(np.array(d['hll'], dtype=np.uint8)) if 'hll' in d else set(d['values'])
+                             for c, d in state['distinct'].items()}
+        if state['sample'] is not None:
+            profile._sample = np.array(state['sample'], dtype=np.float64)
+        profile._sample_keys = np.array(state['sample_keys'], dtype=np.float64)
+        return profile
+
+
+def profile_kdd(path: str | Path, gz: bool = True, cache: bool = True) -> DatasetProfile:
+    """Bir KDD dosyasının profilini döndürür; profil veri önbelleğinin yanında saklanır.
+
+    Args:
+        path: Veri dosyasının yolu
+        gz: Dosyanın gzip ile sıkıştırılmış olup olmadığı
+        cache: Profil diske yazılsın/diskten okunsun mu
+
+    Returns:
+        DatasetProfile: Dosyanın profili
+    """
+    from .data import cache_path, load_kdd_iter
+
+    target = Path(f"{cache_path(path, variant='profile')}.json") if cache else None
+    if target is not None and target.exists():
+        return DatasetProfile.load(target)
+    profile = DatasetProfile.from_chunks(load_kdd_iter(path, gz=gz, targets=False))
+    if target is not None:
+        try:
+            profile.save(target)
+        except OSError:
+            pass   # salt okunur dizin: profili önbelleksiz döndür
+    return profile
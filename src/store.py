@@ -0,0 +1,192 @@
+# src/store.py
+"""Ön işlenmiş tasarım matrisleri için içerik adresli disk deposu.
+
+Anahtar, girdi verisinin kimliği (satır özetleri + kolon/tip bilgisi) ile
+ön işleyicinin parametrelerinden türetilir. Aynı veri ve aynı ayarlarla
+yapılan ``fit_transform`` / ``transform`` çağrıları diskteki matrisi okur;
+veri ya da ayar değiştiğinde matris yeniden hesaplanır.
+
+Model seçiminde ön işleyici her katın yalnızca eğitim satırlarıyla
+eğitilmelidir; bunun için pipeline'da ``StoredPreprocessor`` kullanılır
+(bkz. ``models.make_binary_pipelines(store=...)``). Tüm eğitim setinde
+eğitilmiş tek matris (``precomputed=True``) yalnızca son model içindir.
+"""
+import copy
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.base import BaseEstimator, TransformerMixin, clone
+
+DEFAULT_ROOT = Path(__file__).parent.parent / 'data' / '.matrix_cache'
+
+
+def data_key(X: pd.DataFrame) -> str:
+    """DataFrame içeriğinin özetini döndürür (index, kolonlar ve tipler dahil).
+
+    Args:
+        X: Veri seti
+
+    Returns:
+        str: 32 karakterlik onaltılık özet
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([(c, str(t)) for c, t in X.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(X, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def config_key(pre) -> str:
+    """Ön işleyicinin (eğitilmemiş) parametrelerinin özetini döndürür."""
+    return joblib.hash(clone(pre))
+
+
+class MatrixStore:
+    """Dönüştürülmüş matrisleri ``<anahtar>/`` klasörlerinde saklayan depo.
+
+    Seyrek matrisler CSR ``.npz``, yoğun matrisler bellek eşlemeli ``.npy``
+    olarak yazılır; eğitilmiş ön işleyici ``preprocessor.joblib`` olarak
+    matrisin yanında durur, böylece test seti dönüşümü de önbellekten gelir.
+
+    Args:
+        root: Depo klasörü (varsayılan: ``data/.matrix_cache``)
+    """
+
+    def __init__(self, root: str | Path = DEFAULT_ROOT):
+        self.root = Path(root)
+
+    def _load(self, folder: Path):
+        if (folder / 'X.npz').exists():
+            return sparse.load_npz(folder / 'X.npz').tocsr()
+        return np.load(folder / 'X.npy', mmap_mode='r').view(np.ndarray)
+
+    def _save(self, folder: Path, Xt, pre=None):
+        tmp = folder.with_name(f"{folder.name}.tmp{os.getpid()}")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        if sparse.issparse(Xt):
+            sparse.save_npz(tmp / 'X.npz', sparse.csr_matrix(Xt), compressed=False)
+        else:
+            np.save(tmp / 'X.npy', np.ascontiguousarray(Xt))
+        if pre is not None:
+            joblib.dump(pre, tmp / 'preprocessor.joblib')
+        try:
+            os.replace(tmp, folder)
+        except OSError:
+            # Aynı anahtarı başka bir süreç yazdı
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def fit_transform(self, pre, X: pd.DataFrame, key: str | None = None, sample_weight=None):
+        """Ön işleyiciyi eğitir ve dönüştürülmüş matrisi döndürür (önbellekten ya da hesaplayarak).
+
+        Args:
+            pre: Eğitilmemiş ön işleyici (ör. ``make_preprocessor`` çıktısı)
+            X: Eğitim verisi
+            key: Veri kimliği (ör. ``data.source_key``); verilmezse ``data_key(X)``
+            sample_weight: Satır ağırlıkları; verilirse anahtara eklenir
+
+        Returns:
+            tuple: (dönüştürülmüş matris, eğitilmiş ön işleyici)
+        """
+        key = key or data_key(X)
+        if sample_weight is not None:
+            key = f"{key}-w{joblib.hash(np.asarray(sample_weight))}"
+        folder = self.root / f"fit-{config_key(pre)}-{key}"
+        if (folder / 'preprocessor.joblib').exists():
+            return self._load(folder), joblib.load(folder / 'preprocessor.joblib')
+        pre = clone(pre)
+        Xt = pre.fit_transform(X) if sample_weight is None else pre.fit_transform(X, sample_weight=sample_weight)
+        self._save(folder, Xt, pre)
+        return Xt, pre
+
+    def transform(self, pre, X: pd.DataFrame, key: str | None = None):
+        """Eğitilmiş ön işleyiciyle dönüştürülmüş matrisi döndürür.
+
+        Anahtar eğitilmiş durumun (öğrenilen ölçekler, kategoriler) özetini
+        içerir; farklı veriyle eğitilmiş bir ön işleyici farklı girdi üretir.
+
+        Args:
+            pre: Eğitilmiş ön işleyici
+            X: Dönüştürülecek veri
+            key: Veri kimliği; verilmezse ``data_key(X)``
+
+        Returns:
+            Dönüştürülmüş matris
+        """
+        folder = self.root / f"tr-{joblib.hash(pre)}-{key or data_key(X)}"
+        if (folder / 'X.npz').exists() or (folder / 'X.npy').exists():
+            return self._load(folder)
+        Xt = pre.transform(X)
+        self._save(folder, Xt)
+        return Xt
+
+    def clear(self):
+        """Depodaki tüm matrisleri siler."""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+class StoredPreprocessor(BaseEstimator, TransformerMixin):
+    """Ön işleyiciyi ``MatrixStore`` üzerinden eğiten ve uygulayan pipeline adımı.
+
+    ``fit`` yalnızca kendisine verilen satırları kullanır; CV'de bu katın
+    eğitim kısmıdır, doğrulama satırlarının istatistikleri eğitime sızmaz.
+    Anahtar (ön işleyici ayarı, katın satır özeti) çiftidir: her kat kendi
+    matrisini alır, aynı katta denenen diğer aday parametreler ve doğrulama
+    dönüşümü diskten okunur. Satır özeti kat indeksinden güçlüdür; farklı
+    bir CV bölmesi aynı indeksli katla çakışmaz.
+
+    Depo yalnızca eğitim ve CV doğrulaması içindir: her ``transform`` çağrısı
+    bir matris yazar. Çıkarımdan önce ``unwrap_stored`` ile eğitilmiş ön
+    işleyiciye dönülür; ``persist.save_pipeline``, ``models.compile_pipeline``
+    ve ``score.load_model`` bunu kendileri yapar.
+
+    Args:
+        preprocessor: Eğitilmemiş ön işleyici (ör. ``make_preprocessor`` çıktısı)
+        root: Depo klasörü
+    """
+
+    def __init__(self, preprocessor, root: str | Path = DEFAULT_ROOT):
+        self.preprocessor = preprocessor
+        self.root = root
+
+    def fit(self, X, y=None, sample_weight=None):
+        self.fit_transform(X, y, sample_weight=sample_weight)
+        return self
+
+    def fit_transform(self, X, y=None, sample_weight=None):
+        Xt, self.preprocessor_ = MatrixStore(self.root).fit_transform(self.preprocessor, X,
+                                                                      sample_weight=sample_weight)
+        return Xt
+
+    def transform(self, X):
+        return MatrixStore(self.root).transform(self.preprocessor_, X)
+
+    def get_feature_names_out(self, input_features=None):
+        return self.preprocessor_.get_feature_names_out(input_features)
+
+
+def unwrap_stored(pipe):
+    """``StoredPreprocessor`` adımlarını eğitilmiş ön işleyicileriyle değiştirir.
+
+    Çıkarımda depoya matris yazılmaması için kullanılır. Orijinal pipeline
+    değişmez; gerekirse yüzeysel bir kopya döner.
+
+    Args:
+        pipe: Eğitilmiş pipeline ya da tahminci
+
+    Returns:
+        ``StoredPreprocessor`` içermeyen pipeline ya da tahminci
+    """
+    if isinstance(pipe, StoredPreprocessor):
+        return pipe.preprocessor_
+    if not any(isinstance(step, StoredPreprocessor) for _, step in getattr(pipe, 'steps', [])):
+        return pipe
+    unwrapped = copy.copy(pipe)
+    unwrapped.steps = [(name, step.preprocessor_ if isinstance(step, StoredPreprocessor) else step)
+                       for name, step in pipe.steps]
+    return unwrapped
@@ -0,0 +1,411 @@
+# src/train.py
+"""Komut satırından model eğitimi.
+
+Kullanım:
+    python -m src.train binary --models lr rf --cv 3 --workers 4 --memory-gb 8
+    python -m src.train multiclass --frac 0.5
+
+(model x aday x kat) görevleri bir süreç havuzunda çalışır. Biten her görevin
+skoru ``<run_dir>/tasks/<görev>.json``, eğitilmiş pipeline'ı
+``<görev>.joblib`` olarak yazılır; yarıda kalan bir çalıştırma aynı komutla
+kaldığı yerden devam eder. Çapraz doğrulamadan sonra her modelin en iyi adayı
+tüm eğitim setinde yeniden eğitilir, test setinde değerlendirilir ve
+``persist.save_pipeline`` ile ``<run_dir>/tasks/<model>-refit/`` altına yazılır.
+
+Veri süreçlere kopyalanmaz: tipli kolonlar, hedefler ve kat atamaları
+``<run_dir>/shared/`` altına bir kez ``write_columns`` ile yazılır ve her süreç
+bunları ``read_columns`` ile bellek eşlemeli açar. Sayfalar süreçler arasında
+paylaşıldığından süreç sayısı arttıkça bellek katlanmaz.
+
+Kat görevleri eğitim satırlarını (``X.iloc[train]``, verinin ~(k-1)/k'sı)
+kopyalar; bu kopya ve ön işleme/SMOTE matrisleri görev başına bellektir.
+``--memory-gb`` verildiğinde bu bellek tahmin edilmez, ölçülür: her görev
+kendi tepe RSS artışını (Linux ``/proc``) kaydına yazar. Bir modelin ilk
+kat görevi ve her yeniden eğitim (tüm eğitim seti + test tahmini) ilk
+ölçümünü tek başına yapar; sonraki görevler ancak ölçülen tepelerin toplamı
+bütçeye sığıyorsa başlatılır. Ölçüm yapılamayan sistemlerde
+``TASK_MEMORY_FACTOR`` tahmini kullanılır.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, check_scoring, f1_score
+from sklearn.model_selection import ParameterGrid, StratifiedKFold
+
+from .data import load_kdd, read_columns, sample_kdd, source_key, write_columns
+from .models import make_binary_pipelines, make_multiclass_pipelines
+from .persist import save_pipeline
+from .preprocess import add_targets, split_features
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+TRAIN_FILE = 'kddcup.data_10_percent.gz'
+TEST_FILE = 'corrected.gz'
+RUNS_DIR = Path(__file__).parent.parent / 'runs'
+SCORING = {'binary': 'f1', 'multiclass': 'f1_macro'}
+TASK_MEMORY_FACTOR = 8   # ölçüm yoksa görev başına tepe bellek ~ eğitim verisi x çarpan
+
+_WORKER = {}             # süreç başına veri (bkz. _init_worker)
+
+
+def load_task_data(task: str, frac: float = 1.0, seed: int = 42, data_dir: Path = DATA_DIR):
+    """Eğitim/test verisini görev için hazırlar.
+
+    Multi-class görevde normal satırlar ``'normal'`` ailesine atanır ve ailesi
+    bilinmeyen saldırılar (ör. yalnızca test setinde görülenler) çıkarılır.
+
+    Args:
+        task: ``'binary'`` ya da ``'multiclass'``
+        frac: Eğitim setinden kullanılacak örneklem oranı
+        seed: Örneklem tohumu
+        data_dir: Veri klasörü
+
+    Returns:
+        tuple: (X_train, y_train, X_test, y_test, num_cols, cat_cols)
+    """
+    train_path = Path(data_dir) / TRAIN_FILE
+    train = load_kdd(train_path) if frac >= 1 else sample_kdd(train_path, frac=frac, seed=seed)
+    test = load_kdd(Path(data_dir) / TEST_FILE)
+    multiclass = task == 'multiclass'
+    train = add_targets(train, fill_normal=multiclass)
+    test = add_targets(test, fill_normal=multiclass)
+    if multiclass:
+        train = train[train['y_family'].notna()]
+        test = test[test['y_family'].notna()]
+
+    X_train, y_bin, y_fam, num_cols, cat_cols = split_features(train)
+    X_test, y_bin_test, y_fam_test, _, _ = split_features(test)
+    if multiclass:
+        return X_train, y_fam.astype(str), X_test, y_fam_test.astype(str), num_cols, cat_cols
+    return X_train, y_bin, X_test, y_bin_test, num_cols, cat_cols
+
+
+def make_grids(task: str, num_cols, cat_cols) -> dict:
+    """Görevin ``(pipeline, param_grid)`` sözlüğü."""
+    if task == 'binary':
+        return make_binary_pipelines(num_cols, cat_cols)
+    return make_multiclass_pipelines(num_cols, cat_cols)
+
+
+def plan_tasks(grids: dict, models, n_splits: int) -> list:
+    """(model x aday x kat) görev listesini çıkarır.
+
+    Returns:
+        list: ``{'id', 'model', 'candidate', 'fold', 'params'}`` sözlükleri
+    """
+    tasks = []
+    for model in models:
+        for cand, params in enumerate(ParameterGrid(grids[model][1])):
+            for fold in range(n_splits):
+                tasks.append({'id': f'{model}-c{cand:02d}-f{fold}', 'model': model,
+                              'candidate': cand, 'fold': fold, 'params': params})
+    return tasks
+
+
+def estimate_task_memory(X: pd.DataFrame) -> int:
+    """Ölçüm yapılamadığında görev başına tepe bellek tahmini (bayt)."""
+    return int(X.memory_usage(deep=True).sum() * TASK_MEMORY_FACTOR)
+
+
+def _proc_status(field: str) -> int:
+    """``/proc/self/status`` alanını bayt olarak okur."""
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(f'{field}:'):
+                return int(line.split()[1]) * 1024
+    raise OSError(field)
+
+
+def _reset_peak_rss() -> int | None:
+    """Sürecin tepe RSS'ini (``VmHWM``) sıfırlar ve o anki RSS'i döndürür; Linux dışında ``None``."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return _proc_status('VmRSS')
+    except OSError:
+        return None
+
+
+def _memory_key(task: dict) -> str:
+    """Tepe belleği birlikte ölçülen görev grubu: model kat görevleri ya da model yeniden eğitimi."""
+    return task['model'] if task['fold'] is not None else f"{task['model']}-refit"
+
+
+def task_peaks(records, fallback: int) -> dict:
+    """Görev kayıtlarından grup başına ölçülen en büyük tepe bellek.
+
+    Args:
+        records: Görev kayıtları (``_run_task`` çıktısı)
+        fallback: Ölçümü olmayan kayıtlar için bellek (``estimate_task_memory``)
+
+    Returns:
+        dict: ``_memory_key`` -> bayt
+    """
+    peaks = {}
+    for record in records:
+        key = _memory_key(record)
+        peaks[key] = max(peaks.get(key, 0), record.get('peak_bytes') or fallback)
+    return peaks
+
+
+def _write_json(path: Path, obj: dict):
+    tmp = path.with_name(f'{path.name}.tmp{os.getpid()}')
+    with open(tmp, 'w') as f:
+        json.dump(obj, f, indent=2, default=str)
+    os.replace(tmp, path)
+
+
+def share_data(frames: dict, folds: np.ndarray, root: Path) -> dict:
+    """Veriyi süreçlerin bellek eşlemeli açacağı kolon dosyalarına yazar.
+
+    Args:
+        frames: İsim -> DataFrame ya da Series (``X``, ``y``, ``X_test``, ``y_test``)
+        folds: Satır başına doğrulama katı numarası
+        root: Paylaşılan veri klasörü
+
+    Returns:
+        dict: İsim -> klasör yolu (``'folds'`` için ``.npy`` yolu)
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for name, frame in frames.items():
+        if isinstance(frame, pd.Series):
+            # Metin hedefler kategorik kodlarla saklanır; böylece onlar da eşlenir
+            if not pd.api.types.is_numeric_dtype(frame.dtype):
+                frame = frame.astype('category')
+            frame = frame.to_frame(name)
+        target = root / name
+        if not (target / 'meta.json').exists():
+            write_columns(frame, target)
+        paths[name] = str(target)
+    paths['folds'] = str(root / 'folds.npy')
+    if not Path(paths['folds']).exists():
+        np.save(paths['folds'], folds)
+    return paths
+
+
+def _init_worker(payload: dict):
+    _WORKER.update(payload)
+    for name in ('X', 'y', 'X_test', 'y_test'):
+        frame = read_columns(payload['shared'][name])
+        _WORKER[name] = frame if name.startswith('X') else frame.iloc[:, 0]
+    _WORKER['folds'] = np.load(payload['shared']['folds'], mmap_mode='r')
+    _WORKER['grids'] = make_grids(payload['task'], payload['num_cols'], payload['cat_cols'])
+
+
+def _run_task(task: dict, task_dir: str) -> dict:
+    """Tek bir görevi çalıştırır, pipeline'ı ve skoru diske yazar."""
+    base_rss = _reset_peak_rss()
+    X, y = _WORKER['X'], _WORKER['y']
+    # Görev başına eğitilmemiş kopya: önceki görevin parametreleri ve durumu taşınmaz
+    pipe = clone(_WORKER['grids'][task['model']][0]).set_params(**task['params'])
+    scorer = check_scoring(pipe, SCORING[_WORKER['task']])
+
+    t0 = time.perf_counter()
+    record = dict(task)
+    if task['fold'] is None:
+        # En iyi adayın tüm eğitim setinde yeniden eğitimi + test değerlendirmesi
+        pipe.fit(X, y)
+        record['fit_time'] = time.perf_counter() - t0
+        y_pred = pipe.predict(_WORKER['X_test'])
+        y_test = _WORKER['y_test']
+        record['test'] = {'accuracy': accuracy_score(y_test, y_pred),
+                          'f1': f1_score(y_test, y_pred, average='binary' if _WORKER['task'] == 'binary'
+                                         else 'macro')}
+    else:
+        test = _WORKER['folds'] == task['fold']
+        train = ~test
+        pipe.fit(X.iloc[train], y.iloc[train])
+        record['fit_time'] = time.perf_counter() - t0
+        record['score'] = float(scorer(pipe, X.iloc[test], y.iloc[test]))
+
+    task_dir = Path(task_dir)
+    if task['fold'] is None:
+        # Son modeller hızlı yüklenen biçimde (bkz. persist.load_pipeline)
+        save_pipeline(pipe, task_dir / task['id'])
+    else:
+        tmp = task_dir / f"{task['id']}.joblib.tmp{os.getpid()}"
+        joblib.dump(pipe, tmp)
+        os.replace(tmp, task_dir / f"{task['id']}.joblib")
+    if base_rss is not None:
+        # Kat kopyası, ön işleme ve model dahil görevin tepe bellek artışı
+        record['peak_bytes'] = _proc_status('VmHWM') - base_rss
+    # JSON en son yazılır: varlığı görevin tamamlandığı anlamına gelir
+    _write_json(task_dir / f"{task['id']}.json", record)
+    return record
+
+
+def _run_pool(tasks: list, task_dir: Path, payload: dict, workers: int, memory_gb: float | None = None,
+              peaks: dict | None = None, fallback: int = 0) -> list:
+    """Görevleri havuzda çalıştırır.
+
+    ``memory_gb`` verilirse eşzamanlı görevlerin ölçülen tepe bellekleri
+    toplamı bütçeyi aşmaz; grubu henüz ölçülmemiş görev tek başına çalışır
+    ve ölçümü ``peaks`` sözlüğüne eklenir.
+
+    Args:
+        tasks: Görevler
+        task_dir: Görev çıktı klasörü
+        payload: Süreç başlatma verisi
+        workers: Süreç sayısı
+        memory_gb: Bellek bütçesi (GB; ``None``: yalnızca süreç sayısı)
+        peaks: ``_memory_key`` -> ölçülen tepe bellek (bkz. ``task_peaks``)
+        fallback: Ölçüm yazmayan görevler için bellek
+
+    Returns:
+        list: Görev kayıtları
+    """
+    records = []
+    queue = list(tasks)
+    peaks = {} if peaks is None else peaks
+    budget = memory_gb * 2**30 if memory_gb else None
+
+    def need(task):
+        # Ölçülmemiş görev bütçenin tamamını tutar: ölçüm tek başına yapılır
+        return peaks.get(_memory_key(task), budget)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(payload,)) as pool:
+        running = {}
+        while queue or running:
+            while queue and len(running) < workers:
+                if budget is not None and running and \
+                        sum(map(need, running.values())) + need(queue[0]) > budget:
+                    break
+                task = queue.pop(0)
+                running[pool.submit(_run_task, task, str(task_dir))] = task
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                record = future.result()
+                key = _memory_key(task)
+                peaks[key] = max(peaks.get(key, 0), task_peaks([record], fallback)[key])
+                records.append(record)
+                value = record.get('score', record.get('test', {}).get('f1'))
+                print(f"[{len(records)}/{len(tasks)}] {task['id']}: {value:.4f} ({record['fit_time']:.1f}s)")
+    return records
+
+
+def _completed(task_dir: Path) -> dict:
+    out = {}
+    for path in task_dir.glob('*.json'):
+        with open(path) as f:
+            record = json.load(f)
+        out[record['id']] = record
+    return out
+
+
+def run(task: str, models=None, cv: int = 3, workers: int | None = None, memory_gb: float | None = None,
+        frac: float = 1.0, seed: int = 42, run_dir: str | Path | None = None,
+        data_dir: str | Path = DATA_DIR) -> pd.DataFrame:
+    """Eğitimi çalıştırır ya da yarıda kalan çalıştırmayı sürdürür.
+
+    Args:
+        task: ``'binary'`` ya da ``'multiclass'``
+        models: Eğitilecek modeller (varsayılan: gridlerdeki tümü)
+        cv: Kat sayısı
+        workers: Süreç sayısı (varsayılan: CPU sayısı)
+        memory_gb: Eşzamanlı görevler için bellek bütçesi (GB)
+        frac: Eğitim setinden kullanılacak örneklem oranı
+        seed: Örneklem ve kat tohumu
+        run_dir: Çalıştırma klasörü (varsayılan: ``runs/<task>``)
+        data_dir: ``TRAIN_FILE`` ve ``TEST_FILE`` dosyalarının klasörü
+
+    Returns:
+        pandas.DataFrame: Model başına en iyi parametreler, CV ve test skorları
+    """
+    run_dir = Path(run_dir or RUNS_DIR / task)
+    task_dir = run_dir / 'tasks'
+    task_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    # shared/ altındaki her şeyi belirleyen girdiler: veri dosyaları, örneklem ve katlar
+    data_dir = Path(data_dir)
+    config = {'task': task, 'cv': cv, 'frac': frac, 'seed': seed,
+              'data': source_key(data_dir / TRAIN_FILE), 'test': source_key(data_dir / TEST_FILE)}
+    config_path = run_dir / 'run.json'
+    if config_path.exists():
+        with open(config_path) as f:
+            previous = json.load(f)
+        if previous != config:
+            raise SystemExit(f"{run_dir} farklı ayarlarla başlatılmış ({previous}); "
+                             "yeni bir --run-dir verin ya da klasörü silin")
+    else:
+        _write_json(config_path, config)
+
+    X, y, X_test, y_test, num_cols, cat_cols = load_task_data(task, frac=frac, seed=seed, data_dir=data_dir)
+    grids = make_grids(task, num_cols, cat_cols)
+    models = list(models or grids)
+    folds = np.empty(len(X), dtype=np.int8)
+    for fold, (_, test) in enumerate(StratifiedKFold(n_splits=cv, shuffle=True, random_state=seed).split(X, y)):
+        folds[test] = fold
+    fallback = estimate_task_memory(X)
+    shared = share_data({'X': X, 'y': y, 'X_test': X_test, 'y_test': y_test}, folds, run_dir / 'shared')
+    payload = {'task': task, 'num_cols': num_cols, 'cat_cols': cat_cols, 'shared': shared}
+    budget = f', bellek bütçesi: {memory_gb} GB' if memory_gb else ''
+    print(f'Eğitim: {len(X):,} satır, {workers} süreç{budget}')
+
+    # 1) Çapraz doğrulama görevleri
+    tasks = plan_tasks(grids, models, cv)
+    done = _completed(task_dir)
+    # Önceki çalıştırmanın ölçümleri: sürdürülen çalıştırma yeniden ölçmez
+    peaks = task_peaks(done.values(), fallback)
+    pending = [t for t in tasks if t['id'] not in done]
+    if len(pending) < len(tasks):
+        print(f'{len(tasks) - len(pending)}/{len(tasks)} görev önceki çalıştırmadan alındı')
+    if pending:
+        _run_pool(pending, task_dir, payload, workers, memory_gb, peaks, fallback)
+    done = _completed(task_dir)
+
+    # 2) Model başına en iyi aday -> tüm eğitim setinde yeniden eğitim
+    cv_scores = pd.DataFrame([done[t['id']] for t in tasks])
+    best = {}
+    for model, group in cv_scores.groupby('model', sort=False):
+        means = group.groupby('candidate')['score'].mean()
+        cand = int(means.idxmax())
+        best[model] = {'id': f'{model}-refit', 'model': model, 'candidate': cand, 'fold': None,
+                       'params': group.loc[group['candidate'] == cand, 'params'].iloc[0],
+                       'cv_score': float(means.max())}
+    refits = [t for t in best.values() if t['id'] not in done]
+    if refits:
+        _run_pool(refits, task_dir, payload, workers, memory_gb, peaks, fallback)
+    done = _completed(task_dir)
+
+    rows = []
+    for model, info in best.items():
+        record = done[info['id']]
+        rows.append({'model': model, 'params': info['params'], 'cv_score': info['cv_score'],
+                     'test_f1': record['test']['f1'], 'test_accuracy': record['test']['accuracy'],
+                     'artefact': str(task_dir / info['id'])})
+    summary = pd.DataFrame(rows)
+    summary.to_json(run_dir / 'summary.json', orient='records', indent=2)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m src.train', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('task', choices=['binary', 'multiclass'])
+    parser.add_argument('--models', nargs='+', help='Eğitilecek modeller (ör. lr rf hgb)')
+    parser.add_argument('--cv', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--memory-gb', type=float, default=None, help='Eşzamanlı görevler için bellek bütçesi')
+    parser.add_argument('--frac', type=float, default=1.0, help='Eğitim setinden kullanılacak örneklem oranı')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--run-dir', default=None, help='Çalıştırma klasörü (varsayılan: runs/<görev>)')
+    parser.add_argument('--data-dir', default=str(DATA_DIR), help='Eğitim ve test dosyalarının klasörü')
+    args = parser.parse_args(argv)
+
+    summary = run(args.task, models=args.models, cv=args.cv, workers=args.workers, memory_gb=args.memory_gb,
+                  frac=args.frac, seed=args.seed, run_dir=args.run_dir, data_dir=args.data_dir)
+    print(summary.drop(columns='artefact').to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -5,34 +5,54 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 
 
-def zscore_outliers(df: pd.DataFrame, cols, threshold=3.0):
+def zscore_outliers(df: pd.DataFrame, cols, threshold=3.0, profile=None):
     """Z-score ile aykırı değerleri tespit eder.
     
     Args:
         df: Veri seti
         cols: İncelenecek kolonlar
         threshold: Z-score eşiği
+        profile: Önceden hesaplanmış ``stats.DatasetProfile``; verilirse
+            ortalama/standart sapma profilden okunur
         
     Returns:
         tuple: (aykırı_değerler, z_skorları)
     """
-    Z = (df[cols] - df[cols].mean())/df[cols].std(ddof=0)
+    if profile is not None:
+        mean, std = profile.mean[cols], profile.std[cols]
+    else:
+        mean, std = df[cols].mean(), df[cols].std(ddof=0)
+    Z = (df[cols] - mean)/std
     mask = (np.abs(Z) > threshold).any(axis=1)
     return df[mask], Z
 
 
-def boxplots(df: pd.DataFrame, cols, max_cols=6):
+def boxplots(df: pd.DataFrame, cols, max_cols=6, profile=None):
     """Seçilen kolonlar için boxplot çizer.
     
     Args:
         df: Veri seti
         cols: Çizilecek kolonlar
         max_cols: Maksimum kolon sayısı
+        profile: Önceden hesaplanmış ``stats.DatasetProfile``; verilirse
+            kutular veri taranmadan profilin kantil taslağından ve min/max
+            değerlerinden çizilir (yaklaşık; aykırı noktalar çizilmez)
     """
     cols = cols[:max_cols]
+    if profile is not None:
+        quartiles = profile.quantiles((0.25, 0.5, 0.75))
+        summary = profile.to_frame()
     for c in cols:
         plt.figure(figsize=(8, 6))
-        df.boxplot(column=c)
+        if profile is None:
+            df.boxplot(column=c)
+        else:
+            q1, med, q3 = quartiles.loc[c]
+            iqr = q3 - q1
+            plt.gca().bxp([{'label': c, 'q1': q1, 'med': med, 'q3': q3,
+                            'whislo': max(summary.loc[c, 'min'], q1 - 1.5 * iqr),
+                            'whishi': min(summary.loc[c, 'max'], q3 + 1.5 * iqr), 'fliers': []}],
+                          showfliers=False)
         plt.title(f"Boxplot: {c}")
         plt.show()
 
@@ -82,18 +102,23 @@ def plot_service_attack_ratio(df: pd.DataFrame, top_n=10):
     plt.show()
 
 
-def plot_correlation_heatmap(df: pd.DataFrame, figsize=(12, 10)):
+def plot_correlation_heatmap(df: pd.DataFrame, figsize=(12, 10), profile=None):
     """Sayısal değişkenler arası korelasyon ısı haritası çizer.
     
     Args:
         df: Veri seti
         figsize: Grafik boyutu
+        profile: Önceden hesaplanmış ``stats.DatasetProfile``; verilirse
+            korelasyon profilin satır örnekleminden (``sample``) hesaplanır
     """
-    # Sadece sayısal kolonları al
-    numeric_cols = df.select_dtypes(include=[np.number]).columns
+    if profile is not None:
+        numeric = profile.sample
+    else:
+        # Sadece sayısal kolonları al
+        numeric = df.select_dtypes(include=[np.number])
     
     plt.figure(figsize=figsize)
-    correlation_matrix = df[numeric_cols].corr()
+    correlation_matrix = numeric.corr()
     sns.heatmap(correlation_matrix, annot=False, cmap='coolwarm', center=0)
     plt.title('Sayısal Değişkenler Arası Korelasyon')
     plt.tight_layout()
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.cache import PredictionCache
+
+
+class CountingModel:
+    """Olasılığı satırdan türeten, modele giden satırları kaydeden sahte model."""
+    classes_ = np.array([0, 1])
+
+    def __init__(self):
+        self.calls = []
+
+    def predict_proba(self, X):
+        self.calls.append(X['a'].tolist())
+        p = (X['a'].to_numpy() % 10) / 10
+        return np.column_stack([1 - p, p])
+
+
+def _rows(*values):
+    return pd.DataFrame({'a': list(values), 'service': [f's{v % 3}' for v in values]})
+
+
+def test_hits_skip_model_and_match_uncached():
+    model = CountingModel()
+    cache = PredictionCache(model, maxsize=100)
+    X = _rows(1, 2, 1, 3, 2, 1)
+    np.testing.assert_array_equal(cache.predict_proba(X), CountingModel().predict_proba(X))
+    # Grup içi tekrarlar modele bir kez gider
+    assert sorted(model.calls[0]) == [1, 2, 3]
+    assert (cache.n_seen_, cache.n_hits_) == (6, 3)
+
+    np.testing.assert_array_equal(cache.predict(_rows(3, 4, 1)), [0, 0, 0])
+    assert model.calls[1] == [4]
+    assert cache.stats() == {'cache_size': 4, 'cache_seen': 9, 'cache_hits': 5,
+                             'cache_hit_rate': 5 / 9, 'cache_evicted': 0}
+
+
+def test_lru_eviction():
+    model = CountingModel()
+    cache = PredictionCache(model, maxsize=3)
+    cache.predict_proba(_rows(1, 2, 3))
+    cache.predict_proba(_rows(1))           # 1 yeniden kullanıldı: en eskisi artık 2
+    cache.predict_proba(_rows(4))
+    assert len(cache) == 3 and cache.n_evicted_ == 1
+    model.calls.clear()
+    cache.predict_proba(_rows(1, 3, 4))
+    assert model.calls == []
+    cache.predict_proba(_rows(2))
+    assert model.calls == [[2]]
+
+    # Sınırdan büyük grup: sonuç doğru, tablo sınırda kalır
+    X = _rows(*range(10, 30))
+    np.testing.assert_array_equal(cache.predict_proba(X), CountingModel().predict_proba(X))
+    assert len(cache) == 3 and len(cache._values) == 3
+    model.calls.clear()
+    cache.predict_proba(X)
+    assert len(model.calls[0]) == len(X) - 3
+
+    cache.clear()
+    assert len(cache) == 0 and cache.hit_rate_ == 0.0
+    with pytest.raises(ValueError):
+        PredictionCache(model, maxsize=0)
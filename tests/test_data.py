@@ -0,0 +1,92 @@
+import gzip
+
+import numpy as np
+import pandas as pd
+
+from src.data import KDD_DTYPES, apply_schema, load_kdd, load_kdd_iter, sample_kdd
+from src.preprocess import add_targets
+
+ROW = '0,tcp,http,SF,181,5450,0,0,0,0,0,1,0,0,0,0,0,0,0,0,0,0,8,8,0.00,0.00,0.00,0.00,1.00,0.00,0.00,9,9,1.00,0.00,0.11,0.00,0.00,0.00,0.00,0.00,normal.\n'
+VARIANTS = [
+    ('0,tcp,http,SF', 'normal.'),
+    ('0,icmp,ecr_i,SF', 'smurf.'),
+    ('0,tcp,private,S0', 'neptune.'),
+    ('0,tcp,telnet,RSTO', 'guess_passwd.'),
+    ('0,tcp,ftp_data,SF', 'buffer_overflow.'),
+    # Sözlükte olmayan servis ve etiket
+    ('0,udp,zz_new,SF', 'newattack.'),
+]
+
+
+def _write_kdd(path, n, seed):
+    rng = np.random.default_rng(seed)
+    lines = []
+    for i in rng.choice(len(VARIANTS), size=n, p=[0.45, 0.3, 0.15, 0.05, 0.03, 0.02]):
+        head, label = VARIANTS[i]
+        row = ROW.replace('0,tcp,http,SF', head, 1).replace('normal.', label)
+        row = row.replace('181,5450', f'{rng.integers(0, 70_000)},{rng.integers(0, 9000)}', 1)
+        lines.append(row.replace(',8,8,', f',{rng.integers(0, 512)},{rng.integers(0, 512)},', 1))
+    with gzip.open(path, 'wt') as f:
+        f.writelines(lines)
+    return path
+
+
+def test_typed_schema_round_trip(tmp_path):
+    path = _write_kdd(tmp_path / 'kdd.gz', 3000, seed=0)
+    raw = load_kdd(path, cache=False, typed=False)
+    typed = load_kdd(path, cache=False)
+
+    # Şemalı ayrıştırma, ham ayrıştırmaya sonradan şema uygulamakla aynı
+    pd.testing.assert_frame_equal(typed, apply_schema(raw))
+    for col, dtype in KDD_DTYPES.items():
+        assert typed[col].dtype == dtype or isinstance(dtype, pd.CategoricalDtype), col
+    # Bilinen değerlerin kodları sabit, görülmeyenler sözlüğün sonunda
+    service = typed['service'].cat.categories
+    assert list(service[:-1]) == list(KDD_DTYPES['service'].categories) and service[-1] == 'zz_new'
+    assert typed['label'].cat.categories[-1] == 'newattack.'
+
+    # Değerler kayıpsız: ham okumayla aynı
+    restored = typed.astype({c: raw[c].dtype for c in raw.columns})
+    pd.testing.assert_frame_equal(restored, raw)
+    assert typed.memory_usage(deep=True).sum() < raw.memory_usage(deep=True).sum() / 3
+
+    # Önbellekten okunan kopya da aynı
+    load_kdd(path, cache_dir=tmp_path / 'cache')
+    pd.testing.assert_frame_equal(load_kdd(path, cache_dir=tmp_path / 'cache'), typed)
+
+
+def test_load_kdd_iter_matches_load_kdd(tmp_path):
+    path = _write_kdd(tmp_path / 'kdd.gz', 2500, seed=1)
+    full = add_targets(load_kdd(path, cache=False))
+    chunks = list(load_kdd_iter(path, chunksize=700))
+    assert [len(c) for c in chunks] == [700, 700, 700, 400]
+    assert chunks[-1].index[0] == 2100
+
+    # Bilinen kategorilerin kodları parçalar arasında aynı
+    for chunk in chunks:
+        known = chunk['service'].cat.categories[:len(KDD_DTYPES['service'].categories)]
+        assert list(known) == list(KDD_DTYPES['service'].categories)
+    # Sona eklenen kategoriler parçaya göre değişebilir: değerler karşılaştırılır
+    stream = pd.concat(chunks)
+    cats = {c: object for c in full.columns if isinstance(full[c].dtype, pd.CategoricalDtype)}
+    pd.testing.assert_frame_equal(stream.astype(cats), full.astype(cats))
+
+
+def test_sample_kdd_keeps_rare_classes(tmp_path):
+    path = _write_kdd(tmp_path / 'kdd.gz', 6000, seed=2)
+    full = load_kdd(path, cache=False)
+    counts = full['label'].value_counts()
+    sample = sample_kdd(path, frac=0.05, min_per_class=40, chunksize=1000)
+
+    # Parça boyutundan bağımsız, dosya sırasında, satırlar kaynakla aynı
+    pd.testing.assert_frame_equal(sample_kdd(path, frac=0.05, min_per_class=40, chunksize=777), sample)
+    assert sample.index.is_monotonic_increasing and sample.index.is_unique
+    for col in ('src_bytes', 'count', 'service'):
+        np.testing.assert_array_equal(sample[col].to_numpy(), full[col].to_numpy()[sample.index])
+
+    got = sample['label'].value_counts()
+    for label, n in counts[counts > 0].items():
+        assert got[label] >= min(40, n), label
+    # Büyük sınıflar yaklaşık frac oranında
+    assert abs(got['normal.'] / counts['normal.'] - 0.05) < 0.02
+    assert len(sample) < 0.15 * len(full)
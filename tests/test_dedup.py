@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models import make_binary_pipelines, sample_weight_params
+from src.preprocess import WEIGHT_COL, deduplicate
+from src.store import MatrixStore
+
+
+def _frame(n_unique=150, seed=0):
+    rng = np.random.default_rng(seed)
+    base = pd.DataFrame({
+        'src_bytes': rng.exponential(1000, n_unique).round(-1),
+        'count': rng.integers(0, 20, n_unique).astype(np.float64),
+        'service': rng.choice(['smtp', 'http', 'ftp'], n_unique),
+        'flag': rng.choice(['SF', 'S0'], n_unique),
+    })
+    base['y'] = ((base['flag'] == 'S0') & (base['count'] > 5) | (rng.random(n_unique) < 0.15)).astype(int)
+    # Çarpık tekrar sayıları: sınıf oranları tekil ve tüm veride farklı
+    repeats = np.where(base['y'] == 1, rng.integers(1, 40, n_unique), rng.integers(1, 4, n_unique))
+    return base.loc[base.index.repeat(repeats)].sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def _fit(df, weights, store=None, naive=False):
+    X, y = df.drop(columns=['y', WEIGHT_COL], errors='ignore'), df['y'].to_numpy()
+    pipe = make_binary_pipelines(['src_bytes', 'count'], ['service', 'flag'], weighted=True, store=store)['lr'][0]
+    pipe.set_params(classifier__tol=1e-10)
+    if weights is None:
+        params = {}
+    elif naive:
+        params = {'classifier__sample_weight': weights}
+    else:
+        params = sample_weight_params(pipe, weights, y)
+    return pipe.fit(X, y, **params), X
+
+
+@pytest.mark.parametrize('stored', [False, True])
+def test_weighted_dedup_matches_full_training(stored, tmp_path):
+    full = _frame()
+    unique = deduplicate(full)
+    assert len(unique) < len(full) / 5
+
+    ref, X_full = _fit(full, None)
+    weights = unique[WEIGHT_COL].to_numpy()
+    dedup, _ = _fit(unique, weights, store=MatrixStore(tmp_path) if stored else None)
+
+    pre_ref, pre = ref[0], getattr(dedup[0], 'preprocessor_', dedup[0])
+    np.testing.assert_allclose(pre.named_transformers_['num']['scale'].scale_,
+                               pre_ref.named_transformers_['num']['scale'].scale_, rtol=1e-10)
+    np.testing.assert_allclose(dedup[-1].coef_, ref[-1].coef_, rtol=1e-4, atol=1e-5)
+    np.testing.assert_allclose(dedup.predict_proba(X_full), ref.predict_proba(X_full), atol=1e-5)
+
+    # Ağırlık yalnızca sınıflandırıcıya verilirse sonuç tüm veriyle eğitimden sapar
+    naive, _ = _fit(unique, weights, naive=True)
+    assert np.abs(naive.predict_proba(X_full) - ref.predict_proba(X_full)).max() > 1e-2
+
+
+def test_balanced_requires_labels():
+    pipe = make_binary_pipelines(['count'], ['flag'], weighted=True)['lr'][0]
+    with pytest.raises(ValueError):
+        sample_weight_params(pipe, np.ones(3))
@@ -0,0 +1,89 @@
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+from src.ensemble import CascadeClassifier, HierarchicalClassifier
+
+
+class CountingTree(DecisionTreeClassifier):
+    n_fits = 0
+
+    def fit(self, X, y, sample_weight=None, check_input=True):
+        type(self).n_fits += 1
+        return super().fit(X, y, sample_weight=sample_weight, check_input=check_input)
+
+
+def _data(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 4))
+    y = ((X[:, 0] + 0.5 * X[:, 1] ** 2 + rng.normal(scale=0.3, size=n)) > 0.5).astype(int)
+    return X, y
+
+
+def test_slow_model_fitted_once():
+    X, y = _data()
+    CountingTree.n_fits = 0
+    cascade = CascadeClassifier(LogisticRegression(), CountingTree(random_state=0), tolerance=0.01).fit(X, y)
+    assert CountingTree.n_fits == 1
+    low, high = cascade.band_
+    assert low <= 0.5 <= high
+
+
+def test_escalation_counters_only_in_predict():
+    X, y = _data()
+    cascade = CascadeClassifier(LogisticRegression(), DecisionTreeClassifier(random_state=0)).fit(X, y)
+    proba = cascade.predict_proba(X)
+    assert cascade.n_seen_ == 0 and cascade.n_escalated_ == 0
+    pred = cascade.predict(X)
+    np.testing.assert_array_equal(pred, cascade.classes_.take(proba.argmax(axis=1)))
+    assert cascade.n_seen_ == len(X)
+    assert cascade.n_escalated_ == int(cascade.escalate_mask(cascade.fast_.predict_proba(X)[:, 1]).sum())
+
+
+class CountingForest(RandomForestClassifier):
+    rows_seen = 0
+
+    def predict_proba(self, X):
+        type(self).rows_seen += len(X)
+        return super().predict_proba(X)
+
+
+def _families(n=3000, seed=0, rare=True):
+    rng = np.random.default_rng(seed)
+    labels = np.array(['normal', 'dos', 'probe'] + (['r2l', 'u2r'] if rare else []))
+    y = labels[rng.choice(len(labels), size=n, p=None if not rare else [0.4, 0.3, 0.2, 0.07, 0.03])]
+    centers = {c: rng.normal(scale=3, size=4) for c in labels}
+    X = np.stack([centers[c] for c in y]) + rng.normal(size=(n, 4))
+    return X, y
+
+
+def test_hierarchical_without_rare_rows():
+    X, y = _families(rare=False)
+    model = HierarchicalClassifier(LogisticRegression(), DecisionTreeClassifier(random_state=0),
+                                   rare=LogisticRegression()).fit(X, y)
+    assert model.rare_ is None
+    assert list(model.classes_) == ['normal', 'dos', 'probe']
+    np.testing.assert_allclose(model.predict_proba(X).sum(axis=1), 1.0)
+    assert set(model.predict(X)) <= set(model.classes_)
+
+
+def test_hierarchical_routes_only_rare_rows_to_specialist():
+    X, y = _families()
+    model = HierarchicalClassifier(LogisticRegression(), DecisionTreeClassifier(max_depth=4, random_state=0),
+                                   rare=CountingForest(20, random_state=0)).fit(X, y)
+    assert list(model.classes_) == ['normal', 'dos', 'probe', 'r2l', 'u2r']
+
+    CountingForest.rows_seen = 0
+    proba = model.predict_proba(X)
+    rare_col = list(model.family_.classes_).index('rare')
+    p_rare = model.family_.predict_proba(X)[:, rare_col]
+    assert 0 < CountingForest.rows_seen == int((p_rare > 0).sum()) < len(X)
+
+    # Tüm satırlarda uzman çalıştırılarak hesaplanan çarpımla aynı
+    p_attack = model.gate_.predict_proba(X)[:, 1]
+    specialist = RandomForestClassifier.predict_proba(model.rare_, X)
+    for k, family in enumerate(model.rare_.classes_):
+        j = list(model.classes_).index(family)
+        np.testing.assert_allclose(proba[:, j], p_attack * p_rare * specialist[:, k])
+    np.testing.assert_allclose(proba.sum(axis=1), 1.0)
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.features import FEATURE_COLS, TrafficFeatureExtractor, recompute_features
+
+
+def _conn(ts, dst='10.1.0.1', service='http', flag='SF', **extra):
+    return {'timestamp': ts, 'src_host': '10.0.0.1', 'dst_host': dst, 'service': service, 'flag': flag, **extra}
+
+
+def _stream(n, rate, seed, n_hosts=12):
+    """Zaman damgaları 1/512 s ızgarasında: aynı damgalı ve tam pencere sınırındaki bağlantılar dahil."""
+    rng = np.random.default_rng(seed)
+    ticks = np.cumsum(rng.poisson(512 / rate, size=n))
+    services = ['http', 'smtp', 'ftp_data', 'private', 'ecr_i']
+    flags = ['SF', 'S0', 'REJ', 'RSTO', 'S1', 'SH']
+    return [_conn(float(ticks[i] / 512), dst=f'10.1.0.{rng.integers(n_hosts)}',
+                  service=services[rng.integers(len(services))], flag=flags[rng.integers(len(flags))],
+                  src_port=int(rng.integers(1024, 1028)), dst_port=80, src_bytes=int(rng.integers(0, 5000)))
+            for i in range(n)]
+
+
+def test_reference_hand_checked():
+    conns = [_conn(0.0), _conn(1.0, flag='S0'), _conn(2.0, service='smtp'), _conn(2.5, dst='10.1.0.2', flag='REJ')]
+    ref = recompute_features(conns)
+    # Pencere sınırı dahil: 2.0 - 0.0 <= 2 s
+    assert ref['count'].tolist() == [1, 2, 3, 1]
+    assert ref['srv_count'].tolist() == [1, 2, 1, 2]   # 2.5 s: 1.0 s'deki http penceresinde
+    assert ref['serror_rate'].tolist() == pytest.approx([0.0, 0.5, 0.33, 0.0])
+    assert ref['same_srv_rate'].tolist() == pytest.approx([1.0, 1.0, 0.33, 1.0])
+    assert ref['rerror_rate'].tolist() == pytest.approx([0.0, 0.0, 0.0, 1.0])
+    assert ref['dst_host_count'].tolist() == [1, 2, 3, 1]
+    assert ref['land'].tolist() == [0, 0, 0, 0]
+    assert ref['protocol_type'].astype(str).tolist() == ['tcp'] * 4
+
+
+@pytest.mark.parametrize('rate,time_window,host_window', [(50, 2.0, 100), (800, 2.0, 100), (300, 0.5, 7)])
+def test_extractor_matches_reference(rate, time_window, host_window):
+    conns = _stream(3000, rate, seed=rate)
+    extractor = TrafficFeatureExtractor(time_window=time_window, host_window=host_window)
+    features = extractor.transform(conns)
+    reference = recompute_features(conns, time_window=time_window, host_window=host_window)
+    assert list(features.columns) == FEATURE_COLS
+    pd.testing.assert_frame_equal(features, reference)
+
+
+def test_extractor_rejects_out_of_order():
+    extractor = TrafficFeatureExtractor()
+    extractor.update(_conn(1.0))
+    with pytest.raises(ValueError):
+        extractor.update(_conn(0.5))
@@ -0,0 +1,74 @@
+import gzip
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import ingest
+from src.data import load_kdd
+
+ROW = '0,tcp,http,SF,181,5450,0,0,0,0,0,1,0,0,0,0,0,0,0,0,0,0,8,8,0.00,0.00,0.00,0.00,1.00,0.00,0.00,9,9,1.00,0.00,0.11,0.00,0.00,0.00,0.00,0.00,normal.\n'
+
+
+def _write(path, lines):
+    with gzip.open(path, 'wt') as f:
+        f.writelines(lines)
+    return path
+
+
+@pytest.mark.parametrize('gz,workers', [(True, 1), (True, 4), (False, 3)])
+def test_parallel_matches_pandas_ingest(tmp_path, gz, workers):
+    rng = np.random.default_rng(workers)
+    heads = [('0,tcp,http,SF', 'normal.'), ('0,icmp,ecr_i,SF', 'smurf.'), ('0,tcp,private,S0', 'neptune.'),
+             ('3,udp,zz_new,REJ', 'newattack.')]
+    lines = []
+    for i in rng.choice(len(heads), size=5000, p=[0.5, 0.3, 0.18, 0.02]):
+        head, label = heads[i]
+        row = ROW.replace('0,tcp,http,SF', head, 1).replace('normal.', label)
+        lines.append(row.replace('181,5450', f'{rng.integers(0, 10**6)},{rng.integers(0, 9000)}', 1))
+    if gz:
+        path = _write(tmp_path / 'kdd.gz', lines)
+    else:
+        path = tmp_path / 'kdd.data'
+        path.write_text(''.join(lines))
+
+    # Küçük bloklar: satırlar blok sınırlarında bölünür, kategoriler bloklara dağılır
+    parallel = ingest.read_kdd_parallel(path, gz=gz, workers=workers, block_size=8192)
+    reference = load_kdd(path, gz=gz, cache=False)
+    pd.testing.assert_frame_equal(parallel, reference)
+    pd.testing.assert_frame_equal(load_kdd(path, gz=gz, cache=False, engine='parallel'), reference)
+
+
+def test_out_of_range_ints_widen_like_pandas_path(tmp_path):
+    # Bloklar: önce şemaya sığan, sonra negatif ve uint32 sınırını aşan değerler
+    lines = [ROW] * 200 + [ROW.replace('0,tcp', '-5,tcp', 1)] + [ROW.replace('181', str(2**33), 1)] + [ROW] * 200
+    path = _write(tmp_path / 'kdd.gz', lines)
+    parallel = ingest.read_kdd_parallel(path, workers=2, block_size=4096)
+    reference = load_kdd(path, cache=False)
+    for col in ('duration', 'src_bytes'):
+        assert parallel[col].dtype.kind == reference[col].dtype.kind
+    pd.testing.assert_frame_equal(parallel, reference, check_dtype=False)
+    assert parallel['duration'].min() == -5
+    assert parallel['src_bytes'].max() == 2**33
+
+
+def test_parse_error_stops_producer(tmp_path, monkeypatch):
+    # Sıkıştırılmamış dosya: her 256 KB okuma ayrı bir blok olur
+    path = tmp_path / 'kdd.data'
+    path.write_text(ROW * 20_000)
+    calls = []
+
+    def failing(block):
+        calls.append(len(block))
+        if len(calls) == 2:
+            raise ValueError('bozuk blok')
+        return ingest._parse_block_pandas(block)
+
+    monkeypatch.setattr(ingest, '_block_parser', lambda: failing)
+    before = threading.active_count()
+    with pytest.raises(ValueError, match='bozuk blok'):
+        # Küçük bloklar ve tek işçi: kuyruk dolar, üretici put'ta bekler
+        ingest.read_kdd_parallel(path, gz=False, workers=1, block_size=1024)
+    assert threading.active_count() == before
+    assert len(calls) < 10
@@ -0,0 +1,55 @@
+import json
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from src.persist import FlatForest, load_pipeline, save_pipeline
+
+
+@pytest.fixture(scope='module')
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(2000, 6))
+    y = np.digitize(X[:, 0] + X[:, 1], [-1, 0, 1])
+    X_missing = X.copy()
+    X_missing[rng.random(X.shape) < 0.15] = np.nan
+    return X_missing, y
+
+
+@pytest.mark.parametrize('engine', ['sklearn', 'flat'])
+def test_roundtrip_matches_forest_with_missing_values(data, tmp_path, engine):
+    X, y = data
+    forest = RandomForestClassifier(20, class_weight='balanced', random_state=0).fit(X, y)
+    save_pipeline(forest, tmp_path / 'model')
+    loaded = load_pipeline(tmp_path / 'model', engine=engine)
+    assert isinstance(loaded, FlatForest if engine == 'flat' else RandomForestClassifier)
+    np.testing.assert_array_equal(loaded.predict_proba(X), forest.predict_proba(X))
+    # Kayıt orijinal ormanı değiştirmez
+    assert all(est.tree_ is not None for est in forest.estimators_)
+
+
+def test_save_overwrites_existing_folder(data, tmp_path):
+    X, y = data
+    path = tmp_path / 'model'
+    first = Pipeline([('scale', StandardScaler()), ('rf', RandomForestClassifier(5, random_state=0))]).fit(X, y)
+    second = Pipeline([('scale', StandardScaler()), ('rf', RandomForestClassifier(7, random_state=1))]).fit(X, y)
+    save_pipeline(first, path)
+    save_pipeline(second, path)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['model']
+    np.testing.assert_array_equal(load_pipeline(path).predict_proba(X), second.predict_proba(X))
+
+
+def test_sklearn_engine_rejects_other_sklearn_version(data, tmp_path):
+    X, y = data
+    forest = RandomForestClassifier(5, random_state=0).fit(X, y)
+    path = save_pipeline(forest, tmp_path / 'model')
+    meta = json.loads((path / 'meta.json').read_text())
+    meta['sklearn'] = '0.0.1'
+    (path / 'meta.json').write_text(json.dumps(meta))
+    with pytest.raises(RuntimeError, match='0.0.1'):
+        load_pipeline(path)
+    # Düz motor özel Tree durumuna dayanmaz
+    np.testing.assert_array_equal(load_pipeline(path, engine='flat').predict_proba(X), forest.predict_proba(X))
@@ -0,0 +1,164 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.base import clone
+
+from src.data import ATTACK_FAMILY, LABELS
+from src.models import (_make_hgb, make_binary_pipelines, make_binner, make_incremental_preprocessor,
+                        make_preprocessor)
+from src.preprocess import (ENCODER_BUFFER_ROWS, ENCODER_MAX_TABLES, IncrementalPreprocessor, add_targets,
+                            compile_preprocessor)
+
+
+def _frame(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'src_bytes': rng.integers(0, 10_000, n).astype(np.float64),
+        'count': rng.integers(0, 512, n).astype(np.float64),
+        # Parçalara yayılmış, sırasız gelen kategoriler
+        'service': rng.choice(['smtp', 'http', 'ftp', 'auth', 'ecr_i', 'private'], n),
+        'flag': rng.choice(['SF', 'S0', 'REJ', 'RSTO'], n),
+    })
+
+
+def _dense(Z):
+    return Z.toarray() if hasattr(Z, 'toarray') else np.asarray(Z)
+
+
+@pytest.mark.parametrize('order', [1, -1])
+def test_chunked_fit_matches_batch_preprocessor(order):
+    X = _frame()
+    num, cat = ['src_bytes', 'count'], ['service', 'flag']
+    # İlk parçalarda yalnızca bazı kategoriler görülür
+    X = X.sort_values('service', kind='stable').reset_index(drop=True)
+    chunks = [X.iloc[s:s + 500] for s in range(0, len(X), 500)][::order]
+
+    inc = make_incremental_preprocessor(num, cat)
+    for chunk in chunks:
+        inc.partial_fit(chunk)
+    ref = make_preprocessor(num, cat).fit(X)
+
+    assert list(inc.get_feature_names_out()) == list(ref.get_feature_names_out())
+    np.testing.assert_allclose(_dense(inc.transform(X)), _dense(ref.transform(X)), rtol=1e-12)
+
+
+def test_explicit_categories_keep_given_order():
+    X = _frame()
+    inc = IncrementalPreprocessor([], ['flag'], categories={'flag': ['SF', 'REJ']})
+    for s in range(0, len(X), 500):
+        inc.partial_fit(X.iloc[s:s + 500])
+    assert inc.categories_['flag'] == ['SF', 'REJ', 'RSTO', 'S0']
+
+    # Bilinmeyen kategori: one-hot satırı boş
+    Z = _dense(inc.transform(X.iloc[:3].assign(flag=['SF', 'XX', 'S0'])))
+    np.testing.assert_array_equal(Z, [[1, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 1]])
+
+
+def test_compiled_encoder_clone_and_buffer_cap():
+    X = _frame(3 * ENCODER_BUFFER_ROWS)
+    pre = make_preprocessor(['src_bytes', 'count'], ['service', 'flag']).fit(X)
+    encoder = compile_preprocessor(pre)
+    reference = _dense(pre.transform(X))
+
+    # Parametreler planın kendisidir: klon eğitilmemiş gelir, fit aynı planı kurar
+    copy = clone(encoder)
+    assert not hasattr(copy, 'lookup_')
+    assert copy.get_params().keys() == encoder.get_params().keys()
+    np.testing.assert_array_equal(copy.fit().transform(X), reference)
+
+    # Varsayılan çağrı yeni dizi döndürür; reuse=True tamponu kullanır, büyük grup tamponu büyütmez
+    small = encoder.transform(X.iloc[:3])
+    reused = encoder.transform(X.iloc[3:6], reuse=True)
+    assert np.shares_memory(reused, encoder._buffer) and not np.shares_memory(small, encoder._buffer)
+    big = encoder.transform(X, reuse=True)
+    np.testing.assert_array_equal(big, reference)
+    assert len(encoder._buffer) <= ENCODER_BUFFER_ROWS
+    assert not np.shares_memory(big, encoder._buffer)
+    np.testing.assert_array_equal(small, reference[:3])
+
+
+def test_compiled_encoder_threads_and_table_bound():
+    X = _frame(2000)
+    pre = make_preprocessor(['src_bytes', 'count'], ['service', 'flag']).fit(X)
+    encoder = compile_preprocessor(pre)
+    parts = [X.iloc[s:s + 50] for s in range(0, len(X), 50)]
+    expected = [_dense(pre.transform(part)) for part in parts]
+    # Eşzamanlı çağıranlar birbirinin sonucunu görmez
+    with ThreadPoolExecutor(4) as pool:
+        for _ in range(5):
+            results = list(pool.map(encoder.transform, parts))
+            for got, want in zip(results, expected):
+                np.testing.assert_array_equal(got, want)
+
+    # Her çağrıda farklı kategori listesi: tablo önbelleği sınırlı kalır
+    for i in range(3 * ENCODER_MAX_TABLES):
+        frame = X.iloc[:10].astype({'service': pd.CategoricalDtype(sorted(set(X['service'])) + [f'x{i}'])})
+        encoder.transform(frame)
+        assert len(encoder._tables) <= ENCODER_MAX_TABLES
+
+
+@pytest.mark.parametrize('categorical', [True, False])
+@pytest.mark.parametrize('fill_normal', [True, False])
+def test_add_targets_matches_label_mapping(categorical, fill_normal):
+    rng = np.random.default_rng(0)
+    labels = pd.Series(rng.choice(['normal.', 'smurf.', 'neptune.', 'satan.', 'guess_passwd.', 'rootkit.',
+                                   'newattack.'], 500))
+    labels[::50] = None
+    df = pd.DataFrame({'count': np.arange(500), 'label': labels})
+    if categorical:
+        df['label'] = df['label'].astype(pd.CategoricalDtype(LABELS + ['newattack.']))
+
+    out = add_targets(df, fill_normal=fill_normal)
+    assert 'y_binary' not in df
+    # Satır bazlı başvuru eşlemesi
+    raw = [None if pd.isna(v) else v for v in labels]
+    is_normal = np.array([v == 'normal.' for v in raw])
+    family = [('normal' if fill_normal else None) if v == 'normal.' else ATTACK_FAMILY.get(v) for v in raw]
+    np.testing.assert_array_equal(out['y_binary'].to_numpy(), (~is_normal).astype(np.uint8))
+    assert out['y_binary'].dtype == np.uint8
+
+    def values(col):
+        return [None if pd.isna(v) else v for v in out[col]]
+
+    assert values('y_family') == family
+    assert values('attack_name') == [None if n else v for v, n in zip(raw, is_normal)]
+
+    add_targets(df, inplace=True)
+    assert 'y_family' in df
+
+
+def test_binner_matches_hgb_own_binning():
+    rng = np.random.default_rng(0)
+    n = 3000
+    X = pd.DataFrame({
+        # 255'ten az farklı değer: HGB kutuları yeniden hesaplamaz
+        'src_bytes': rng.integers(0, 100, n).astype(np.float64),
+        'count': rng.integers(0, 200, n).astype(np.float64),
+        'service': rng.choice(['smtp', 'http', 'ftp', 'private'], n),
+        'flag': rng.choice(['SF', 'S0', 'REJ'], n),
+    })
+    y = (((X['flag'] == 'S0') & (X['count'] > 80)) | (X['src_bytes'] < 10)).astype(int).to_numpy()
+    num, cat = ['src_bytes', 'count'], ['service', 'flag']
+    binner = make_binner(num, cat).fit(X)
+    Z = binner.transform(X)
+    assert Z.dtype == np.uint8 and list(binner.categorical_mask_) == [False, False, True, True]
+
+    # Kutulanmış girdi ile ham sayısal girdi aynı modeli verir
+    raw = np.column_stack([X[num].to_numpy(), Z[:, 2:]])
+    binned = _make_hgb(num, cat).fit(Z, y)
+    reference = _make_hgb(num, cat).fit(raw, y)
+    np.testing.assert_array_equal(binned.predict_proba(Z), reference.predict_proba(raw))
+
+    # Görülmeyen kategori ayrılmış son koda gider; çok farklı değerli kolon max_bins kutuya iner
+    unseen = binner.transform(X.iloc[:2].assign(service=['zz_new', 'http']))
+    assert unseen[0, 2] == len(binner.categories_['service'])
+    assert unseen[1, 2] == binner.categories_['service'].index('http')
+    wide = make_binner(['src_bytes'], []).set_params(max_bins=16).fit(X.assign(src_bytes=rng.exponential(1000, n)))
+    assert len(wide.bin_thresholds_['src_bytes']) <= 15
+
+    # 'hgb' pipeline'ı: kutulayıcı + aynı sınıflandırıcı
+    pipe, _ = make_binary_pipelines(num, cat)['hgb']
+    balanced = _make_hgb(num, cat, class_weight='balanced').fit(Z, y)
+    np.testing.assert_array_equal(pipe.fit(X, y).predict_proba(X), balanced.predict_proba(Z))
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.sampling import FastSMOTENC
+
+
+def _frame(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    y = pd.Series(rng.choice(['normal', 'dos', 'probe'], size=n, p=[0.8, 0.15, 0.05]), name='y',
+                  index=np.arange(n) * 3 + 7)
+    X = pd.DataFrame({
+        'duration': rng.integers(0, 200, n).astype(np.uint8),
+        'src_bytes': rng.integers(0, 10**6, n).astype(np.int32),
+        'rate': rng.random(n).astype(np.float32),
+        'service': pd.Categorical(rng.choice(['http', 'smtp', 'ftp'], n)),
+        'flag': rng.choice(['SF', 'S0', 'REJ'], n).astype(object),
+    }, index=y.index)
+    return X, y
+
+
+def test_auto_balances_classes_and_caps_ratio():
+    X, y = _frame()
+    X_res, y_res = FastSMOTENC(categorical_features=['service', 'flag'], random_state=0).fit_resample(X, y)
+    counts = y_res.value_counts()
+    assert (counts == counts['normal']).all()
+    assert counts['normal'] == (y == 'normal').sum()
+
+    capped = FastSMOTENC(categorical_features=['service', 'flag'], max_ratio=2, random_state=0)
+    counts = capped.fit_resample(X, y)[1].value_counts()
+    assert counts['probe'] == 2 * (y == 'probe').sum()
+
+
+def test_preserves_schema_and_original_rows():
+    X, y = _frame()
+    X_res, y_res = FastSMOTENC(categorical_features=['service', 'flag'], random_state=0).fit_resample(X, y)
+    assert (X_res.dtypes == X.dtypes).all()
+    assert X_res['service'].cat.categories.equals(X['service'].cat.categories)
+    assert set(X_res['flag']) <= set(X['flag'])
+    assert X_res.index.equals(pd.RangeIndex(len(X_res))) and y_res.index.equals(X_res.index)
+    pd.testing.assert_frame_equal(X_res.iloc[:len(X)], X.reset_index(drop=True))
+
+
+def test_no_generation_keeps_index_aligned():
+    X, y = _frame()
+    X_res, y_res = FastSMOTENC(max_ratio=1, random_state=0).fit_resample(X, y)
+    assert len(X_res) == len(X)
+    assert X_res.index.equals(y_res.index)
+
+
+def test_missing_category_is_its_own_level():
+    X, y = _frame()
+    dos = np.flatnonzero(y == 'dos')
+    # dos satırlarının yarısında eksik servis; eksik en yüksek kodlu kategoriyle karışmamalı
+    service = X['service'].copy()
+    service.iloc[dos[::2]] = np.nan
+    X['service'] = service
+    X_res, y_res = FastSMOTENC(categorical_features=['service', 'flag'], random_state=0).fit_resample(X, y)
+    new = X_res['service'].iloc[len(X):][(y_res.iloc[len(X):] == 'dos').to_numpy()]
+    assert new.isna().any() and new.notna().any()
+    assert set(new.dropna()) <= set(X['service'].cat.categories)
+
+
+def test_float_strategy_requires_binary():
+    X, y = _frame()
+    with pytest.raises(ValueError):
+        FastSMOTENC(sampling_strategy=0.5).fit_resample(X, y)
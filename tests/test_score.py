@@ -0,0 +1,62 @@
+import gzip
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import score
+from src.data import load_kdd
+from src.models import make_binary_pipelines
+from src.persist import save_pipeline
+from src.preprocess import add_targets, split_features
+
+ROW = '0,tcp,http,SF,181,5450,0,0,0,0,0,1,0,0,0,0,0,0,0,0,0,0,8,8,0.00,0.00,0.00,0.00,1.00,0.00,0.00,9,9,1.00,0.00,0.11,0.00,0.00,0.00,0.00,0.00,normal.\n'
+VARIANTS = [('0,tcp,http,SF', 'normal.'), ('0,icmp,ecr_i,SF', 'smurf.'), ('0,tcp,private,S0', 'neptune.'),
+            ('0,tcp,telnet,RSTO', 'guess_passwd.')]
+
+
+@pytest.fixture(scope='module')
+def models(tmp_path_factory):
+    root = tmp_path_factory.mktemp('score')
+    rng = np.random.default_rng(0)
+    lines = []
+    # Az sayıda farklı kayıt: tekrarlar önbellekten gelir
+    for i in rng.choice(len(VARIANTS), size=1500, p=[0.5, 0.25, 0.2, 0.05]):
+        head, label = VARIANTS[i]
+        row = ROW.replace('0,tcp,http,SF', head, 1).replace('normal.', label)
+        lines.append(row.replace('181,5450', f'{rng.choice([0, 181, 520, 1032])},{rng.integers(0, 3) * 100}', 1))
+    with gzip.open(root / 'kdd.gz', 'wt') as f:
+        f.writelines(lines)
+
+    X, y_bin, y_family, num, cat = split_features(add_targets(load_kdd(root / 'kdd.gz', cache=False),
+                                                              fill_normal=True))
+    pipe, _ = make_binary_pipelines(num, cat, weighted=True)['rf']
+    binary = pipe.set_params(classifier__n_estimators=10, classifier__random_state=0).fit(X, y_bin)
+    save_pipeline(binary, root / 'binary')
+    family_pipe, _ = make_binary_pipelines(num, cat, weighted=True)['lr']
+    family = family_pipe.fit(X, y_family.astype(str))
+    joblib.dump(family, root / 'family.joblib')
+    return root, X, binary, family
+
+
+@pytest.mark.parametrize('suffix', ['.csv', '.parquet'])
+def test_score_cli_writes_ordered_predictions(models, tmp_path, suffix, capsys):
+    if suffix == '.parquet':
+        pytest.importorskip('pyarrow')
+    root, X, binary, family = models
+    output = tmp_path / f'preds{suffix}'
+    score.main(['--model', str(root / 'binary'), '--family-model', str(root / 'family.joblib'),
+                '--input', str(root / 'kdd.gz'), '--output', str(output),
+                '--workers', '2', '--chunksize', '200', '--cache-size', '64'])
+
+    preds = pd.read_parquet(output) if suffix == '.parquet' else pd.read_csv(output)
+    assert list(preds.columns) == ['row', 'prediction', 'proba_0', 'proba_1', 'family', 'family_proba']
+    # Tüm satırlar, girdi sırasında ve bellekteki modelle aynı tahminler
+    np.testing.assert_array_equal(preds['row'], np.arange(len(X)))
+    np.testing.assert_array_equal(preds['prediction'], binary.predict(X))
+    np.testing.assert_allclose(preds['proba_1'], binary.predict_proba(X)[:, 1], rtol=1e-6)
+    np.testing.assert_array_equal(preds['family'].astype(str), family.predict(X))
+
+    out = capsys.readouterr().out
+    assert f'{len(X):,} satır' in out and 'hit_rate' in out
@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import GridSearchCV, StratifiedKFold
+
+from src.models import make_binary_pipelines
+from src.search import FoldCachedSearchCV, HalvingSearchCV
+
+
+@pytest.fixture(scope='module')
+def data():
+    rng = np.random.default_rng(0)
+    n = 900
+    X = pd.DataFrame({
+        'src_bytes': rng.exponential(1000, n),
+        'count': rng.integers(0, 512, n).astype(np.float64),
+        'service': rng.choice(['smtp', 'http', 'ftp', 'private'], n),
+        'flag': rng.choice(['SF', 'S0', 'REJ'], n),
+    })
+    noise = rng.random(n) < 0.1
+    y = (((X['flag'] == 'S0') & (X['count'] > 200)) ^ noise).astype(int).to_numpy()
+    return X, y, ['src_bytes', 'count'], ['service', 'flag']
+
+
+def _assert_same_search(ours, reference):
+    assert ours.cv_results_['params'] == reference.cv_results_['params']
+    for key in ('mean_test_score', 'split0_test_score', 'split1_test_score', 'split2_test_score'):
+        np.testing.assert_allclose(ours.cv_results_[key], reference.cv_results_[key], err_msg=key)
+    assert ours.best_params_ == reference.best_params_
+
+
+def test_fold_cached_search_matches_grid_search(data):
+    X, y, num, cat = data
+    pipe, _ = make_binary_pipelines(num, cat)['lr']
+    pipe.set_params(smote__random_state=0)
+    # Ön adım parametresi iki grup oluşturur, her grupta iki sınıflandırıcı adayı
+    grid = {'smote__k_neighbors': [3, 5], 'classifier__C': [0.01, 1]}
+    cv = StratifiedKFold(3, shuffle=True, random_state=0)
+
+    ours = FoldCachedSearchCV(pipe, grid, scoring='f1', cv=cv).fit(X, y)
+    reference = GridSearchCV(pipe, grid, scoring='f1', cv=cv).fit(X, y)
+    _assert_same_search(ours, reference)
+    np.testing.assert_allclose(ours.predict_proba(X), reference.predict_proba(X))
+    assert {'preprocessor', 'smote', 'classifier (fit)'} <= set(ours.timing_report().index)
+
+
+def test_fold_cached_search_slices_sample_weight(data):
+    X, y, num, cat = data
+    pipe, _ = make_binary_pipelines(num, cat, weighted=True)['lr']
+    weights = np.random.default_rng(1).integers(1, 5, len(y)).astype(float)
+    grid = {'classifier__C': [0.01, 1]}
+    cv = StratifiedKFold(3, shuffle=True, random_state=0)
+
+    ours = FoldCachedSearchCV(pipe, grid, scoring='f1', cv=cv).fit(X, y, classifier__sample_weight=weights)
+    reference = GridSearchCV(pipe, grid, scoring='f1', cv=cv).fit(X, y, classifier__sample_weight=weights)
+    _assert_same_search(ours, reference)
+
+
+
+class CountingForest(RandomForestClassifier):
+    trees_built = 0
+
+    def fit(self, X, y, sample_weight=None):
+        before = len(getattr(self, 'estimators_', [])) if self.warm_start else 0
+        super().fit(X, y, sample_weight=sample_weight)
+        type(self).trees_built += len(self.estimators_) - before
+        return self
+
+
+@pytest.mark.parametrize('warm_start', [True, False])
+def test_warm_start_forest_matches_grid_search(data, warm_start):
+    X, y, num, cat = data
+    pipe, _ = make_binary_pipelines(num, cat, weighted=True)['rf']
+    pipe.set_params(classifier=CountingForest(class_weight='balanced', random_state=0))
+    grid = {'classifier__n_estimators': [5, 10, 20], 'classifier__max_depth': [3, None]}
+    cv = StratifiedKFold(3, shuffle=True, random_state=0)
+
+    CountingForest.trees_built = 0
+    ours = FoldCachedSearchCV(pipe, grid, scoring='f1', cv=cv, refit=False, warm_start=warm_start).fit(X, y)
+    # Zincir başına en büyük orman bir kez büyütülür: kat başına 2 x 20 ağaç
+    assert CountingForest.trees_built == 3 * (2 * 20 if warm_start else 2 * (5 + 10 + 20))
+    reference = GridSearchCV(pipe, grid, scoring='f1', cv=cv).fit(X, y)
+    _assert_same_search(ours, reference)
+
+def test_halving_search_by_samples(data):
+    X, y, num, cat = data
+    pipe, _ = make_binary_pipelines(num, cat, weighted=True)['lr']
+    grid = {'classifier__C': [0.001, 0.01, 0.1, 1, 10, 100, 1000, 1e4, 1e5]}
+    cv = StratifiedKFold(3, shuffle=True, random_state=0)
+    search = HalvingSearchCV(pipe, grid, factor=3, scoring='f1', cv=cv).fit(X, y)
+
+    # 9 aday -> 3 aday; son tur tüm satırlarla
+    assert search.n_resources_ == [len(y) // 3, len(y)]
+    assert list(np.bincount(search.history_['iter'])) == [9, 3]
+    first = search.history_['mean_test_score'][:9]
+    survivors = [search.history_['params'][i] for i in np.argsort(-first, kind='stable')[:3]]
+    assert search.cv_results_['params'] == survivors
+
+    # Son tur, hayatta kalanlar üzerinde tam veriyle yapılan aramayla aynı
+    reference = GridSearchCV(pipe, [{k: [v] for k, v in p.items()} for p in survivors],
+                             scoring='f1', cv=cv).fit(X, y)
+    np.testing.assert_allclose(search.cv_results_['mean_test_score'], reference.cv_results_['mean_test_score'])
+    assert search.best_params_ == reference.best_params_
+
+
+def test_halving_search_by_n_estimators(data):
+    X, y, num, cat = data
+    pipe, _ = make_binary_pipelines(num, cat, weighted=True)['rf']
+    pipe.set_params(classifier__random_state=0)
+    grid = {'classifier__n_estimators': [5, 15, 45], 'classifier__max_depth': [2, 4, 8, None],
+            'classifier__min_samples_leaf': [1, 5]}
+    cv = StratifiedKFold(3, shuffle=True, random_state=0)
+    search = HalvingSearchCV(pipe, grid, factor=3, resource='classifier__n_estimators',
+                             scoring='f1', cv=cv).fit(X, y)
+
+    # Kaynak gridden çıkarılır: 8 aday -> 3 aday, ağaç sayısı 15 -> 45
+    assert search.n_resources_ == [15, 45]
+    assert list(np.bincount(search.history_['iter'])) == [8, 3]
+    assert all(p['classifier__n_estimators'] == 45 for p in search.cv_results_['params'])
+    reference = GridSearchCV(pipe, [{k: [v] for k, v in p.items()} for p in search.cv_results_['params']],
+                             scoring='f1', cv=cv).fit(X, y)
+    np.testing.assert_allclose(search.cv_results_['mean_test_score'], reference.cv_results_['mean_test_score'])
+    assert search.best_estimator_.get_params()['classifier__n_estimators'] == 45
@@ -0,0 +1,71 @@
+import asyncio
+import gzip
+
+import numpy as np
+import pytest
+
+from src.data import load_kdd
+from src.models import make_binary_pipelines
+from src.preprocess import add_targets, split_features
+from src.score import score_frame
+from src.serve import MicroBatcher, _reply, records_frame
+
+ROW = '0,tcp,http,SF,181,5450,0,0,0,0,0,1,0,0,0,0,0,0,0,0,0,0,8,8,0.00,0.00,0.00,0.00,1.00,0.00,0.00,9,9,1.00,0.00,0.11,0.00,0.00,0.00,0.00,0.00,normal.\n'
+
+
+@pytest.fixture(scope='module')
+def fitted(tmp_path_factory):
+    path = tmp_path_factory.mktemp('serve') / 'kdd.gz'
+    rng = np.random.default_rng(0)
+    lines = []
+    for _ in range(600):
+        row = ROW.replace('181,5450', f'{rng.integers(100, 400)},{rng.integers(0, 9000)}', 1)
+        if rng.random() < 0.4:
+            row = row.replace('0,tcp,http,SF', '0,icmp,ecr_i,SF', 1).replace('normal.', 'smurf.')
+        lines.append(row)
+    with gzip.open(path, 'wt') as f:
+        f.writelines(lines)
+    X, y, _, num, cat = split_features(add_targets(load_kdd(path, cache=False)))
+    pipe, _ = make_binary_pipelines(num, cat, weighted=True)['lr']
+    return pipe.fit(X, y), X
+
+
+class CountingBatcher(MicroBatcher):
+    fallbacks = 0
+
+    def _score_each(self, records):
+        type(self).fallbacks += 1
+        return super()._score_each(records)
+
+
+def test_bad_record_is_isolated_from_its_batch(fitted):
+    model, X = fitted
+    records = [{k: (v.item() if hasattr(v, 'item') else v) for k, v in r.items()}
+               for r in X.iloc[:8].astype(object).to_dict('records')]
+    bad = {**records[3], 'src_bytes': 'abc'}
+    expected = score_frame(model, records_frame(records, list(X.columns))).to_dict('records')
+
+    async def run():
+        batcher = CountingBatcher(model, max_batch=8, max_wait_ms=200)
+        await batcher.start()
+        try:
+            # Tek grup: 7 geçerli kayıt + 1 hatalı kayıt; ardından temiz bir grup
+            first = await asyncio.gather(*(batcher.submit(bad if i == 3 else r) for i, r in enumerate(records)),
+                                         return_exceptions=True)
+            second = await asyncio.gather(*(batcher.submit(r) for r in records))
+            missing = await _reply(batcher, b'{"id": 7, "src_bytes": 1}')
+            return first, second, missing, batcher.snapshot()
+        finally:
+            await batcher.stop()
+
+    CountingBatcher.fallbacks = 0
+    first, second, missing, stats = asyncio.run(run())
+    assert isinstance(first[3], ValueError)
+    for i, result in enumerate(first):
+        if i != 3:
+            assert result == pytest.approx(expected[i])
+    assert second == [pytest.approx(e) for e in expected]
+    # Yalnızca hatalı grup tek tek skorlanır; eksik özellik kuyruğa girmeden reddedilir
+    assert CountingBatcher.fallbacks == 1
+    assert missing['id'] == 7 and 'Eksik özellik' in missing['error']
+    assert stats['requests'] == 16 and stats['batches'] == 2 and stats['errors'] == 1
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.stats import EXACT_DISTINCT_LIMIT, DatasetProfile
+
+
+def _values(n, seed=0):
+    return np.random.default_rng(seed).permutation(n).astype(np.float64) * 0.5
+
+
+@pytest.mark.parametrize('chunks', [
+    # Aynı değerler iki kez: ikinci parça hiçbir yeni değer getirmez
+    [slice(0, 300_000), slice(0, 300_000)],
+    # Sınır ilk parçadan sonra aşılır, ikinci parça ilkini kapsar
+    [slice(0, 150_000), slice(0, 300_000)],
+    # Sınır birkaç parça boyunca kademeli aşılır
+    [slice(0, 60_000), slice(40_000, 120_000), slice(100_000, 250_000), slice(0, 250_000)],
+])
+def test_distinct_estimate_across_exact_limit(chunks):
+    values = _values(300_000)
+    profile = DatasetProfile(sketch_size=0)
+    seen = []
+    for part in chunks:
+        frame = pd.DataFrame({'x': values[part], 's': values[part].astype(str)})
+        profile.update(frame)
+        seen.append(frame)
+    expected = pd.concat(seen).nunique()
+    assert expected['x'] > EXACT_DISTINCT_LIMIT
+    estimate = profile.distinct
+    for col in ('x', 's'):
+        assert abs(estimate[col] - expected[col]) / expected[col] < 0.05
+
+
+def test_distinct_exact_below_limit():
+    values = _values(1000)
+    profile = DatasetProfile(sketch_size=0).update(pd.DataFrame({'x': values[:600]}))
+    profile.update(pd.DataFrame({'x': values[400:]}))
+    assert profile.distinct['x'] == 1000
+
+
+def test_constant_dropper_ignores_whole_file_profile_in_folds():
+    from src.preprocess import ConstantDropper
+    # 'rare' yalnızca son satırlarda değişir: eğitim katında sabittir
+    df = pd.DataFrame({'x': np.arange(100.0), 'rare': np.r_[np.zeros(90), np.ones(10)]})
+    profile = DatasetProfile.from_frame(df)
+    assert ConstantDropper(profile).fit(df).keep_cols_ == ['x', 'rare']
+    assert ConstantDropper(profile).fit(df.iloc[:80]).keep_cols_ == ['x']
@@ -0,0 +1,64 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.model_selection import GridSearchCV, StratifiedKFold
+
+from src.models import compile_pipeline, make_binary_pipelines
+from src.persist import save_pipeline
+from src.score import load_model
+from src.store import MatrixStore
+
+
+@pytest.fixture(scope='module')
+def data():
+    rng = np.random.default_rng(0)
+    n = 1200
+    X = pd.DataFrame({
+        'src_bytes': rng.exponential(1000, n),
+        'count': rng.integers(0, 512, n).astype(np.float64),
+        'service': rng.choice(['smtp', 'http', 'ftp', 'private'], n),
+        'flag': rng.choice(['SF', 'S0', 'REJ'], n),
+    })
+    y = ((X['flag'] == 'S0') | (X['count'] > 400)).astype(int).to_numpy()
+    return X, y, ['src_bytes', 'count'], ['service', 'flag']
+
+
+def test_stored_preprocessor_fits_per_fold(data, tmp_path):
+    X, y, num, cat = data
+    cv = StratifiedKFold(3, shuffle=True, random_state=0)
+    store = MatrixStore(tmp_path)
+    pipe, grid = make_binary_pipelines(num, cat, weighted=True, store=store)['lr']
+    cached = GridSearchCV(pipe, grid, cv=cv, scoring='f1').fit(X, y)
+    plain_pipe, _ = make_binary_pipelines(num, cat, weighted=True)['lr']
+    plain = GridSearchCV(plain_pipe, grid, cv=cv, scoring='f1').fit(X, y)
+
+    # Kat başına bir eğitim matrisi (adaylar paylaşır) + tüm veride son eğitim
+    fitted = [p for p in tmp_path.iterdir() if p.name.startswith('fit-')]
+    assert len(fitted) == cv.get_n_splits() + 1
+    np.testing.assert_allclose(cached.cv_results_['mean_test_score'], plain.cv_results_['mean_test_score'])
+
+
+def test_precomputed_warns(data):
+    _, _, num, cat = data
+    with pytest.warns(UserWarning, match='precomputed=True'):
+        make_binary_pipelines(num, cat, precomputed=True)
+
+
+def test_inference_writes_no_matrices(data, tmp_path):
+    X, y, num, cat = data
+    store = MatrixStore(tmp_path / 'store')
+    pipe, grid = make_binary_pipelines(num, cat, weighted=True, store=store)['rf']
+    best = GridSearchCV(pipe.set_params(classifier__n_estimators=10), {'classifier__max_depth': [None, 5]},
+                        cv=3).fit(X, y).best_estimator_
+    expected = best.predict_proba(X)
+    before = sorted(p.name for p in store.root.iterdir())
+
+    save_pipeline(best, tmp_path / 'model')
+    joblib.dump(best, tmp_path / 'model.joblib')
+    # Kayıtlı, derlenmiş ve joblib modelleri; farklı parçalarla tekrar tekrar çıkarım
+    for model in (load_model(tmp_path / 'model'), load_model(tmp_path / 'model.joblib'), compile_pipeline(best)):
+        for start in range(0, len(X), 400):
+            np.testing.assert_array_equal(model.predict_proba(X.iloc[start:start + 400]),
+                                          expected[start:start + 400])
+    assert sorted(p.name for p in store.root.iterdir()) == before
@@ -0,0 +1,68 @@
+import gzip
+import json
+
+import numpy as np
+import pytest
+
+from src import train
+from src.train import make_grids, task_peaks
+
+ROW = '0,tcp,http,SF,181,5450,0,0,0,0,0,1,0,0,0,0,0,0,0,0,0,0,8,8,0.00,0.00,0.00,0.00,1.00,0.00,0.00,9,9,1.00,0.00,0.11,0.00,0.00,0.00,0.00,0.00,normal.\n'
+
+
+def _write_kdd(path, n, seed):
+    rng = np.random.default_rng(seed)
+    lines = []
+    for _ in range(n):
+        row = ROW.replace('181,5450', f'{rng.integers(100, 400)},{rng.integers(0, 9000)}', 1)
+        if rng.random() < 0.4:
+            row = row.replace('0,tcp,http,SF', '0,icmp,ecr_i,SF', 1).replace('normal.', 'smurf.')
+        lines.append(row)
+    with gzip.open(path, 'wt') as f:
+        f.writelines(lines)
+
+
+def test_task_peaks_groups_folds_and_refits():
+    records = [
+        {'id': 'rf-c00-f0', 'model': 'rf', 'fold': 0, 'peak_bytes': 100},
+        {'id': 'rf-c01-f1', 'model': 'rf', 'fold': 1, 'peak_bytes': 300},
+        {'id': 'rf-refit', 'model': 'rf', 'fold': None, 'peak_bytes': 900},
+        # Ölçümü olmayan kayıt (ör. /proc bulunmayan sistem) tahmini alır
+        {'id': 'lr-c00-f0', 'model': 'lr', 'fold': 0},
+    ]
+    assert task_peaks(records, fallback=50) == {'rf': 300, 'rf-refit': 900, 'lr': 50}
+
+
+def test_pipelines_do_not_share_preprocessor():
+    grids = make_grids('binary', ['src_bytes'], ['service'])
+    assert grids['lr'][0].steps[0][1] is not grids['rf'][0].steps[0][1]
+
+
+def test_cli_resumes_from_checkpoints(tmp_path, capsys):
+    data_dir, run_dir = tmp_path / 'data', tmp_path / 'run'
+    data_dir.mkdir()
+    _write_kdd(data_dir / train.TRAIN_FILE, 300, seed=0)
+    _write_kdd(data_dir / train.TEST_FILE, 200, seed=1)
+    argv = ['binary', '--models', 'lr', '--cv', '2', '--workers', '1',
+            '--run-dir', str(run_dir), '--data-dir', str(data_dir)]
+    train.main(argv)
+    tasks = run_dir / 'tasks'
+    first = {p.name: p.read_text() for p in tasks.glob('*.json')}
+    assert len(first) == 2 * 2 + 1   # 2 aday x 2 kat + yeniden eğitim
+
+    # Yarıda kalmış çalıştırma: bir kat görevi ve yeniden eğitim eksik
+    (tasks / 'lr-c01-f1.json').unlink()
+    (tasks / 'lr-refit.json').unlink()
+    mtimes = {p.name: p.stat().st_mtime_ns for p in tasks.glob('*.json')}
+    capsys.readouterr()
+    train.main(argv)
+    assert '3/4 görev önceki çalıştırmadan alındı' in capsys.readouterr().out
+    assert {p.name: p.stat().st_mtime_ns for p in tasks.glob('*.json') if p.name in mtimes} == mtimes
+    second = {p.name: p.read_text() for p in tasks.glob('*.json')}
+    assert second.keys() == first.keys()
+    assert json.loads(second['lr-c01-f1.json'])['score'] == json.loads(first['lr-c01-f1.json'])['score']
+
+    # Test dosyası shared/ içeriğini belirler: değişince çalıştırma sürdürülmez
+    _write_kdd(data_dir / train.TEST_FILE, 200, seed=2)
+    with pytest.raises(SystemExit):
+        train.main(argv)